@@ -0,0 +1,278 @@
+import asyncio
+
+from database import AxonDB, POOL_SIZE, POOL_TIMEOUT, SQLITE_IN_CHUNK, proof_pages, assemble_proof, assemble_multiproof
+from merkle_engine import multiproof_pages
+from transparency_log import Frontier, inclusion_keys, inclusion_proof, consistency_keys, consistency_proof
+
+# Native drivers are optional: without them the async ledger degrades to
+# offloading the sync AxonDB onto worker threads.
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+try:
+    import aiosqlite
+except ImportError:
+    aiosqlite = None
+
+class AsyncAxonDB:
+    """
+    AXON ARCH | ASYNC LEDGER
+    Event-loop-native read path for the audit endpoints (asyncpg on Postgres,
+    aiosqlite on the SQLite fallback), so thousands of in-flight validations
+    share one worker process instead of one thread each.
+
+    Writes are delegated to the wrapped sync AxonDB on a worker thread: seals
+    keep a single write path (pool, group commit, schema migrations).
+    """
+    def __init__(self, db: AxonDB, pool_size: int = POOL_SIZE):
+        self.db = db
+        self.mode = db.mode
+        self.pool_size = pool_size
+        self._pg_pool = None
+        self._sqlite = []
+        self._next_reader = 0
+
+    async def connect(self):
+        if self.mode == "POSTGRES" and asyncpg:
+            # statement_cache_size=0: prepared statements do not survive the transaction pooler (port 6543)
+            self._pg_pool = await asyncpg.create_pool(
+                self.db.db_url, min_size=1, max_size=self.pool_size,
+                statement_cache_size=0, command_timeout=POOL_TIMEOUT
+            )
+            print(f"AXON ARCH | ASYNC LEDGER: asyncpg pool online (max {self.pool_size})")
+        elif self.mode == "SQLITE" and aiosqlite:
+            for _ in range(self.pool_size):
+                conn = await aiosqlite.connect(self.db.db_path)
+                conn.row_factory = aiosqlite.Row
+                self._sqlite.append(conn)
+            print(f"AXON ARCH | ASYNC LEDGER: {self.pool_size} aiosqlite readers online")
+        else:
+            print("AXON ARCH | ASYNC LEDGER: native driver missing, reads offloaded to threadpool")
+
+    def _reader(self):
+        # Round-robin: each aiosqlite connection serializes its own queries on a private thread
+        conn = self._sqlite[self._next_reader % len(self._sqlite)]
+        self._next_reader += 1
+        return conn
+
+    async def _fetch(self, query: str, args, many: bool = False):
+        """Runs a '?'-placeholder query on the native driver (rewritten to $n for asyncpg)."""
+        if self._pg_pool:
+            parts = query.split("?")
+            query = parts[0] + "".join(f"${i}{part}" for i, part in enumerate(parts[1:], 1))
+            async with self._pg_pool.acquire(timeout=POOL_TIMEOUT) as conn:
+                return await (conn.fetch if many else conn.fetchrow)(query, *args)
+        async with self._reader().execute(query, args) as cursor:
+            return await (cursor.fetchall() if many else cursor.fetchone())
+
+    async def validate_key(self, api_key: str):
+        if self._pg_pool:
+            async with self._pg_pool.acquire(timeout=POOL_TIMEOUT) as conn:
+                return await conn.fetchrow("SELECT * FROM clients WHERE api_key = $1 AND active = TRUE", api_key)
+        if self._sqlite:
+            async with self._reader().execute("SELECT * FROM clients WHERE api_key = ? AND active = 1", (api_key,)) as cursor:
+                return await cursor.fetchone()
+        return await asyncio.to_thread(self.db.validate_key, api_key)
+
+    async def _roots_may_exist(self, roots) -> list:
+        """AxonDB.roots_may_exist with the (rare) log catch-up kept off the event loop."""
+        if self.db.root_filter is None:
+            return list(roots)
+        synced = self.db._root_filter_due(roots)
+        if synced:
+            await asyncio.to_thread(self.db.sync_root_filter)
+        return self.db._root_filter_verdicts(roots, synced)
+
+    async def verify_integrity(self, root_hash: str):
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.verify_integrity, root_hash)
+        cached = self.db._hot_root(root_hash)
+        if cached:
+            return cached
+        if not await self._roots_may_exist([root_hash]):
+            return None
+
+        if self._pg_pool:
+            async with self._pg_pool.acquire(timeout=POOL_TIMEOUT) as conn:
+                result = await conn.fetchrow(
+                    "SELECT id, timestamp, scheme FROM provenance_log WHERE merkle_root = $1 ORDER BY id LIMIT 1", root_hash
+                )
+        else:
+            async with self._reader().execute(
+                "SELECT id, timestamp, scheme FROM provenance_log WHERE merkle_root = ? ORDER BY id LIMIT 1", (root_hash,)
+            ) as cursor:
+                result = await cursor.fetchone()
+
+        if result:
+            self.db._cache_root(root_hash, result)
+        elif self.db.root_filter is not None:
+            self.db.root_filter.record_false_positives()
+        return result
+
+    async def verify_integrity_many(self, roots) -> dict:
+        """Native twin of AxonDB.verify_integrity_many: one ANY($1) query, or IN (...) chunks on SQLite."""
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.verify_integrity_many, roots)
+        found, misses = {}, []
+        for root in set(roots):
+            cached = self.db._hot_root(root)
+            if cached:
+                found[root] = cached
+            else:
+                misses.append(root)
+        roots = await self._roots_may_exist(misses)
+        if not roots:
+            return found
+        if self._pg_pool:
+            rows = await self._fetch(
+                "SELECT DISTINCT ON (merkle_root) merkle_root, id, timestamp, scheme FROM provenance_log "
+                "WHERE merkle_root = ANY(?::text[]) ORDER BY merkle_root, id",
+                [roots], many=True
+            )
+            found.update((row['merkle_root'], row) for row in rows)
+        else:
+            for start in range(0, len(roots), SQLITE_IN_CHUNK):
+                chunk = roots[start:start + SQLITE_IN_CHUNK]
+                rows = await self._fetch(
+                    "SELECT merkle_root, MIN(id) AS id, timestamp, scheme FROM provenance_log "
+                    f"WHERE merkle_root IN ({', '.join('?' * len(chunk))}) GROUP BY merkle_root",
+                    chunk, many=True
+                )
+                found.update((row['merkle_root'], row) for row in rows)
+        fetched = [root for root in roots if root in found]
+        for root in fetched:
+            self.db._cache_root(root, found[root])
+        if self.db.root_filter is not None and len(fetched) < len(roots):
+            self.db.root_filter.record_false_positives(len(roots) - len(fetched))
+        return found
+
+    async def begin_seal(self, api_key: str) -> int:
+        return await asyncio.to_thread(self.db.begin_seal, api_key)
+
+    async def store_seal_items(self, seal_id: int, start: int, items: list):
+        return await asyncio.to_thread(self.db.store_seal_items, seal_id, start, items)
+
+    async def finish_seal(self, seal_id: int, root_hash: str, scheme: int) -> dict:
+        return await asyncio.to_thread(self.db.finish_seal, seal_id, root_hash, scheme)
+
+    async def abort_seal(self, seal_id: int):
+        return await asyncio.to_thread(self.db.abort_seal, seal_id)
+
+    async def fetch_tree(self, root_hash: str = None, leaf_hash: bytes = None):
+        """Native twin of AxonDB.fetch_tree."""
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.fetch_tree, root_hash, leaf_hash)
+        if leaf_hash is not None:
+            query = (
+                "SELECT t.id, t.merkle_root, t.leaf_count, t.scheme, t.page_nodes, l.leaf_index "
+                "FROM merkle_leaves l JOIN merkle_trees t ON t.id = l.tree_id WHERE l.leaf_hash = ?"
+            )
+            args = [leaf_hash]
+            if root_hash:
+                query += " AND t.merkle_root = ?"
+                args.append(root_hash)
+            return await self._fetch(query + " ORDER BY t.id DESC LIMIT 1", args)
+        return await self._fetch(
+            "SELECT id, merkle_root, leaf_count, scheme, page_nodes FROM merkle_trees WHERE merkle_root = ?", [root_hash]
+        )
+
+    async def fetch_pages(self, tree_id: int, pages: list) -> list:
+        if not pages:
+            return []
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.fetch_pages, tree_id, pages)
+        return await self._fetch(
+            f"SELECT page, nodes FROM merkle_nodes WHERE tree_id = ? AND page IN ({', '.join('?' * len(pages))})",
+            [tree_id, *pages], many=True
+        )
+
+    async def fetch_proof(self, root_hash: str = None, leaf_index: int = None, leaf_hash: bytes = None):
+        tree = await self.fetch_tree(root_hash, leaf_hash)
+        if tree is not None and leaf_hash is not None:
+            leaf_index = tree['leaf_index']
+        if tree is None or leaf_index is None or not 0 <= leaf_index < tree['leaf_count']:
+            return None
+        return assemble_proof(tree, leaf_index, await self.fetch_pages(tree['id'], proof_pages(tree, leaf_index)))
+
+    async def fetch_multiproof(self, root_hash: str, indices: list):
+        tree = await self.fetch_tree(root_hash)
+        if tree is None or not indices or min(indices) < 0 or max(indices) >= tree['leaf_count']:
+            return None
+        pages = multiproof_pages(tree['leaf_count'], indices, tree['page_nodes'])
+        return assemble_multiproof(tree, indices, await self.fetch_pages(tree['id'], pages))
+
+    async def list_roots(self, since_id: int = 0, limit: int = 1000, newest: bool = False, before_id: int = None) -> list:
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.list_roots, since_id, limit, newest, before_id)
+        if newest:
+            bound = "AND id < ? " if before_id is not None else ""
+            return await self._fetch(
+                "SELECT id, merkle_root, timestamp, scheme FROM provenance_log "
+                f"WHERE merkle_root IS NOT NULL {bound}ORDER BY id DESC LIMIT ?",
+                ([before_id] if before_id is not None else []) + [limit], many=True
+            )
+        return await self._fetch(
+            "SELECT id, merkle_root, timestamp, scheme FROM provenance_log "
+            "WHERE id > ? AND merkle_root IS NOT NULL ORDER BY id LIMIT ?",
+            [since_id, limit], many=True
+        )
+
+    async def log_head(self) -> Frontier:
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.log_head)
+        state = await self._fetch("SELECT tree_size, nodes FROM log_frontier WHERE id = 1", [])
+        return Frontier.from_bytes(state['tree_size'], state['nodes'])
+
+    async def log_nodes(self, keys: list) -> dict:
+        if not keys:
+            return {}
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.log_nodes, keys)
+        pairs = ", ".join(["(?::int, ?::bigint)" if self._pg_pool else "(?, ?)"] * len(keys))
+        rows = await self._fetch(
+            f"SELECT level, idx, hash FROM log_nodes WHERE (level, idx) IN (VALUES {pairs})",
+            [value for key in keys for value in key], many=True
+        )
+        return {(row['level'], row['idx']): bytes(row['hash']) for row in rows}
+
+    async def log_entry_index(self, merkle_root: str):
+        if not (self._pg_pool or self._sqlite):
+            return await asyncio.to_thread(self.db.log_entry_index, merkle_root)
+        row = await self._fetch("SELECT MIN(idx) AS idx FROM log_entries WHERE merkle_root = ?", [merkle_root])
+        return row['idx'] if row else None
+
+    async def log_inclusion(self, merkle_root: str, tree_size: int = None):
+        head = await self.log_head()
+        tree_size = head.tree_size if tree_size is None else tree_size
+        index = await self.log_entry_index(merkle_root)
+        if index is None or not index < tree_size <= head.tree_size:
+            return None
+        nodes = await self.log_nodes(inclusion_keys(index, tree_size, head))
+        return inclusion_proof(merkle_root, index, tree_size, head, nodes)
+
+    async def log_consistency(self, first: int, second: int = None):
+        head = await self.log_head()
+        second = head.tree_size if second is None else second
+        if not 0 <= first <= second <= head.tree_size:
+            return None
+        nodes = await self.log_nodes(consistency_keys(first, second, head))
+        return consistency_proof(first, second, head, nodes)
+
+    def stats(self) -> dict:
+        stats = self.db.stats()
+        if self._pg_pool:
+            stats["async"] = {"driver": "asyncpg", "size": self._pg_pool.get_size(), "idle": self._pg_pool.get_idle_size()}
+        elif self._sqlite:
+            stats["async"] = {"driver": "aiosqlite", "readers": len(self._sqlite)}
+        else:
+            stats["async"] = {"driver": "threadpool"}
+        return stats
+
+    async def close(self):
+        if self._pg_pool:
+            await self._pg_pool.close()
+        for conn in self._sqlite:
+            await conn.close()
+        self._sqlite = []
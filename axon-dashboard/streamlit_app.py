@@ -10,6 +10,7 @@ import hashlib
 from axon_sdk import AxonGuard
 from merkle_engine import MerkleEngine 
 from siem_engine import SovereignSentinel 
+from metrics import parse_text, histogram_quantile
 
 # --- CONFIGURATION ---
 st.set_page_config(page_title="AXON ARCH | AI Memory Defense", layout="wide", page_icon="🛡️", initial_sidebar_state="expanded")
@@ -27,6 +28,46 @@ guard = AxonGuard(API_URL, API_KEY)
 sentinel = SovereignSentinel()
 local_merkle = MerkleEngine()
 
+# --- LIVE TELEMETRY (engine /metrics) ---
+# Every widget interaction reruns the script; the scrape is shared across reruns for this long
+METRICS_TTL_SECONDS = 15
+
+@st.cache_data(ttl=METRICS_TTL_SECONDS, show_spinner=False)
+def fetch_engine_latency():
+    """{(endpoint, stage): {p50_ms, p99_ms, count}} from the engine's histograms; None when unreachable."""
+    try:
+        res = requests.get(f"{API_URL}/metrics", headers={"x-api-key": API_KEY}, timeout=5)
+    except requests.RequestException:
+        return None
+    if res.status_code != 200:
+        return None
+    buckets = {}
+    for name, labels, value in parse_text(res.text):
+        if name == "axon_request_seconds_bucket" and labels.get("status") == "200":
+            key = (labels["endpoint"], "total")
+        elif name == "axon_stage_seconds_bucket":
+            key = (labels["endpoint"], labels["stage"])
+        else:
+            continue
+        series = buckets.setdefault(key, {})
+        le = float(labels["le"])
+        series[le] = series.get(le, 0) + value  # request series are split by method too
+    latency = {}
+    for key, series in buckets.items():
+        cumulative = sorted(series.items())
+        latency[key] = {
+            "p50_ms": histogram_quantile(0.5, cumulative) * 1000,
+            "p99_ms": histogram_quantile(0.99, cumulative) * 1000,
+            "count": int(cumulative[-1][1]),
+        }
+    return latency
+
+def latency_badge(latency) -> str:
+    seal = (latency or {}).get(("/v1/seal", "total"))
+    if not seal or not seal["count"]:
+        return "NO TELEMETRY"
+    return f"/v1/seal p50 {seal['p50_ms']:.2f} ms"
+
 # --- CSS: VISUAL SURGERY (FIXED INPUTS & TABLES) ---
 st.markdown("""
     <style>
@@ -54,7 +95,7 @@ st.markdown("""
 
 # --- STATE MANAGEMENT ---
 if 'last_latency' not in st.session_state: 
-    st.session_state.last_latency = "0.0000 ms"
+    st.session_state.last_latency = latency_badge(fetch_engine_latency()) if API_KEY != "UNCONFIGURED_KEY" else "NO TELEMETRY"
 if 'packet_log' not in st.session_state:
     st.session_state.packet_log = []
 
@@ -127,6 +168,17 @@ with tab1:
     else:
         st.table(pd.DataFrame(st.session_state.packet_log).tail(6))
 
+    st.markdown("### ⏱️ Engine Latency (live /metrics)")
+    engine_latency = fetch_engine_latency() if API_KEY != "UNCONFIGURED_KEY" else None
+    if not engine_latency:
+        st.info("Engine telemetry unavailable: /metrics unreachable or no requests served yet.")
+    else:
+        rows = [
+            {"Endpoint": endpoint, "Stage": stage, "p50 (ms)": f"{v['p50_ms']:.3f}", "p99 (ms)": f"{v['p99_ms']:.3f}", "Samples": v["count"]}
+            for (endpoint, stage), v in sorted(engine_latency.items()) if v["count"]
+        ]
+        st.table(pd.DataFrame(rows))
+
 # --- TAB 2: SECURE AI CONTEXT ---
 with tab2:
     st.subheader("Inject Data into AI Memory Stream")
@@ -149,21 +201,10 @@ with tab2:
                          st.session_state.packet_log.append({'Timestamp': time.strftime('%H:%M:%S'), 'Origin': 'External_UI', 'Payload_Hash': 'MALICIOUS_PAYLOAD', 'Defense_Action': 'QUARANTINED'})
                          st.markdown(f'<div class="verdict-fail">🚨 MALWARE DETECTED<br>Type: {threat["type"]}<br>Status: QUARANTINED</div>', unsafe_allow_html=True)
                     else:
-                        core_start = time.perf_counter()
                         payload_hash = hashlib.sha256(clean_input.encode()).hexdigest()
-                        core_end = time.perf_counter()
                         
                         st.session_state.packet_log.append({'Timestamp': time.strftime('%H:%M:%S'), 'Origin': 'External_UI', 'Payload_Hash': payload_hash[:16] + '...', 'Defense_Action': 'CLEAN'})
                         
-                        new_latency = f"{(core_end - core_start) * 1000:.4f} ms"
-                        st.session_state.last_latency = new_latency
-                        latency_placeholder.markdown(f"""
-                            <div class="latency-badge">
-                                <span class="latency-dot"></span>
-                                <span>{new_latency}</span>
-                            </div>
-                        """, unsafe_allow_html=True)
-                        
                         st.markdown('<div style="color: #166534; font-weight: 700; margin-top: 10px; margin-bottom: 10px; padding: 10px; border: 1px solid #bbf7d0; border-radius: 5px; background-color: #dcfce7;">🛡️ SIEM Adversarial Check: Threat Not Detected</div>', unsafe_allow_html=True)
                         
                         try:
@@ -172,6 +213,15 @@ with tab2:
                             
                             if res.status_code == 200:
                                 seal_id = res.json()['seal_id']
+                                # Engine-measured latency, now including this seal
+                                new_latency = latency_badge(fetch_engine_latency())
+                                st.session_state.last_latency = new_latency
+                                latency_placeholder.markdown(f"""
+                                    <div class="latency-badge">
+                                        <span class="latency-dot"></span>
+                                        <span>{new_latency}</span>
+                                    </div>
+                                """, unsafe_allow_html=True)
                                 st.markdown(f"""
                                     <div class="verdict-success">
                                         <div style="font-size: 24px;">🛡️</div>
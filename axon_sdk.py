@@ -1,44 +1,421 @@
+import asyncio
+import hashlib
+import random
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from merkle_engine import MerkleEngine
+from ttl_cache import TTLCache
+
+# The asyncio client is optional: without httpx only AxonGuard is available
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# AXON ARCH | SDK TRANSPORT DEFAULTS
+# (connect, read) seconds; a hung engine fails the check instead of blocking the caller
+DEFAULT_TIMEOUT = (3.05, 10.0)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.2  # seconds; doubles per attempt
+# Transient statuses worth retrying: validation is read-only, so a repeat is always safe
+RETRY_STATUSES = (429, 502, 503, 504)
+DEFAULT_POOL_SIZE = 10
+# Server-side cap on /v1/validate/batch items (AXON_VALIDATE_BATCH_MAX)
+MAX_BATCH = 10000
+
+# AXON ARCH | OFFLINE VERIFICATION DEFAULTS (CachedAxonGuard)
+ROOT_CACHE_SIZE = 100000
+PROOF_CACHE_SIZE = 100000
+CACHE_TTL = 3600.0  # seconds an idle cached root or proof is kept
+PROOF_MISS_TTL = 30.0  # seconds a "no proof issued" answer skips /v1/proof (0 disables)
+REFRESH_INTERVAL = 30.0  # seconds between /v1/roots catch-ups
+ROOTS_PAGE = 5000
+
+def _check(data, seal_id, proof=None) -> dict:
+    # We match the 'ValidateRequest' model in main.py
+    return {"merkle_root": seal_id, "data_fragment": data, "proof": proof or []}
+
+def _as_checks(checks) -> list:
+    """(data, seal_id) or (data, seal_id, proof) tuples as ValidateRequest payloads."""
+    return [_check(*check) for check in checks]
+
+def _interpret(result: dict):
+    """Interpret the Server's Verdict."""
+    if result.get("verified") is True:
+        return True, "SECURE"
+    elif result.get("status") == "PROVENANCE_MISSING":
+        return False, "PROVENANCE_MISSING"
+    else:
+        return False, "INTEGRITY_FAILURE"
 
 class AxonGuard:
-    def __init__(self, api_url, api_key):
+    """
+    Blocking client. One keep-alive Session is shared by every call (no handshake
+    per check), each request is bounded by `timeout`, and connection errors and
+    RETRY_STATUSES are retried with exponential backoff.
+    """
+    def __init__(self, api_url, api_key, timeout=DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, pool_size: int = DEFAULT_POOL_SIZE):
         self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
         self.headers = {
             "x-api-key": api_key,
             "Content-Type": "application/json"
         }
+        retry = Retry(
+            total=retries, connect=retries, read=retries, status=retries,
+            backoff_factor=backoff, status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "POST"}), raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
-    def protect(self, data, seal_id):
+    def protect(self, data, seal_id, proof=None):
         """
         The Aligned Integrity Check.
         Calls /v1/validate which performs both Ledger and Math checks.
         """
-        # We match the 'ValidateRequest' model in main.py
-        payload = {
-            "merkle_root": seal_id,
-            "data_fragment": data
-        }
-        
         try:
-            # CALL THE CORRECT ENDPOINT
-            response = requests.post(
-                f"{self.api_url}/v1/validate", 
-                json=payload, 
-                headers=self.headers
+            response = self.session.post(
+                f"{self.api_url}/v1/validate", json=_check(data, seal_id, proof), timeout=self.timeout
             )
-            
             if response.status_code != 200:
                 return False, f"API_ERROR: {response.status_code}"
-                
-            result = response.json()
-            
-            # Interpret the Server's Verdict
-            if result.get("verified") is True:
-                return True, "SECURE"
-            elif result.get("status") == "PROVENANCE_MISSING":
-                return False, "PROVENANCE_MISSING"
-            else:
-                return False, "INTEGRITY_FAILURE"
-                
+            return _interpret(response.json())
         except requests.exceptions.RequestException as e:
-            return False, f"CONNECTION_ERROR: {str(e)}"
\ No newline at end of file
+            return False, f"CONNECTION_ERROR: {str(e)}"
+
+    def protect_many(self, checks, batch_size: int = MAX_BATCH):
+        """
+        protect() for many (data, seal_id[, proof]) checks through /v1/validate/batch:
+        one request per batch_size checks, verdicts returned in input order.
+        """
+        payloads = _as_checks(checks)
+        verdicts = []
+        for start in range(0, len(payloads), batch_size):
+            chunk = payloads[start:start + batch_size]
+            try:
+                response = self.session.post(
+                    f"{self.api_url}/v1/validate/batch", json={"items": chunk}, timeout=self.timeout
+                )
+                if response.status_code != 200:
+                    verdicts.extend([(False, f"API_ERROR: {response.status_code}")] * len(chunk))
+                    continue
+                verdicts.extend(_interpret(result) for result in response.json()["results"])
+            except requests.exceptions.RequestException as e:
+                verdicts.extend([(False, f"CONNECTION_ERROR: {str(e)}")] * len(chunk))
+        return verdicts
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class CachedAxonGuard(AxonGuard):
+    """
+    Offline-first client. Keeps a local set of sealed roots, caught up from
+    /v1/roots every `refresh_interval` seconds, plus issued proofs, and runs
+    MerkleEngine.verify_proof in-process under the sovereign key (the API key is
+    also the HMAC key). A known root with a supplied or cached proof never leaves
+    the process; an unknown root, or a fragment the server has no proof for (e.g.
+    a streamed seal), falls back to /v1/validate. Such a miss is remembered for
+    `proof_miss_ttl` seconds, so repeat checks skip /v1/proof.
+
+    The root set is seeded from the newest `max_roots` roots on a background
+    thread, so construction and the first checks never wait on it. Each root is
+    kept with the hashing scheme it was sealed under, and issued proofs name
+    theirs, so a scheme change on the engine does not turn old roots into local
+    failures. A root learnt from a fallback has no recorded scheme: a proof the
+    caller supplies for it goes to the engine.
+    """
+    def __init__(self, api_url, api_key, max_roots: int = ROOT_CACHE_SIZE, max_proofs: int = PROOF_CACHE_SIZE,
+                 cache_ttl: float = CACHE_TTL, refresh_interval: float = REFRESH_INTERVAL,
+                 proof_miss_ttl: float = PROOF_MISS_TTL, **transport):
+        super().__init__(api_url, api_key, **transport)
+        self.api_key = api_key
+        self.max_roots = max_roots
+        self.roots = TTLCache(max_roots, cache_ttl)  # root -> scheme (0 when unknown)
+        # (root, sha256(data)) -> (proof, scheme), or (None, retry_at) when the engine issued none
+        self.proofs = TTLCache(max_proofs, cache_ttl)
+        self.proof_miss_ttl = proof_miss_ttl
+        self.refresh_interval = refresh_interval
+        self.since_id = None  # None until the tail seed lands
+        self._next_refresh = 0.0
+        self._refresh_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"local": 0, "fallbacks": 0, "proof_fetches": 0, "refreshes": 0, "refresh_errors": 0}
+        self._maybe_refresh()
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self._stats[name] += n
+
+    def _roots_page(self, params: dict) -> dict:
+        response = self.session.get(f"{self.api_url}/v1/roots", params=params, timeout=self.timeout)
+        response.raise_for_status()
+        page = response.json()
+        for row in page["roots"]:
+            self.roots.put(row["merkle_root"], row.get("scheme") or 0)
+        return page
+
+    def _seed(self) -> int:
+        """Loads the newest max_roots roots, newest first; catch-ups resume after the newest one."""
+        page = self._roots_page({"newest": "true", "limit": min(ROOTS_PAGE, self.max_roots)})
+        since_id, added = page["next_since_id"], len(page["roots"])
+        while page["more"] and added < self.max_roots:
+            page = self._roots_page({"newest": "true", "before_id": page["next_before_id"],
+                                     "limit": min(ROOTS_PAGE, self.max_roots - added)})
+            added += len(page["roots"])
+        self.since_id = since_id
+        return added
+
+    def refresh(self) -> int:
+        """Pulls every root sealed since the last refresh (the tail of the log on the first); returns how many were added."""
+        with self._refresh_lock:
+            if self.since_id is None:
+                added = self._seed()
+            else:
+                added, more = 0, True
+                while more:
+                    page = self._roots_page({"since_id": self.since_id, "limit": ROOTS_PAGE})
+                    added += len(page["roots"])
+                    self.since_id = page["next_since_id"]
+                    more = page["more"]
+            self._next_refresh = time.monotonic() + self.refresh_interval
+        self._count("refreshes")
+        return added
+
+    def _try_refresh(self):
+        try:
+            self.refresh()
+        except (requests.exceptions.RequestException, ValueError, KeyError):
+            self._count("refresh_errors")
+            self._next_refresh = time.monotonic() + self.refresh_interval
+
+    def _maybe_refresh(self):
+        # One caller catches up; concurrent callers carry on with the current set
+        if time.monotonic() < self._next_refresh or self._refresh_lock.locked():
+            return
+        if self.since_id is None:
+            # The seed is a large read: it runs on its own thread, checks fall back meanwhile
+            self._next_refresh = time.monotonic() + self.refresh_interval
+            threading.Thread(target=self._try_refresh, name="axon-roots-seed", daemon=True).start()
+            return
+        self._try_refresh()
+
+    def _proof_for(self, data, seal_id, fetch: bool):
+        """(proof, scheme) for data under seal_id from the cache, else (if fetch) from /v1/proof; None when none is issued."""
+        key = (seal_id, hashlib.sha256(data.encode('utf-8') if isinstance(data, str) else data).digest())
+        cached = self.proofs.get(key)
+        if cached is not None:
+            if cached[0] is not None:
+                return cached
+            if time.monotonic() < cached[1]:
+                return None  # a recent miss: straight to the engine, one round trip
+        if not fetch:
+            return None
+        self._count("proof_fetches")
+        try:
+            response = self.session.post(
+                f"{self.api_url}/v1/proof", json={"merkle_root": seal_id, "data": data}, timeout=self.timeout
+            )
+        except requests.exceptions.RequestException:
+            return None
+        if response.status_code == 404 and self.proof_miss_ttl > 0:
+            # Streamed seal, unknown root or altered fragment; transient failures are not remembered
+            self.proofs.put(key, (None, time.monotonic() + self.proof_miss_ttl))
+        if response.status_code != 200:
+            return None
+        record = response.json()
+        issued = (record["proof"], record.get("scheme"))
+        self.proofs.put(key, issued)
+        return issued
+
+    def _verify_locally(self, data, seal_id, proof, fetch: bool):
+        """(ok, status) from the local root set and proof math, or None when the server must decide."""
+        scheme = self.roots.get(seal_id)
+        if scheme is None or (proof is not None and not scheme):
+            return None
+        issued = (proof, scheme) if proof is not None else self._proof_for(data, seal_id, fetch)
+        if issued is None:
+            return None
+        proof, scheme = issued
+        if MerkleEngine.verify_proof(data, proof, seal_id, secret_key=self.api_key, scheme=scheme):
+            return True, "SECURE"
+        return False, "INTEGRITY_FAILURE"
+
+    def _fallback(self, data, seal_id, proof):
+        self._count("fallbacks")
+        ok, status = super().protect(data, seal_id, proof)
+        if status in ("SECURE", "INTEGRITY_FAILURE"):
+            self._learn_root(seal_id)
+        return ok, status
+
+    def _learn_root(self, seal_id):
+        # The server knows this root (sealed after our last refresh); its scheme comes with the next catch-up
+        if self.roots.get(seal_id) is None:
+            self.roots.put(seal_id, 0)
+
+    def protect(self, data, seal_id, proof=None):
+        """The Aligned Integrity Check, in-process whenever the root and a proof are at hand."""
+        self._maybe_refresh()
+        verdict = self._verify_locally(data, seal_id, proof, fetch=True)
+        if verdict is None:
+            return self._fallback(data, seal_id, proof)
+        self._count("local")
+        return verdict
+
+    def protect_many(self, checks, batch_size: int = MAX_BATCH):
+        """
+        Checks with a known root and a supplied or cached proof are verified locally;
+        the rest go to the engine in /v1/validate/batch requests (no per-item proof fetches).
+        """
+        self._maybe_refresh()
+        checks = [tuple(check) + (None,) * (3 - len(check)) for check in checks]
+        verdicts, remote = [], []
+        for index, (data, seal_id, proof) in enumerate(checks):
+            verdict = self._verify_locally(data, seal_id, proof, fetch=False)
+            if verdict is None:
+                remote.append(index)
+            verdicts.append(verdict)
+        self._count("local", len(checks) - len(remote))
+        if remote:
+            self._count("fallbacks", len(remote))
+            answers = super().protect_many([checks[i] for i in remote], batch_size)
+            for index, verdict in zip(remote, answers):
+                verdicts[index] = verdict
+                if verdict[1] in ("SECURE", "INTEGRITY_FAILURE"):
+                    self._learn_root(checks[index][1])
+        return verdicts
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            snapshot = dict(self._stats)
+        snapshot.update({"since_id": self.since_id, "roots": self.roots.stats(), "proofs": self.proofs.stats()})
+        return snapshot
+
+class AsyncAxonGuard:
+    """
+    asyncio client on a pooled httpx.AsyncClient. Concurrent protect() calls are
+    coalesced: checks arriving within `coalesce_ms` of each other (up to
+    `max_batch`) travel as one /v1/validate/batch request and each caller gets
+    its own verdict. coalesce_ms=0 sends every check on its own.
+    """
+    def __init__(self, api_url, api_key, timeout=DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, max_connections: int = DEFAULT_POOL_SIZE,
+                 coalesce_ms: float = 2.0, max_batch: int = 500):
+        if httpx is None:
+            raise ImportError("AsyncAxonGuard requires httpx (pip install httpx)")
+        self.api_url = api_url.rstrip('/')
+        self.retries = retries
+        self.backoff = backoff
+        self.coalesce = coalesce_ms / 1000
+        self.max_batch = max_batch
+        connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        self.client = httpx.AsyncClient(
+            base_url=self.api_url,
+            headers={"x-api-key": api_key, "Content-Type": "application/json"},
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._pending = []  # [(payload, future)]
+        self._flush_task = None
+        self._inflight = set()
+
+    async def _post(self, path: str, body: dict):
+        """POST with retries on connection errors and RETRY_STATUSES; returns the last response."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = await self.client.post(path, json=body)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+            except httpx.TransportError:
+                if attempt == self.retries:
+                    raise
+            # Full jitter keeps a fleet of clients from retrying in lockstep
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def _validate_batch(self, payloads: list) -> list:
+        try:
+            response = await self._post("/v1/validate/batch", {"items": payloads})
+            if response.status_code != 200:
+                return [(False, f"API_ERROR: {response.status_code}")] * len(payloads)
+            return [_interpret(result) for result in response.json()["results"]]
+        except httpx.HTTPError as e:
+            return [(False, f"CONNECTION_ERROR: {str(e)}")] * len(payloads)
+
+    async def protect(self, data, seal_id, proof=None):
+        """The Aligned Integrity Check, coalesced with concurrent callers."""
+        payload = _check(data, seal_id, proof)
+        if self.coalesce <= 0:
+            try:
+                response = await self._post("/v1/validate", payload)
+                if response.status_code != 200:
+                    return False, f"API_ERROR: {response.status_code}"
+                return _interpret(response.json())
+            except httpx.HTTPError as e:
+                return False, f"CONNECTION_ERROR: {str(e)}"
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((payload, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_later())
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.coalesce)
+        self._flush_task = None
+        self._flush_now()
+
+    def _flush_now(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._resolve(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _resolve(self, batch):
+        try:
+            verdicts = await self._validate_batch([payload for payload, _ in batch])
+        except Exception as e:
+            verdicts = [(False, f"CONNECTION_ERROR: {str(e)}")] * len(batch)
+        for (_, future), verdict in zip(batch, verdicts):
+            if not future.done():
+                future.set_result(verdict)
+
+    async def protect_many(self, checks, batch_size: int = MAX_BATCH):
+        """protect() for many (data, seal_id[, proof]) checks: batches of batch_size, sent concurrently."""
+        payloads = _as_checks(checks)
+        chunks = [payloads[start:start + batch_size] for start in range(0, len(payloads), batch_size)]
+        results = await asyncio.gather(*(self._validate_batch(chunk) for chunk in chunks))
+        return [verdict for chunk in results for verdict in chunk]
+
+    async def aclose(self):
+        """Sends any checks still waiting to coalesce, lets in-flight batches answer, then closes."""
+        self._flush_now()
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -0,0 +1,132 @@
+"""
+AXON ARCH | LEAF STORAGE BENCHMARK: stored_data JSON blobs vs content-addressed leaves.
+
+Builds a SQLite ledger the old way (one JSON blob per seal in provenance_log),
+measures it, then lets the v5 migration move it to leaf_blobs/seal_leaves and
+measures again (after VACUUM). The dataset is RAG-style text chunks where a
+share of every batch is re-sealed content (retries, unchanged documents,
+boilerplate), which is what content addressing deduplicates.
+
+Validate latency is the root lookup the audit endpoints make, timed both as the
+original SELECT * and as the narrow id/timestamp lookup verify_integrity uses now.
+
+    python benchmarks/bench_leaf_storage.py --seals 2000 --items 50 --repeat 0.3
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import database
+import leaf_codec
+
+WORDS = ("sovereign ledger merkle proof audit vector context chunk retrieval model policy "
+         "record integrity client request seal root tenant region latency index batch").split()
+
+def make_dataset(seals: int, items: int, repeat: float, chunk_words: int, seed: int = 7):
+    rng = random.Random(seed)
+    seen, batches = [], []
+    for s in range(seals):
+        batch = []
+        for i in range(items):
+            if seen and rng.random() < repeat:
+                batch.append(rng.choice(seen))
+            else:
+                text = f"doc {s}-{i}: " + " ".join(rng.choice(WORDS) for _ in range(chunk_words))
+                seen.append(text)
+                batch.append(text)
+        batches.append(batch)
+    return batches
+
+def ledger_bytes(path: str) -> int:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    return os.path.getsize(path)
+
+def time_lookups(path: str, query: str, roots, repeat: int = 3) -> float:
+    """Mean microseconds per root lookup (best of `repeat` passes)."""
+    conn = sqlite3.connect(path)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for root in roots:
+            conn.execute(query, (root,)).fetchall()
+        best = min(best, time.perf_counter() - start)
+    conn.close()
+    return best / len(roots) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seals", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=50, help="items per seal")
+    parser.add_argument("--repeat", type=float, default=0.3, help="share of items that re-seal earlier content")
+    parser.add_argument("--chunk-words", type=int, default=80)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    batches = make_dataset(args.seals, args.items, args.repeat, args.chunk_words)
+    roots = [hashlib.sha256(json.dumps(batch).encode()).hexdigest() for batch in batches]
+    raw_bytes = sum(len(item.encode()) for batch in batches for item in batch)
+    distinct = len({item for batch in batches for item in batch})
+
+    work = tempfile.mkdtemp()
+    legacy_path, migrated_path = os.path.join(work, "legacy.db"), os.path.join(work, "migrated.db")
+    try:
+        # Old layout: every migration before leaf storage, items as one JSON blob per seal
+        shipped = database.SCHEMA_MIGRATIONS
+        database.SCHEMA_MIGRATIONS = [m for m in shipped if m[0] < 5]
+        db = database.AxonDB(db_url=None, db_path=legacy_path)
+        db.init_db()
+        with db.get_cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO provenance_log (client_key, merkle_root, stored_data) VALUES (?, ?, ?)",
+                [("bench", root, json.dumps(batch)) for root, batch in zip(roots, batches)]
+            )
+        db.close()
+        database.SCHEMA_MIGRATIONS = shipped
+        legacy_size = ledger_bytes(legacy_path)
+        shutil.copy(legacy_path, migrated_path)
+
+        start = time.perf_counter()
+        db = database.AxonDB(db_url=None, db_path=migrated_path)
+        db.init_db()
+        migrate_s = time.perf_counter() - start
+        sample = random.Random(3).sample(range(args.seals), min(20, args.seals))
+        assert all(db.fetch_seal_items(roots[i]) == batches[i] for i in sample), "leaf round-trip mismatch"
+        db.close()
+        migrated_size = ledger_bytes(migrated_path)
+
+        print(f"dataset: {args.seals:,} seals x {args.items} items, {raw_bytes / 2**20:.1f} MiB of item text, "
+              f"{distinct:,} distinct items, codec {leaf_codec.LEAF_CODEC}")
+        print(f"migration: {migrate_s:.2f} s")
+        print()
+        print(f"{'ledger':<28} {'MiB':>8} {'vs legacy':>10}")
+        print("-" * 48)
+        print(f"{'legacy (stored_data JSON)':<28} {legacy_size / 2**20:>8.2f} {'':>10}")
+        print(f"{'leaf_blobs + seal_leaves':<28} {migrated_size / 2**20:>8.2f} {migrated_size / legacy_size:>9.0%}")
+        print()
+
+        lookup_roots = [random.Random(5).choice(roots) for _ in range(args.lookups)]
+        queries = [
+            ("SELECT * (original)", "SELECT * FROM provenance_log WHERE merkle_root = ? LIMIT 1"),
+            ("SELECT id, timestamp", "SELECT id, timestamp FROM provenance_log WHERE merkle_root = ? LIMIT 1"),
+        ]
+        print(f"{'validate lookup':<24} {'legacy us':>10} {'migrated us':>12}")
+        print("-" * 48)
+        for label, query in queries:
+            print(f"{label:<24} {time_lookups(legacy_path, query, lookup_roots):>10.1f} "
+                  f"{time_lookups(migrated_path, query, lookup_roots):>12.1f}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+AXON ARCH | MERKLE BENCHMARK: compact byte-level tree vs the original hex-string tree.
+
+The reference implementation below is the original engine: hmac.new() per
+node, 64-char hex strings at every level, parents hashed over the hex text.
+Each build is timed and its peak allocation traced (tracemalloc) separately,
+so the memory column is the tree plus the transient hashing garbage (worker
+processes of the parallel build are not traced).
+
+    python benchmarks/bench_merkle.py --leaves 1000000
+"""
+import argparse
+import hashlib
+import hmac
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import merkle_engine
+from merkle_engine import MerkleEngine, HASH_SCHEME_LEGACY, HASH_SCHEME_BINARY
+
+def reference_build(items, key: bytes):
+    """The original build_tree: list of lists of hex strings."""
+    def hash_data(data):
+        if isinstance(data, str): data = data.encode('utf-8')
+        return hmac.new(key, data, hashlib.sha256).hexdigest()
+
+    current_layer = [hash_data(data) for data in items]
+    tree = [current_layer]
+    while len(current_layer) > 1:
+        next_layer = []
+        for i in range(0, len(current_layer), 2):
+            left = current_layer[i]
+            right = current_layer[i + 1] if (i + 1) < len(current_layer) else left
+            next_layer.append(hash_data(left + right))
+        tree.append(next_layer)
+        current_layer = next_layer
+    return tree, current_layer[0]
+
+def measure(build):
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leaves", type=int, default=1_000_000)
+    parser.add_argument("--skip-reference", action="store_true", help="only time the compact engine")
+    args = parser.parse_args()
+
+    key = b"bench-sovereign-key"
+    items = [f"context chunk {i}: sovereign vector record" for i in range(args.leaves)]
+
+    print(f"{'build':<22} {'leaves':>10} | {'time (s)':>9} | {'peak MiB':>9} | root")
+    print("-" * 80)
+    legacy_root = None
+    if not args.skip_reference:
+        elapsed, peak, (_, legacy_root) = measure(lambda: reference_build(items, key))
+        print(f"{'reference (hex str)':<22} {args.leaves:>10,} | {elapsed:>9.2f} | {peak / 2**20:>9.1f} | {legacy_root[:16]}")
+
+    builds = [
+        ("compact v1 (legacy)", HASH_SCHEME_LEGACY, 0),
+        ("compact v2 (binary)", HASH_SCHEME_BINARY, 0),
+        (f"parallel v1 x{merkle_engine.MERKLE_WORKERS}", HASH_SCHEME_LEGACY, 1),
+        (f"parallel v2 x{merkle_engine.MERKLE_WORKERS}", HASH_SCHEME_BINARY, 1),
+    ]
+    for label, scheme, threshold in builds:
+        elapsed, peak, engine = measure(
+            lambda: MerkleEngine(items, secret_key=key, scheme=scheme, parallel_threshold=threshold)
+        )
+        print(f"{label:<22} {args.leaves:>10,} | {elapsed:>9.2f} | {peak / 2**20:>9.1f} | {engine.root[:16]}")
+        if scheme == HASH_SCHEME_LEGACY and legacy_root:
+            assert engine.root == legacy_root, "compact v1 root diverged from the reference build"
+    merkle_engine.shutdown_pools()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+AXON ARCH | MULTIPROOF BENCHMARK: one multiproof vs N independent get_proof paths.
+
+For a fixed seal, samples k leaves (spread at random, or one contiguous run) and
+compares the proof material an auditor downloads (sibling hashes and JSON bytes)
+and the time to check the whole set: k verify_proof calls against a single
+verify_multiproof pass.
+
+    python benchmarks/bench_multiproof.py --leaves 100000 --subsets 10,100,1000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from merkle_engine import MerkleEngine
+
+def timeit(fn, min_time: float = 0.2) -> float:
+    loops, elapsed = 0, 0.0
+    start = time.perf_counter()
+    while elapsed < min_time:
+        fn()
+        loops += 1
+        elapsed = time.perf_counter() - start
+    return elapsed / loops * 1e3
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leaves", type=int, default=100_000)
+    parser.add_argument("--subsets", default="10,100,1000", help="comma-separated leaf counts to prove")
+    args = parser.parse_args()
+
+    key = b"bench-sovereign-key"
+    items = [f"context chunk {i}: sovereign vector record" for i in range(args.leaves)]
+    engine = MerkleEngine(items, secret_key=key)
+    rng = random.Random(11)
+
+    print(f"{'subset':<16} {'k':>6} | {'N proofs hashes':>15} {'KiB':>8} {'verify ms':>10} | "
+          f"{'multiproof hashes':>17} {'KiB':>8} {'verify ms':>10}")
+    print("-" * 102)
+    for k in (int(s) for s in args.subsets.split(",")):
+        start = rng.randrange(args.leaves - k)
+        for label, indices in (("random", sorted(rng.sample(range(args.leaves), k))),
+                               ("contiguous", list(range(start, start + k)))):
+            data = [items[i] for i in indices]
+
+            proofs = [engine.get_proof(i) for i in indices]
+            single_hashes = sum(len(p) for p in proofs)
+            single_kib = len(json.dumps(proofs)) / 1024
+            single_ms = timeit(lambda: all(
+                MerkleEngine.verify_proof(d, p, engine.root, secret_key=key) for d, p in zip(data, proofs)
+            ))
+
+            multiproof = engine.get_multiproof(indices)
+            multi_kib = len(json.dumps(multiproof)) / 1024
+            multi_ms = timeit(lambda: MerkleEngine.verify_multiproof(data, multiproof, engine.root, secret_key=key))
+            assert MerkleEngine.verify_multiproof(data, multiproof, engine.root, secret_key=key)
+
+            print(f"{label:<16} {k:>6} | {single_hashes:>15,} {single_kib:>8.1f} {single_ms:>10.2f} | "
+                  f"{len(multiproof['hashes']):>17,} {multi_kib:>8.1f} {multi_ms:>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+AXON ARCH | LEDGER BENCHMARK: /v1/validate provenance lookup latency vs ledger size.
+
+Grows a throwaway SQLite ledger through each target size and times
+AxonDB.verify_integrity for roots that are present (hits) and absent (misses).
+With the merkle_root index, latency should stay flat from 10k to 10M rows.
+The root filter and hot-root cache are off so that every lookup is timed
+against the index.
+
+    python benchmarks/bench_validate.py --sizes 10000,100000,1000000,10000000
+
+Reference run (1 vCPU, 5 GB RAM, SQLite; the 10M ledger is ~4.6 GB on disk):
+
+            rows | hit p50 (us) | hit p99 (us) | miss p50 (us) | miss p99 (us)
+          10,000 |         21.2 |         46.7 |          18.4 |          35.4
+         100,000 |         20.0 |         55.1 |          17.2 |          41.0
+       1,000,000 |         26.6 |         67.0 |          18.1 |          37.4
+      10,000,000 |         32.3 |        280.5 |          22.0 |         194.5
+
+The median follows the index depth (one more B-tree level per ~100x rows), not the
+row count. The 10M tail is page-cache misses: that ledger no longer fits in RAM
+on this machine, so some probes read their index pages from disk.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import hashlib
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database import AxonDB
+
+def fake_root(i: int) -> str:
+    return hashlib.sha256(f"bench-root-{i}".encode()).hexdigest()
+
+def grow_ledger(db: AxonDB, start: int, stop: int, chunk: int = 50000):
+    """Bulk-inserts synthetic seals with realistic stored_data blobs."""
+    for offset in range(start, stop, chunk):
+        rows = [
+            ("BENCH_KEY", fake_root(i), json.dumps([f"context chunk {i} " * 8]))
+            for i in range(offset, min(offset + chunk, stop))
+        ]
+        with db.get_cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO provenance_log (client_key, merkle_root, stored_data) VALUES (?, ?, ?)", rows
+            )
+
+def time_lookups(db: AxonDB, roots, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        for root in roots:
+            start = time.perf_counter()
+            db.verify_integrity(root)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated ledger row counts")
+    parser.add_argument("--probes", type=int, default=200, help="distinct roots looked up per size")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = AxonDB(db_url=None, db_path=os.path.join(tmp, "bench_ledger.db"), root_filter=False, hot_root_cache=0)
+            db.init_db()
+
+        print(f"{'rows':>12} | {'hit p50 (us)':>12} | {'hit p99 (us)':>12} | {'miss p50 (us)':>13} | {'miss p99 (us)':>13}")
+        print("-" * 74)
+        current = 0
+        for size in sizes:
+            grow_ledger(db, current, size)
+            current = size
+            step = max(1, size // args.probes)
+            hits = [fake_root(i) for i in range(0, size, step)][:args.probes]
+            misses = [fake_root(size + 10_000_000 + i) for i in range(args.probes)]
+            hit_p50, hit_p99 = time_lookups(db, hits, args.repeat)
+            miss_p50, miss_p99 = time_lookups(db, misses, args.repeat)
+            print(f"{size:>12,} | {hit_p50:>12.1f} | {hit_p99:>12.1f} | {miss_p50:>13.1f} | {miss_p99:>13.1f}")
+        db.close()
+
+if __name__ == "__main__":
+    main()
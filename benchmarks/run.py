@@ -0,0 +1,262 @@
+"""
+AXON ARCH | ENGINE MICROBENCHMARK SUITE: offline, reproducible, JSON out.
+
+Times the hot path in-process (no network, no hosted engine):
+
+    merkle    MerkleEngine build, get_proof and verify_proof across leaf counts
+    sentinel  scan_payload on clean, near-miss and malicious corpora by size
+              (verdict cache off, so every call is a real scan)
+    ledger    log_seal and verify_integrity hit/miss against a SQLite ledger
+              grown to each size (hot-root cache and root filter off, so
+              lookups are timed against the index)
+
+Every case runs `--rounds` timed rounds of at least `--min-time` seconds and
+reports the per-operation min, median and max in microseconds. Inputs are
+seeded, so two runs on one machine see the same work.
+
+Baselines are per machine: record one with --save-baseline, then pass it as
+--baseline on later runs. Cases are compared on their best round (min), the
+figure least disturbed by other load on the host; any case slower than the
+baseline by more than --threshold is a regression and the exit status is 1.
+Only the suites being run are compared.
+
+    python benchmarks/run.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run.py --baseline benchmarks/baseline.json --json results.json
+    python benchmarks/run.py --quick --suites merkle,sentinel
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import merkle_engine
+from merkle_engine import MerkleEngine
+from siem_engine import SovereignSentinel
+from database import AxonDB
+from bench_sentinel import corpus
+from bench_validate import fake_root, grow_ledger
+
+SCHEMA_VERSION = 1
+KEY = b"bench-sovereign-key"
+
+# (full run, --quick run)
+MERKLE_LEAVES = ([1_000, 10_000, 100_000], [1_000, 10_000])
+SENTINEL_SIZES = ([1_000, 10_000, 50_000], [1_000, 10_000])
+SENTINEL_CORPORA = ("clean", "near_miss", "malicious_head", "malicious_tail")
+LEDGER_SIZES = ([1_000, 10_000, 100_000], [1_000, 10_000])
+
+def measure(op, min_time: float, rounds: int) -> dict:
+    """Per-operation microseconds over `rounds` rounds, each looping op() for >= min_time."""
+    op()  # warm-up: imports, caches, first-touch allocation
+    samples = []
+    for _ in range(rounds):
+        loops, elapsed = 0, 0.0
+        start = time.perf_counter()
+        while elapsed < min_time:
+            op()
+            loops += 1
+            elapsed = time.perf_counter() - start
+        samples.append(elapsed / loops * 1e6)
+    return {
+        "unit": "us",
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "rounds": len(samples),
+    }
+
+def cycle(values):
+    """Zero-argument callable returning the next value, round-robin."""
+    state = {"i": -1}
+    def next_value():
+        state["i"] = (state["i"] + 1) % len(values)
+        return values[state["i"]]
+    return next_value
+
+# --- SUITES ---
+# Each yields (case name, zero-argument op); setup happens before the yield.
+
+def merkle_cases(quick: bool):
+    rng = random.Random(7)
+    for leaves in MERKLE_LEAVES[quick]:
+        items = [f"context chunk {i}: sovereign vector record" for i in range(leaves)]
+        # Serial build only: the process pool's spin-up would swamp the hashing
+        yield f"merkle.build[leaves={leaves}]", lambda items=items: MerkleEngine(items, secret_key=KEY, parallel_threshold=0)
+
+        engine = MerkleEngine(items, secret_key=KEY, parallel_threshold=0)
+        indices = [rng.randrange(leaves) for _ in range(256)]
+        next_index = cycle(indices)
+        yield f"merkle.get_proof[leaves={leaves}]", lambda engine=engine, n=next_index: engine.get_proof(n())
+
+        checks = [(items[i], engine.get_proof(i)) for i in indices]
+        next_check = cycle(checks)
+        def verify(engine=engine, n=next_check):
+            data, proof = n()
+            assert MerkleEngine.verify_proof(data, proof, engine.root, secret_key=KEY)
+        yield f"merkle.verify_proof[leaves={leaves}]", verify
+
+def sentinel_cases(quick: bool):
+    sentinel = SovereignSentinel()
+    sentinel.verdict_cache = None
+    rng = random.Random(7)
+    for kind in SENTINEL_CORPORA:
+        for size in SENTINEL_SIZES[quick]:
+            text = corpus(kind, size, rng)
+            yield f"sentinel.scan_payload[{kind},chars={size}]", lambda text=text: sentinel.scan_payload(text)
+
+def ledger_cases(quick: bool):
+    with tempfile.TemporaryDirectory() as tmp:
+        with contextlib.redirect_stdout(io.StringIO()):
+            db = AxonDB(db_url=None, db_path=os.path.join(tmp, "bench_ledger.db"),
+                        root_filter=False, hot_root_cache=0)
+            db.init_db()
+        rng = random.Random(7)
+        fresh = iter(range(10**9, 2 * 10**9))
+        current = 0
+        try:
+            for size in LEDGER_SIZES[quick]:
+                grow_ledger(db, current, size)
+                current = size
+                items = [f"context chunk {i} " * 8 for i in range(10)]
+                yield (f"ledger.log_seal[rows={size}]",
+                       lambda: db.log_seal("BENCH_KEY", fake_root(next(fresh)), items))
+
+                hits = cycle([fake_root(rng.randrange(size)) for _ in range(256)])
+                yield f"ledger.verify_integrity.hit[rows={size}]", lambda hits=hits: db.verify_integrity(hits())
+
+                misses = cycle([fake_root(3 * 10**9 + i) for i in range(256)])
+                yield f"ledger.verify_integrity.miss[rows={size}]", lambda misses=misses: db.verify_integrity(misses())
+        finally:
+            db.close()
+
+SUITES = {"merkle": merkle_cases, "sentinel": sentinel_cases, "ledger": ledger_cases}
+
+# --- REPORTING ---
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """[(case, baseline min, current min, ratio, verdict)] over the union of cases."""
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        base, cur = baseline.get(name), results.get(name)
+        if base is None or cur is None:
+            rows.append((name, base and base["min"], cur and cur["min"], None, "new" if base is None else "missing"))
+            continue
+        ratio = cur["min"] / base["min"]
+        if ratio > 1 + threshold:
+            verdict = "REGRESSION"
+        elif ratio < 1 - threshold:
+            verdict = "improved"
+        else:
+            verdict = "ok"
+        rows.append((name, base["min"], cur["min"], ratio, verdict))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", default=",".join(SUITES), help="comma-separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--quick", action="store_true", help="smaller inputs and shorter rounds (CI smoke run)")
+    parser.add_argument("--rounds", type=int, default=None, help="timed rounds per case (default 5, quick 3)")
+    parser.add_argument("--min-time", type=float, default=None, help="seconds per round (default 0.2, quick 0.05)")
+    parser.add_argument("--json", dest="json_path", help="write the results document here ('-' for stdout)")
+    parser.add_argument("--baseline", help="results document to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed best-round slowdown vs baseline (0.15 = 15%%)")
+    parser.add_argument("--save-baseline", help="also write the results document here as the new baseline")
+    args = parser.parse_args()
+
+    suites = [s.strip() for s in args.suites.split(",") if s.strip()]
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"unknown suite(s): {', '.join(unknown)}")
+    rounds = args.rounds or (3 if args.quick else 5)
+    min_time = args.min_time or (0.05 if args.quick else 0.2)
+    # Human-readable progress goes to stderr when the JSON document owns stdout
+    out = sys.stderr if args.json_path == "-" else sys.stdout
+
+    results = {}
+    print(f"{'case':<52} {'min us':>12} {'median us':>12} {'max us':>12}", file=out)
+    print("-" * 91, file=out)
+    try:
+        for suite in suites:
+            for name, op in SUITES[suite](args.quick):
+                stats = measure(op, min_time, rounds)
+                stats["suite"] = suite
+                results[name] = stats
+                print(f"{name:<52} {stats['min']:>12.2f} {stats['median']:>12.2f} {stats['max']:>12.2f}", file=out)
+    finally:
+        merkle_engine.shutdown_pools()
+
+    document = {
+        "schema": SCHEMA_VERSION,
+        "environment": environment(),
+        "config": {"suites": suites, "quick": args.quick, "rounds": rounds, "min_time": min_time},
+        "results": results,
+    }
+
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        base_results = {name: stats for name, stats in baseline.get("results", {}).items()
+                        if stats.get("suite") in suites}
+        rows = compare(results, base_results, args.threshold)
+        regressions = sum(1 for row in rows if row[4] == "REGRESSION")
+        document["comparison"] = {
+            "baseline": args.baseline,
+            "baseline_environment": baseline.get("environment", {}),
+            "threshold": args.threshold,
+            "regressions": regressions,
+            "cases": {name: {"baseline": base, "current": cur, "ratio": ratio, "verdict": verdict}
+                      for name, base, cur, ratio, verdict in rows},
+        }
+        print(file=out)
+        print(f"{'vs baseline':<52} {'baseline us':>12} {'current us':>12} {'ratio':>7}  verdict", file=out)
+        print("-" * 95, file=out)
+        for name, base, cur, ratio, verdict in rows:
+            fmt = lambda v: f"{v:>12.2f}" if v is not None else f"{'-':>12}"
+            ratio_text = f"{ratio:>7.2f}" if ratio is not None else f"{'-':>7}"
+            print(f"{name:<52} {fmt(base)} {fmt(cur)} {ratio_text}  {verdict}", file=out)
+        print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}", file=out)
+
+    if args.json_path == "-":
+        json.dump(document, sys.stdout, indent=2)
+        print()
+    elif args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(document, f, indent=2)
+    if args.save_baseline:
+        baseline_doc = {k: v for k, v in document.items() if k != "comparison"}
+        with open(args.save_baseline, "w") as f:
+            json.dump(baseline_doc, f, indent=2)
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import math
+import os
+import threading
+
+class BloomFilter:
+    """
+    AXON ARCH | BLOOM FILTER
+    Set-membership filter with no false negatives: "absent" is definitive, "present"
+    is wrong with probability ~error_rate while count stays within capacity.
+    Sized for (capacity, error_rate); max_bytes caps the bit array, trading a higher
+    false-positive rate for a fixed memory budget.
+
+    Adds are serialised (bits are set by read-modify-write on shared bytes); lookups
+    are lock-free, since bits only ever go from 0 to 1.
+    """
+    def __init__(self, capacity: int, error_rate: float = 0.001, max_bytes: int = 0):
+        capacity = max(1, capacity)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        if max_bytes > 0:
+            num_bits = min(num_bits, max_bytes * 8)
+        self.num_bits = max(64, num_bits)
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        # Owner-defined sync position and a tag identifying the source at that position
+        self.watermark = 0
+        self.tag = ""
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "negatives": 0, "queried_negatives": 0, "false_positives": 0}
+
+    def _positions(self, key: str):
+        # Kirsch-Mitzenmacher double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> bool:
+        """Adds key; True when it was definitely absent before (this call set a bit)."""
+        positions = self._positions(key)
+        bits = self.bits
+        with self._lock:
+            new = False
+            for p in positions:
+                mask = 1 << (p & 7)
+                if not bits[p >> 3] & mask:
+                    bits[p >> 3] |= mask
+                    new = True
+            if new:
+                self.count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def record(self, found: bool, queried: bool = False):
+        """
+        Counts one verdict acted upon. Negatives are the source lookups it saved;
+        a negative confirmed by reading the source first (queried) saved none.
+        """
+        with self._lock:
+            self._stats["lookups"] += 1
+            if not found:
+                self._stats["queried_negatives" if queried else "negatives"] += 1
+
+    def record_false_positives(self, n: int = 1):
+        """Counts positives the source of truth then refuted."""
+        with self._lock:
+            self._stats["false_positives"] += n
+
+    def expected_error_rate(self) -> float:
+        """False-positive probability at the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+        positives = snapshot["lookups"] - snapshot["negatives"] - snapshot["queried_negatives"]
+        snapshot.update({
+            "count": self.count,
+            "capacity": self.capacity,
+            "bytes": len(self.bits),
+            "num_hashes": self.num_hashes,
+            "target_error_rate": self.error_rate,
+            "expected_error_rate": self.expected_error_rate(),
+            "observed_error_rate": snapshot["false_positives"] / positives if positives else 0.0,
+            "watermark": self.watermark,
+        })
+        return snapshot
+
+    # --- SNAPSHOTS ---
+    # One JSON header line (sizing, count, watermark, tag) followed by the raw bits.
+    # Written to a temp file and renamed, so a crash never leaves a torn snapshot.
+
+    def save(self, path: str):
+        header = {
+            "version": 1, "num_bits": self.num_bits, "num_hashes": self.num_hashes,
+            "capacity": self.capacity, "error_rate": self.error_rate,
+            "count": self.count, "watermark": self.watermark, "tag": self.tag,
+        }
+        tmp = f"{path}.tmp"
+        with self._lock:
+            with open(tmp, "wb") as f:
+                f.write(json.dumps(header).encode() + b"\n")
+                f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str):
+        """The filter saved at path, or None when it is missing or unreadable."""
+        try:
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                bits = f.read()
+            if header.get("version") != 1 or len(bits) != (header["num_bits"] + 7) // 8:
+                return None
+        except (OSError, ValueError, KeyError):
+            return None
+        bloom = cls.__new__(cls)
+        bloom.num_bits, bloom.num_hashes = header["num_bits"], header["num_hashes"]
+        bloom.capacity, bloom.error_rate = header["capacity"], header["error_rate"]
+        bloom.bits = bytearray(bits)
+        bloom.count = header["count"]
+        bloom.watermark, bloom.tag = header["watermark"], header["tag"]
+        bloom._lock = threading.Lock()
+        bloom._stats = {"lookups": 0, "negatives": 0, "queried_negatives": 0, "false_positives": 0}
+        return bloom
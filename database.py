@@ -1,29 +1,547 @@
 import os
 import json
+import time
 import sqlite3
+import threading
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_values
+
+from merkle_engine import (
+    DIGEST_SIZE, HASH_SCHEME_LEGACY, MERKLE_SCHEME, iter_node_pages, page_positions, proof_from_pages, multiproof_pages, multiproof_from_pages
+)
+from transparency_log import (
+    Frontier, accessor, nodes_needed, root_at, inclusion_keys, inclusion_proof, consistency_keys, consistency_proof
+)
+from leaf_codec import leaf_key, encode_leaf, decode_leaf
+from ttl_cache import TTLCache
+from bloom_filter import BloomFilter
+
+# Cross-process migration lock on SQLite (POSIX); elsewhere workers are expected to boot one at a time
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 # Load the Connection String (Ensure this uses Port 6543 for Transaction Pooling)
 DB_URL = os.getenv("DATABASE_URL")
 # Extract admin key dynamically to prevent hardcoded credential leakage
 ADMIN_KEY = os.getenv("AXON_SOVEREIGN_KEY", "UNCONFIGURED_KEY")
 
+# CONNECTION POOL TUNING
+# Max connections held open, seconds a request may wait for one, and how long a
+# connection may sit idle before it is health-checked on its next checkout.
+POOL_SIZE = int(os.getenv("AXON_DB_POOL_SIZE", "10"))
+POOL_TIMEOUT = float(os.getenv("AXON_DB_POOL_TIMEOUT", "30"))
+POOL_IDLE_CHECK = float(os.getenv("AXON_DB_POOL_IDLE_CHECK", "30"))
+
+# GROUP COMMIT (opt-in)
+# Concurrent seals are flushed as one multi-row transaction once a batch reaches
+# GROUP_COMMIT_ROWS rows or its oldest row has waited GROUP_COMMIT_WAIT_MS.
+GROUP_COMMIT = os.getenv("AXON_GROUP_COMMIT", "0") == "1"
+GROUP_COMMIT_ROWS = int(os.getenv("AXON_GROUP_COMMIT_ROWS", "64"))
+GROUP_COMMIT_WAIT_MS = float(os.getenv("AXON_GROUP_COMMIT_WAIT_MS", "5"))
+
+# IDEMPOTENT SEALS
+# A (client_key, merkle_root) pair is sealed once; repeats resolve to the original
+# seal. This process remembers the pairs it has seen so a retry skips the ledger
+# entirely; other workers still fall through to the unique index. Size 0 disables it.
+SEALED_CACHE_SIZE = int(os.getenv("AXON_SEALED_CACHE_SIZE", "100000"))
+
+# HOT ROOTS
+# Audited roots are answered from a bounded LRU of root -> {id, timestamp} of their
+# first seal (provenance rows never change). Seals write through when they are the
+# first of their root. Size 0 disables it.
+HOT_ROOT_CACHE_SIZE = int(os.getenv("AXON_HOT_ROOT_CACHE_SIZE", "50000"))
+HOT_ROOT_CACHE_TTL = float(os.getenv("AXON_HOT_ROOT_CACHE_TTL", "3600"))
+
+# ROOT FILTER
+# A Bloom filter of every sealed root lets audits of roots that were never sealed
+# answer PROVENANCE_MISSING without a query. It is loaded from its snapshot (or built
+# from the ledger) at boot and fed by every seal this process makes, so a negative
+# is answered locally. Seals by other workers arrive by a background catch-up on the
+# transparency log every BLOOM_SYNC_SECONDS (one indexed read past the watermark,
+# empty unless someone else has sealed). With several workers, a root sealed on
+# another worker can therefore read as missing here for up to BLOOM_SYNC_SECONDS
+# plus one catch-up; roots sealed by this worker never do. 0 catches up before
+# every negative instead (no window, but a query per never-sealed root).
+# Sized for max(BLOOM_CAPACITY, 2x the ledger) roots at BLOOM_ERROR_RATE, optionally
+# capped at AXON_BLOOM_MAX_MB. AXON_BLOOM_FILTER=0 disables it.
+BLOOM_FILTER = os.getenv("AXON_BLOOM_FILTER", "1") == "1"
+BLOOM_CAPACITY = int(os.getenv("AXON_BLOOM_CAPACITY", "1000000"))
+BLOOM_ERROR_RATE = float(os.getenv("AXON_BLOOM_ERROR_RATE", "0.001"))
+BLOOM_MAX_BYTES = int(float(os.getenv("AXON_BLOOM_MAX_MB", "0")) * 2**20)
+BLOOM_SYNC_SECONDS = float(os.getenv("AXON_BLOOM_SYNC_SECONDS", "1"))
+BLOOM_SNAPSHOT = os.getenv("AXON_BLOOM_SNAPSHOT")
+BLOOM_SCAN_CHUNK = 50000
+
+# PROOF STORAGE
+# Digests per stored page of a sealed tree (even; recorded per tree, so changing it
+# only affects new seals) and rows per INSERT round-trip when indexing leaves.
+MERKLE_PAGE_NODES = int(os.getenv("AXON_MERKLE_PAGE_NODES", "256"))
+LEAF_INSERT_BATCH = 5000
+
+# Bound parameters per IN (...) lookup on SQLite (older builds cap a statement at 999)
+SQLITE_IN_CHUNK = 500
+
+# Seals per transaction when the transparency-log migration backfills an existing ledger
+LOG_BACKFILL_CHUNK = 5000
+# Seals (stored_data rows) and streamed items per transaction when the leaf-storage migration runs
+LEAF_MIGRATION_SEALS = 1000
+LEAF_MIGRATION_ITEMS = 5000
+# Postgres advisory-lock key held while init_db() migrates, so workers booting together run it once
+MIGRATION_LOCK_ID = 7_340_291
+
+# VERSIONED SCHEMA MIGRATIONS
+# Applied in order by init_db() and recorded in schema_migrations, so an existing
+# ledger is upgraded in place on boot. Never edit a shipped entry: append a new one.
+SCHEMA_MIGRATIONS = [
+    # v1: Index-backed provenance lookups. Non-unique, because the ledger still
+    # accepts repeat seals of the same batch (same root, new row).
+    (1, "provenance_root_index", {
+        "POSTGRES": ["CREATE INDEX IF NOT EXISTS idx_provenance_root ON provenance_log (merkle_root)"],
+        "SQLITE": ["CREATE INDEX IF NOT EXISTS idx_provenance_root ON provenance_log (merkle_root)"],
+    }),
+    # v2: Persisted trees for /v1/proof. One merkle_trees row per distinct root, its
+    # levels as fixed-size pages (see merkle_engine PAGED NODE STORAGE) and a
+    # leaf-hash index resolving a leaf to (tree, index) without touching the pages.
+    (2, "merkle_tree_storage", {
+        "POSTGRES": [
+            """CREATE TABLE IF NOT EXISTS merkle_trees (
+                id SERIAL PRIMARY KEY,
+                merkle_root TEXT NOT NULL UNIQUE,
+                leaf_count INTEGER NOT NULL,
+                scheme INTEGER NOT NULL,
+                page_nodes INTEGER NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )""",
+            """CREATE TABLE IF NOT EXISTS merkle_nodes (
+                tree_id INTEGER NOT NULL,
+                page INTEGER NOT NULL,
+                nodes BYTEA NOT NULL,
+                PRIMARY KEY (tree_id, page)
+            )""",
+            """CREATE TABLE IF NOT EXISTS merkle_leaves (
+                tree_id INTEGER NOT NULL,
+                leaf_index INTEGER NOT NULL,
+                leaf_hash BYTEA NOT NULL,
+                PRIMARY KEY (tree_id, leaf_index)
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_merkle_leaf_hash ON merkle_leaves (leaf_hash)",
+        ],
+        "SQLITE": [
+            """CREATE TABLE IF NOT EXISTS merkle_trees (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                merkle_root TEXT NOT NULL UNIQUE,
+                leaf_count INTEGER NOT NULL,
+                scheme INTEGER NOT NULL,
+                page_nodes INTEGER NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )""",
+            """CREATE TABLE IF NOT EXISTS merkle_nodes (
+                tree_id INTEGER NOT NULL,
+                page INTEGER NOT NULL,
+                nodes BLOB NOT NULL,
+                PRIMARY KEY (tree_id, page)
+            ) WITHOUT ROWID""",
+            """CREATE TABLE IF NOT EXISTS merkle_leaves (
+                tree_id INTEGER NOT NULL,
+                leaf_index INTEGER NOT NULL,
+                leaf_hash BLOB NOT NULL,
+                PRIMARY KEY (tree_id, leaf_index)
+            ) WITHOUT ROWID""",
+            "CREATE INDEX IF NOT EXISTS idx_merkle_leaf_hash ON merkle_leaves (leaf_hash)",
+        ],
+    }),
+    # v3: Global transparency log over every seal root (see transparency_log.py).
+    # log_nodes holds each perfect subtree once complete; log_frontier is the single
+    # row carrying the current size and right edge, updated with every append.
+    # Existing seals are backfilled in id order.
+    (3, "transparency_log", {
+        "POSTGRES": [
+            """CREATE TABLE IF NOT EXISTS log_entries (
+                idx BIGINT PRIMARY KEY,
+                provenance_id INTEGER NOT NULL,
+                merkle_root TEXT NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_log_entries_root ON log_entries (merkle_root)",
+            """CREATE TABLE IF NOT EXISTS log_nodes (
+                level INTEGER NOT NULL,
+                idx BIGINT NOT NULL,
+                hash BYTEA NOT NULL,
+                PRIMARY KEY (level, idx)
+            )""",
+            """CREATE TABLE IF NOT EXISTS log_frontier (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                tree_size BIGINT NOT NULL,
+                nodes BYTEA NOT NULL
+            )""",
+            "INSERT INTO log_frontier (id, tree_size, nodes) VALUES (1, 0, ''::bytea) ON CONFLICT (id) DO NOTHING",
+            lambda db, cursor: db._backfill_transparency_log(cursor),
+        ],
+        "SQLITE": [
+            """CREATE TABLE IF NOT EXISTS log_entries (
+                idx INTEGER PRIMARY KEY,
+                provenance_id INTEGER NOT NULL,
+                merkle_root TEXT NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_log_entries_root ON log_entries (merkle_root)",
+            """CREATE TABLE IF NOT EXISTS log_nodes (
+                level INTEGER NOT NULL,
+                idx INTEGER NOT NULL,
+                hash BLOB NOT NULL,
+                PRIMARY KEY (level, idx)
+            ) WITHOUT ROWID""",
+            """CREATE TABLE IF NOT EXISTS log_frontier (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                tree_size INTEGER NOT NULL,
+                nodes BLOB NOT NULL
+            )""",
+            "INSERT OR IGNORE INTO log_frontier (id, tree_size, nodes) VALUES (1, 0, X'')",
+            lambda db, cursor: db._backfill_transparency_log(cursor),
+        ],
+    }),
+    # v4: Items of streamed seals (/v1/seal/stream), one row each, written chunk by
+    # chunk while the upload is still hashing; their provenance row has no stored_data.
+    (4, "seal_items", {
+        "POSTGRES": [
+            """CREATE TABLE IF NOT EXISTS seal_items (
+                provenance_id INTEGER NOT NULL,
+                item_index INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (provenance_id, item_index)
+            )""",
+        ],
+        "SQLITE": [
+            """CREATE TABLE IF NOT EXISTS seal_items (
+                provenance_id INTEGER NOT NULL,
+                item_index INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (provenance_id, item_index)
+            ) WITHOUT ROWID""",
+        ],
+    }),
+    # v5: Content-addressed leaf storage (see leaf_codec.py). Every distinct item is
+    # one leaf_blobs row, optionally compressed; seal_leaves maps a seal's positions
+    # to it. stored_data blobs and v4 seal_items are moved over, then seal_items is
+    # dropped; stored_data stays as an always-NULL column for older readers.
+    (5, "leaf_storage", {
+        "POSTGRES": [
+            """CREATE TABLE IF NOT EXISTS leaf_blobs (
+                content_hash BYTEA PRIMARY KEY,
+                codec SMALLINT NOT NULL,
+                data BYTEA NOT NULL
+            )""",
+            """CREATE TABLE IF NOT EXISTS seal_leaves (
+                provenance_id INTEGER NOT NULL,
+                item_index INTEGER NOT NULL,
+                content_hash BYTEA NOT NULL,
+                PRIMARY KEY (provenance_id, item_index)
+            )""",
+            lambda db, cursor: db._migrate_seal_payloads(cursor),
+            "DROP TABLE IF EXISTS seal_items",
+        ],
+        "SQLITE": [
+            """CREATE TABLE IF NOT EXISTS leaf_blobs (
+                content_hash BLOB PRIMARY KEY,
+                codec INTEGER NOT NULL,
+                data BLOB NOT NULL
+            ) WITHOUT ROWID""",
+            """CREATE TABLE IF NOT EXISTS seal_leaves (
+                provenance_id INTEGER NOT NULL,
+                item_index INTEGER NOT NULL,
+                content_hash BLOB NOT NULL,
+                PRIMARY KEY (provenance_id, item_index)
+            ) WITHOUT ROWID""",
+            lambda db, cursor: db._migrate_seal_payloads(cursor),
+            "DROP TABLE IF EXISTS seal_items",
+        ],
+    }),
+    # v6: Idempotent seals. Repeat seals of one (client, root) are folded into the
+    # first (see dedupe_seals) before the unique index goes on. Their transparency-log
+    # entries stay: the log is append-only and every root in it is still on file.
+    (6, "idempotent_seals", {
+        "POSTGRES": [
+            lambda db, cursor: db._dedupe_seals(cursor),
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_provenance_client_root ON provenance_log (client_key, merkle_root)",
+        ],
+        "SQLITE": [
+            lambda db, cursor: db._dedupe_seals(cursor),
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_provenance_client_root ON provenance_log (client_key, merkle_root)",
+        ],
+    }),
+    # v7: The hashing scheme each seal was built under (see merkle_engine HASHING
+    # SCHEMES), so changing AXON_MERKLE_SCHEME never breaks audits of older seals.
+    # Existing rows predate the setting unless their stored tree says otherwise.
+    (7, "seal_hash_scheme", {
+        "POSTGRES": [
+            f"ALTER TABLE provenance_log ADD COLUMN IF NOT EXISTS scheme INTEGER NOT NULL DEFAULT {HASH_SCHEME_LEGACY}",
+            "UPDATE provenance_log p SET scheme = t.scheme FROM merkle_trees t WHERE t.merkle_root = p.merkle_root",
+        ],
+        "SQLITE": [
+            f"ALTER TABLE provenance_log ADD COLUMN scheme INTEGER NOT NULL DEFAULT {HASH_SCHEME_LEGACY}",
+            "UPDATE provenance_log SET scheme = (SELECT t.scheme FROM merkle_trees t WHERE t.merkle_root = provenance_log.merkle_root) "
+            "WHERE merkle_root IN (SELECT merkle_root FROM merkle_trees)",
+        ],
+    }),
+]
+
+class ConnectionPool:
+    """
+    Bounded, thread-safe checkout/checkin pool shared by the FastAPI threadpool.
+    Idle connections are reused LIFO so the warm ones stay warm, and a connection
+    is only pre-pinged when it has been idle longer than `idle_check` seconds.
+    """
+    def __init__(self, connect, max_size: int = POOL_SIZE, timeout: float = POOL_TIMEOUT,
+                 idle_check: float = POOL_IDLE_CHECK):
+        self._connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.idle_check = idle_check
+        self._idle = []  # [(connection, returned_at)]
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._in_use = 0
+        self._stats = {
+            "checkouts": 0, "wait_total_ms": 0.0, "wait_max_ms": 0.0, "timeouts": 0,
+            "connects": 0, "health_checks": 0, "reconnects": 0, "discards": 0,
+        }
+
+    def add(self, conn):
+        """Seeds the pool with an already-open connection (e.g. the boot probe)."""
+        with self._lock:
+            self._idle.append((conn, time.monotonic()))
+            self._stats["connects"] += 1
+
+    def checkout(self):
+        started = time.perf_counter()
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self._stats["timeouts"] += 1
+            raise Exception("DATABASE_POOL_EXHAUSTED")
+        waited_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            conn = self._take_idle()
+            if conn is None:
+                conn = self._connect()
+                if conn is None:
+                    raise Exception("DATABASE_UNREACHABLE")
+                with self._lock:
+                    self._stats["connects"] += 1
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._in_use += 1
+            self._stats["checkouts"] += 1
+            self._stats["wait_total_ms"] += waited_ms
+            self._stats["wait_max_ms"] = max(self._stats["wait_max_ms"], waited_ms)
+        return conn
+
+    def checkin(self, conn, discard: bool = False):
+        with self._lock:
+            self._in_use -= 1
+            keep = not (discard or self._closed)
+            if keep:
+                self._idle.append((conn, time.monotonic()))
+            else:
+                self._stats["discards"] += 1
+        if not keep:
+            self._close_quietly(conn)
+        self._slots.release()
+
+    @contextmanager
+    def connection(self):
+        """Checks a connection out for the duration of the block; broken sockets are discarded."""
+        conn = self.checkout()
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            print("AXON ARCH | SOCKET DEAD. Discarding pooled connection; next checkout reconnects.")
+            self.checkin(conn, discard=True)
+            raise
+        except BaseException:
+            self.checkin(conn)
+            raise
+        else:
+            self.checkin(conn)
+
+    def _take_idle(self):
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                conn, returned_at = self._idle.pop()
+                stale = time.monotonic() - returned_at >= self.idle_check
+                if stale:
+                    self._stats["health_checks"] += 1
+            if not stale or self._is_alive(conn):
+                return conn
+            print("AXON ARCH | POOL: Idle connection failed health check. Reconnecting...")
+            with self._lock:
+                self._stats["reconnects"] += 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self.max_size
+            snapshot["in_use"] = self._in_use
+            snapshot["idle"] = len(self._idle)
+        checkouts = snapshot["checkouts"]
+        snapshot["wait_avg_ms"] = snapshot["wait_total_ms"] / checkouts if checkouts else 0.0
+        return snapshot
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            self._close_quietly(conn)
+
+class _PendingWrite:
+    __slots__ = ("row", "enqueued", "done", "result", "error")
+
+    def __init__(self, row):
+        self.row = row
+        self.enqueued = time.monotonic()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class GroupCommitter:
+    """
+    Write-behind batcher for the ledger. Callers block in submit() until the
+    background flusher has made their row durable as part of a single
+    multi-row transaction, so a burst of seals pays for one commit/fsync.
+    """
+    def __init__(self, flush, max_rows: int = GROUP_COMMIT_ROWS, max_wait_ms: float = GROUP_COMMIT_WAIT_MS):
+        self._flush = flush
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000
+        self._queue = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats = {
+            "batches": 0, "rows": 0, "batch_max": 0, "failures": 0,
+            "flush_total_ms": 0.0, "flush_max_ms": 0.0,
+        }
+        self._thread = threading.Thread(target=self._run, name="axon-group-commit", daemon=True)
+        self._thread.start()
+
+    def submit(self, row):
+        pending = _PendingWrite(row)
+        with self._cond:
+            if self._closed:
+                raise Exception("LEDGER_BATCHER_CLOSED")
+            self._queue.append(pending)
+            self._cond.notify()
+        pending.done.wait()
+        if pending.error:
+            raise pending.error
+        return pending.result
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                # Hold the batch open until it is full or its oldest row hits the deadline
+                deadline = self._queue[0].enqueued + self.max_wait
+                while len(self._queue) < self.max_rows and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_rows]
+                del self._queue[:self.max_rows]
+            self._commit(batch)
+
+    def _commit(self, batch):
+        started = time.perf_counter()
+        results, error = [None] * len(batch), None
+        try:
+            results = self._flush([pending.row for pending in batch])
+        except Exception as e:
+            print(f"AXON ARCH | GROUP COMMIT FAILED ({len(batch)} rows): {e}")
+            error = e
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        with self._cond:
+            self._stats["batches"] += 1
+            self._stats["rows"] += len(batch)
+            self._stats["batch_max"] = max(self._stats["batch_max"], len(batch))
+            self._stats["flush_total_ms"] += elapsed_ms
+            self._stats["flush_max_ms"] = max(self._stats["flush_max_ms"], elapsed_ms)
+            if error:
+                self._stats["failures"] += 1
+
+        for pending, result in zip(batch, results):
+            pending.result = result
+            pending.error = error
+            pending.done.set()
+
+    def stats(self) -> dict:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["queued"] = len(self._queue)
+        batches = snapshot["batches"]
+        snapshot["batch_avg"] = snapshot["rows"] / batches if batches else 0.0
+        snapshot["flush_avg_ms"] = snapshot["flush_total_ms"] / batches if batches else 0.0
+        return snapshot
+
+    def close(self):
+        """Stops accepting rows, flushes whatever is queued and joins the flusher."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
 class AxonDB:
-    def __init__(self):
+    def __init__(self, db_url: str = DB_URL, db_path: str = None,
+                 pool_size: int = POOL_SIZE, pool_timeout: float = POOL_TIMEOUT,
+                 group_commit: bool = GROUP_COMMIT, root_filter: bool = BLOOM_FILTER,
+                 hot_root_cache: int = HOT_ROOT_CACHE_SIZE):
         self.mode = "POSTGRES"
-        self.conn = None
-        
+        self.db_url = db_url
+        self.db_path = None
+        conn = None
+
         # 1. STRATEGIC ATTEMPT: Sovereign Cloud Vault (Supabase)
-        if DB_URL:
-            self.conn = self._connect_postgres()
+        if db_url:
+            conn = self._connect_postgres()
 
         # 2. TACTICAL FALLBACK: Persistent Local Ledger (SQLite)
-        if not self.conn:
+        if not conn:
             self.mode = "SQLITE"
-            
-            # Check for Render Persistent Disk mount point
-            if os.path.exists("/var/lib/axon_data"):
+
+            # Explicit path (benchmarks, local tooling) wins over the Render Persistent Disk mount point
+            if db_path:
+                print(f"AXON ARCH | STORAGE: LOCAL LEDGER ({db_path})")
+            elif os.path.exists("/var/lib/axon_data"):
                 db_path = "/var/lib/axon_data/axon_ledger.db"
                 print(f"AXON ARCH | STORAGE: 💾 PERSISTENT DISK ({db_path})")
             else:
@@ -31,14 +549,38 @@ class AxonDB:
                 print("AXON ARCH | STORAGE: ⚠️ EPHEMERAL CONTAINER (Data loss on restart)")
             
             print(f"AXON ARCH | MODE: Tactical Local Ledger (SQLite)")
-            self.conn = sqlite3.connect(db_path, check_same_thread=False)
-            self.conn.row_factory = sqlite3.Row
+            self.db_path = db_path
+            conn = self._connect_sqlite()
+
+        # 3. POOLING: the boot connection seeds a bounded pool; further sockets open on demand
+        connect = self._connect_postgres if self.mode == "POSTGRES" else self._connect_sqlite
+        self.pool = ConnectionPool(connect, max_size=pool_size, timeout=pool_timeout)
+        self.pool.add(conn)
+
+        # 4. GROUP COMMIT: optional write-behind batching of provenance rows
+        self.batcher = GroupCommitter(self._insert_seals) if group_commit else None
+        if self.batcher:
+            print(f"AXON ARCH | GROUP COMMIT: ON ({self.batcher.max_rows} rows / {GROUP_COMMIT_WAIT_MS}ms)")
+
+        # 5. SEALED CACHE: (client_key, merkle_root) -> original seal {id, timestamp}
+        self.sealed = TTLCache(SEALED_CACHE_SIZE) if SEALED_CACHE_SIZE > 0 else None
+
+        # 6. HOT ROOTS: merkle_root -> first seal {id, timestamp}, in front of verify_integrity
+        self.hot_roots = TTLCache(hot_root_cache, HOT_ROOT_CACHE_TTL) if hot_root_cache > 0 else None
+
+        # 7. ROOT FILTER: built by init_db() once the transparency log exists
+        self.use_root_filter = root_filter
+        self.root_filter = None
+        self.root_filter_path = BLOOM_SNAPSHOT or (f"{self.db_path}.bloom" if self.db_path else "axon_roots.bloom")
+        self._root_filter_lock = threading.Lock()
+        self._root_filter_syncs = 0
+        self._root_filter_stop = threading.Event()
 
     def _connect_postgres(self):
         """Establishes a resilient PostgreSQL connection with OSI Layer 4 Keepalives."""
         try:
             conn = psycopg2.connect(
-                DB_URL, 
+                self.db_url,
                 cursor_factory=RealDictCursor, 
                 connect_timeout=10,
                 keepalives=1,
@@ -54,27 +596,84 @@ class AxonDB:
             print(f"--- CLOUD CONNECTION FAILED: {e} ---")
             return None
 
+    def _connect_sqlite(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        # WAL lets pooled readers keep auditing while a seal is being committed
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
     def get_cursor(self):
-        """Executes a pre-ping to mathematically guarantee socket liveliness before execution."""
-        if self.mode == "POSTGRES":
+        """Pooled unit of work: commits (SQLite) on success, rolls back on error, always checks the socket back in."""
+        with self.pool.connection() as conn:
+            cursor = conn.cursor()
             try:
-                with self.conn.cursor() as cursor:
-                    cursor.execute("SELECT 1")
-            except (psycopg2.OperationalError, psycopg2.InterfaceError):
-                print("AXON ARCH | SOCKET DEAD. Executing graceful reconnection...")
-                self.conn = self._connect_postgres()
-                if not self.conn:
-                    raise Exception("DATABASE_UNREACHABLE")
-        
-        return self.conn.cursor()
+                yield cursor
+                if self.mode == "SQLITE":
+                    conn.commit()
+            except Exception:
+                if self.mode == "SQLITE":
+                    conn.rollback()
+                raise
+            finally:
+                cursor.close()
 
-    def commit(self):
-        if self.mode == "SQLITE":
-            self.conn.commit()
+    @contextmanager
+    def transaction(self):
+        """get_cursor() whose statements commit or roll back as one unit on Postgres too (autocommit is suspended)."""
+        with self.get_cursor() as cursor:
+            with self._atomic(cursor):
+                yield cursor
+
+    @contextmanager
+    def _atomic(self, cursor):
+        # SQLite already wraps a get_cursor() block in one transaction
+        if self.mode != "POSTGRES":
+            yield
+            return
+        cursor.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
 
     def init_db(self):
-        cursor = self.get_cursor()
-        
+        with self.get_cursor() as cursor, self._migration_lock(cursor):
+            self._create_schema(cursor)
+        print(f"AXON ARCH | {self.mode}: Schema Initialized.")
+        if self.use_root_filter:
+            self._load_root_filter()
+
+    @contextmanager
+    def _migration_lock(self, cursor):
+        """
+        Serialises schema setup across worker processes booting together: migrations
+        commit step by step, so a second worker must not read the version mid-run.
+        """
+        if self.mode == "POSTGRES":
+            # Session-level advisory lock: held across the migration's own commits
+            cursor.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_ID,))
+            try:
+                yield
+            finally:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_ID,))
+            return
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.db_path}.migrate.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+                # Publish the final step before the next worker reads the version
+                cursor.connection.commit()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _create_schema(self, cursor):
         if self.mode == "POSTGRES":
             # PostGres Schema
             cursor.execute('''
@@ -127,59 +726,785 @@ class AxonDB:
                     VALUES (?, ?, ?)
                 ''', (ADMIN_KEY, "AXON_ARCH_ADMIN", "Sovereign"))
             except sqlite3.IntegrityError:
-                pass 
+                pass
 
-        self.commit()
-        print(f"AXON ARCH | {self.mode}: Schema Initialized.")
+        cursor.connection.commit()
+        self._apply_migrations(cursor)
+
+    def _apply_migrations(self, cursor):
+        """Upgrades an existing ledger to the latest schema version, recording each step."""
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                name TEXT,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute("SELECT MAX(version) AS version FROM schema_migrations")
+        current = cursor.fetchone()["version"] or 0
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+
+        for version, name, steps in SCHEMA_MIGRATIONS:
+            if version <= current:
+                continue
+            for statement in steps[self.mode]:
+                # Data migrations are callables: step(db, cursor)
+                if callable(statement):
+                    statement(self, cursor)
+                else:
+                    cursor.execute(statement)
+            cursor.execute(
+                f"INSERT INTO schema_migrations (version, name) VALUES ({marker}, {marker})",
+                (version, name)
+            )
+            cursor.connection.commit()
+            print(f"AXON ARCH | {self.mode}: Migration v{version} applied ({name}).")
 
     def validate_key(self, api_key: str):
-        cursor = self.get_cursor()
         if self.mode == "SQLITE":
             query = "SELECT * FROM clients WHERE api_key = ? AND active = 1"
         else:
             query = "SELECT * FROM clients WHERE api_key = %s AND active = TRUE"
-        
-        cursor.execute(query, (api_key,))
-        return cursor.fetchone()
-
-    def log_seal(self, api_key: str, root_hash: str, data_payload: list) -> int:
-        cursor = self.get_cursor()
-        data_json = json.dumps(data_payload)
-        
+
+        with self.get_cursor() as cursor:
+            cursor.execute(query, (api_key,))
+            return cursor.fetchone()
+
+    def log_seal(self, api_key: str, root_hash: str, data_payload: list, scheme: int = MERKLE_SCHEME) -> dict:
+        """Seals a batch (hashed under scheme) once per client; returns the seal's {id, timestamp, scheme, duplicate}."""
+        known = self.sealed.get((api_key, root_hash)) if self.sealed is not None else None
+        if known:
+            return dict(known, duplicate=True)
+        # Filtered in before the commit: a root can only ever be missing from the filter while uncommitted
+        row = (api_key, root_hash, data_payload, scheme, self._remember_root(root_hash))
+        if self.batcher:
+            # Returns only once the batch holding this row has been committed
+            seal = self.batcher.submit(row)
+        else:
+            seal = self._insert_seals([row])[0]
+        if self.sealed is not None:
+            self.sealed.put((api_key, root_hash), {"id": seal["id"], "timestamp": seal["timestamp"], "scheme": seal["scheme"]})
+        if seal.pop("first"):
+            self._cache_root(root_hash, seal)
+        return seal
+
+    def _insert_seals(self, rows: list) -> list:
+        """
+        Writes (api_key, root, items, scheme, fresh) seals, their leaves and their
+        transparency-log entries in one transaction (one commit). Returns {id, timestamp,
+        scheme, duplicate, first} per row, in order: a pair already on file, or repeated
+        within the batch, resolves to the original seal and writes nothing. `first` marks
+        the earliest seal of its root; fresh (the root filter had never seen the root)
+        vouches for that without a lookup.
+        """
+        first = {}
+        for row in rows:
+            first.setdefault(row[:2], row)
+
+        with self.transaction() as cursor:
+            if self.mode == "POSTGRES":
+                result = execute_values(
+                    cursor,
+                    "INSERT INTO provenance_log (client_key, merkle_root, scheme) VALUES %s "
+                    "ON CONFLICT (client_key, merkle_root) DO NOTHING RETURNING id, client_key, merkle_root, timestamp, scheme",
+                    [pair + (row[3],) for pair, row in first.items()], page_size=len(first), fetch=True
+                )
+                created = {(r['client_key'], r['merkle_root']): {"id": r['id'], "timestamp": r['timestamp'], "scheme": r['scheme']}
+                           for r in result}
+            else:
+                created = {}
+                for pair, row in first.items():
+                    cursor.execute("INSERT OR IGNORE INTO provenance_log (client_key, merkle_root, scheme) VALUES (?, ?, ?)",
+                                   pair + (row[3],))
+                    if cursor.rowcount:
+                        cursor.execute("SELECT id, timestamp, scheme FROM provenance_log WHERE id = ?", (cursor.lastrowid,))
+                        created[pair] = dict(cursor.fetchone())
+            originals = self._find_seals(cursor, [pair for pair in first if pair not in created])
+
+            new = [(created[pair]['id'], row) for pair, row in first.items() if pair in created]
+            self._store_leaves(cursor, [(seal_id, 0, row[2]) for seal_id, row in new])
+            self._append_log(cursor, [(seal_id, row[1]) for seal_id, row in new])
+            earliest = self._first_seal_ids(cursor, list({row[1] for _, row in new if not row[4]}))
+
+        firsts = {pair for pair, row in first.items()
+                  if pair in created and (row[4] or earliest.get(row[1]) == created[pair]['id'])}
+        seals, seen = [], set()
+        for row in rows:
+            pair = row[:2]
+            seals.append(dict(created.get(pair) or originals[pair], duplicate=pair in seen or pair not in created,
+                              first=pair not in seen and pair in firsts))
+            seen.add(pair)
+        return seals
+
+    def _first_seal_ids(self, cursor, roots: list) -> dict:
+        """Id of the earliest provenance row of each root: {merkle_root: id}."""
+        if not roots:
+            return {}
         if self.mode == "POSTGRES":
+            cursor.execute("SELECT merkle_root, MIN(id) AS id FROM provenance_log WHERE merkle_root = ANY(%s) "
+                           "GROUP BY merkle_root", (roots,))
+            return {row['merkle_root']: row['id'] for row in cursor.fetchall()}
+        found = {}
+        for start in range(0, len(roots), SQLITE_IN_CHUNK):
+            chunk = roots[start:start + SQLITE_IN_CHUNK]
+            cursor.execute(f"SELECT merkle_root, MIN(id) AS id FROM provenance_log WHERE merkle_root IN "
+                           f"({', '.join('?' * len(chunk))}) GROUP BY merkle_root", chunk)
+            found.update((row['merkle_root'], row['id']) for row in cursor.fetchall())
+        return found
+
+    def _find_seals(self, cursor, pairs: list) -> dict:
+        """Original seal {id, timestamp, scheme} for each (client_key, merkle_root) pair."""
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        found = {}
+        for pair in pairs:
             cursor.execute(
-                "INSERT INTO provenance_log (client_key, merkle_root, stored_data) VALUES (%s, %s, %s) RETURNING id", 
-                (api_key, root_hash, data_json)
+                f"SELECT id, timestamp, scheme FROM provenance_log WHERE client_key = {marker} AND merkle_root = {marker}",
+                pair
             )
-            result = cursor.fetchone()
-            return result['id']
+            found[pair] = dict(cursor.fetchone())
+        return found
+
+    def dedupe_seals(self) -> int:
+        """
+        Cleanup job: folds repeat seals of the same (client, root) into the first one
+        and returns how many rows it removed. Migration v6 runs it before adding the
+        unique index; on a large ledger it can be run ahead of the upgrade, online.
+        """
+        with self.get_cursor() as cursor:
+            return self._dedupe_seals(cursor)
+
+    def _dedupe_seals(self, cursor) -> int:
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        removed, last = 0, 0
+        while True:
+            cursor.execute(
+                f"SELECT p.id FROM provenance_log p WHERE p.id > {marker} AND p.merkle_root IS NOT NULL AND EXISTS ("
+                "SELECT 1 FROM provenance_log q WHERE q.merkle_root = p.merkle_root "
+                "AND q.client_key = p.client_key AND q.id < p.id) "
+                f"ORDER BY p.id LIMIT {SQLITE_IN_CHUNK}",
+                (last,)
+            )
+            ids = [row['id'] for row in cursor.fetchall()]
+            if not ids:
+                return removed
+            with self._atomic(cursor):
+                for table, column in (("seal_leaves", "provenance_id"), ("provenance_log", "id")):
+                    if self.mode == "POSTGRES":
+                        cursor.execute(f"DELETE FROM {table} WHERE {column} = ANY(%s)", (ids,))
+                    else:
+                        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({', '.join('?' * len(ids))})", ids)
+            cursor.connection.commit()
+            removed += len(ids)
+            last = ids[-1]
+            print(f"AXON ARCH | SEAL DEDUPE: removed {removed} repeat seals (through #{last})")
+
+    # --- LEAF STORAGE ---
+
+    def _store_leaves(self, cursor, seals: list):
+        """
+        Stores (provenance_id, first_index, items) runs: one seal_leaves row per item,
+        one leaf_blobs row per content not yet on file. Only new content is compressed.
+        """
+        blobs, mapping = {}, []
+        for provenance_id, start, items in seals:
+            for offset, item in enumerate(items):
+                data = item.encode('utf-8')
+                key = leaf_key(data)
+                blobs.setdefault(key, data)
+                mapping.append((provenance_id, start + offset, key))
+        if not mapping:
+            return
+        known = self._known_leaves(cursor, list(blobs))
+        new_blobs = [(key, *encode_leaf(data)) for key, data in blobs.items() if key not in known]
+
+        if self.mode == "POSTGRES":
+            if new_blobs:
+                execute_values(cursor, "INSERT INTO leaf_blobs (content_hash, codec, data) VALUES %s "
+                               "ON CONFLICT (content_hash) DO NOTHING", new_blobs, page_size=LEAF_INSERT_BATCH)
+            execute_values(cursor, "INSERT INTO seal_leaves (provenance_id, item_index, content_hash) VALUES %s",
+                           mapping, page_size=LEAF_INSERT_BATCH)
         else:
+            cursor.executemany("INSERT OR IGNORE INTO leaf_blobs (content_hash, codec, data) VALUES (?, ?, ?)", new_blobs)
+            cursor.executemany("INSERT INTO seal_leaves (provenance_id, item_index, content_hash) VALUES (?, ?, ?)", mapping)
+
+    def _known_leaves(self, cursor, keys: list) -> set:
+        if self.mode == "POSTGRES":
+            cursor.execute("SELECT content_hash FROM leaf_blobs WHERE content_hash = ANY(%s)", (keys,))
+            return {bytes(row['content_hash']) for row in cursor.fetchall()}
+        known = set()
+        for start in range(0, len(keys), SQLITE_IN_CHUNK):
+            chunk = keys[start:start + SQLITE_IN_CHUNK]
+            cursor.execute(f"SELECT content_hash FROM leaf_blobs WHERE content_hash IN ({', '.join('?' * len(chunk))})", chunk)
+            known.update(bytes(row['content_hash']) for row in cursor.fetchall())
+        return known
+
+    def list_roots(self, since_id: int = 0, limit: int = 1000, newest: bool = False, before_id: int = None) -> list:
+        """
+        Published seals after since_id in id order: [{id, merkle_root, timestamp, scheme}]
+        (open streamed seals excluded). With newest, the latest seals below before_id
+        (default: all), newest first.
+        """
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self.get_cursor() as cursor:
+            if newest:
+                bound = f"AND id < {marker} " if before_id is not None else ""
+                cursor.execute(
+                    "SELECT id, merkle_root, timestamp, scheme FROM provenance_log "
+                    f"WHERE merkle_root IS NOT NULL {bound}ORDER BY id DESC LIMIT {marker}",
+                    ((before_id,) if before_id is not None else ()) + (limit,)
+                )
+            else:
+                cursor.execute(
+                    "SELECT id, merkle_root, timestamp, scheme FROM provenance_log "
+                    f"WHERE id > {marker} AND merkle_root IS NOT NULL ORDER BY id LIMIT {marker}",
+                    (since_id, limit)
+                )
+            return cursor.fetchall()
+
+    def fetch_seal_items(self, merkle_root: str):
+        """Items of the first seal with this root, in leaf order (None when the root is unknown)."""
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self.get_cursor() as cursor:
+            cursor.execute(f"SELECT MIN(id) AS id FROM provenance_log WHERE merkle_root = {marker}", (merkle_root,))
+            seal_id = cursor.fetchone()['id']
+            if seal_id is None:
+                return None
+            cursor.execute(
+                "SELECT b.codec, b.data FROM seal_leaves s JOIN leaf_blobs b ON b.content_hash = s.content_hash "
+                f"WHERE s.provenance_id = {marker} ORDER BY s.item_index",
+                (seal_id,)
+            )
+            return [decode_leaf(row['codec'], row['data']).decode('utf-8') for row in cursor.fetchall()]
+
+    def _migrate_seal_payloads(self, cursor):
+        """
+        Migration step: moves stored_data JSON blobs and streamed seal_items into leaf
+        storage. Each chunk is cleared from its source in the same transaction, so an
+        interrupted run resumes where it stopped.
+        """
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        while True:
             cursor.execute(
-                "INSERT INTO provenance_log (client_key, merkle_root, stored_data) VALUES (?, ?, ?)", 
-                (api_key, root_hash, data_json)
+                "SELECT id, stored_data FROM provenance_log WHERE stored_data IS NOT NULL "
+                f"ORDER BY id LIMIT {LEAF_MIGRATION_SEALS}"
             )
-            self.commit()
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            with self._atomic(cursor):
+                self._store_leaves(cursor, [(row['id'], 0, json.loads(row['stored_data'])) for row in rows])
+                cursor.execute(
+                    f"UPDATE provenance_log SET stored_data = NULL WHERE id >= {marker} AND id <= {marker}",
+                    (rows[0]['id'], rows[-1]['id'])
+                )
+            cursor.connection.commit()
+            print(f"AXON ARCH | LEAF STORAGE: migrated seals through #{rows[-1]['id']}")
+
+        while True:
+            cursor.execute(
+                "SELECT provenance_id, item_index, data FROM seal_items "
+                f"ORDER BY provenance_id, item_index LIMIT {LEAF_MIGRATION_ITEMS}"
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            runs = {}
+            for row in rows:
+                runs.setdefault(row['provenance_id'], (row['item_index'], []))[1].append(row['data'])
+            last = rows[-1]
+            with self._atomic(cursor):
+                self._store_leaves(cursor, [(seal_id, start, items) for seal_id, (start, items) in runs.items()])
+                cursor.execute(
+                    f"DELETE FROM seal_items WHERE provenance_id < {marker} "
+                    f"OR (provenance_id = {marker} AND item_index <= {marker})",
+                    (last['provenance_id'], last['provenance_id'], last['item_index'])
+                )
+            cursor.connection.commit()
+            print(f"AXON ARCH | LEAF STORAGE: migrated streamed items through seal #{last['provenance_id']}")
+
+    # --- STREAMED SEALS ---
+    # A streamed seal is opened as a provenance row without a root (invisible to
+    # audits and to the transparency log), filled chunk by chunk, and only gets its
+    # merkle_root, together with its log entry, once the last item has been hashed.
+
+    def begin_seal(self, api_key: str) -> int:
+        with self.get_cursor() as cursor:
+            if self.mode == "POSTGRES":
+                cursor.execute("INSERT INTO provenance_log (client_key) VALUES (%s) RETURNING id", (api_key,))
+                return cursor.fetchone()['id']
+            cursor.execute("INSERT INTO provenance_log (client_key) VALUES (?)", (api_key,))
             return cursor.lastrowid
 
-    def verify_integrity(self, root_hash: str):
-        cursor = self.get_cursor()
-        print(f"DEBUG: Searching for Root Hash: {root_hash}")
-        
+    def store_seal_items(self, seal_id: int, start: int, items: list):
+        with self.transaction() as cursor:
+            self._store_leaves(cursor, [(seal_id, start, items)])
+
+    def finish_seal(self, seal_id: int, root_hash: str, scheme: int = MERKLE_SCHEME) -> dict:
+        """
+        Publishes the root (hashed under scheme) of an open streamed seal and appends it
+        to the transparency log, atomically; returns {id, timestamp, scheme, duplicate}. When the client already
+        sealed this root, the open seal is discarded in favour of the original.
+        """
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        first = self._remember_root(root_hash)
+        with self.transaction() as cursor:
+            cursor.execute(
+                f"SELECT id, timestamp, scheme FROM provenance_log WHERE merkle_root = {marker} "
+                f"AND client_key = (SELECT client_key FROM provenance_log WHERE id = {marker})",
+                (root_hash, seal_id)
+            )
+            original = cursor.fetchone()
+            if original:
+                self._discard_seal(cursor, seal_id)
+                return dict(original, duplicate=True)
+            cursor.execute(f"UPDATE provenance_log SET merkle_root = {marker}, scheme = {marker} WHERE id = {marker}",
+                           (root_hash, scheme, seal_id))
+            cursor.execute(f"SELECT id, timestamp, scheme FROM provenance_log WHERE id = {marker}", (seal_id,))
+            seal = dict(cursor.fetchone(), duplicate=False)
+            self._append_log(cursor, [(seal_id, root_hash)])
+            if not first:
+                first = self._first_seal_ids(cursor, [root_hash]).get(root_hash) == seal_id
+        if first:
+            self._cache_root(root_hash, seal)
+        return seal
+
+    def abort_seal(self, seal_id: int):
+        """Discards an open streamed seal and every item written for it so far."""
+        with self.transaction() as cursor:
+            self._discard_seal(cursor, seal_id)
+
+    def _discard_seal(self, cursor, seal_id: int):
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        # Leaf blobs are shared by content and stay; only this seal's mapping goes
+        cursor.execute(f"DELETE FROM seal_leaves WHERE provenance_id = {marker}", (seal_id,))
+        cursor.execute(f"DELETE FROM provenance_log WHERE id = {marker} AND merkle_root IS NULL", (seal_id,))
+
+    def _append_log(self, cursor, entries: list):
+        """
+        Appends (provenance_id, merkle_root) entries to the transparency log inside the
+        caller's transaction: O(log N) new nodes per entry and one frontier update.
+        The frontier row is the append lock (FOR UPDATE on Postgres; on SQLite the
+        caller's earlier write already holds the database write lock).
+        """
+        if not entries:
+            return
+        lock = " FOR UPDATE" if self.mode == "POSTGRES" else ""
+        cursor.execute(f"SELECT tree_size, nodes FROM log_frontier WHERE id = 1{lock}")
+        state = cursor.fetchone()
+        frontier = Frontier.from_bytes(state['tree_size'], state['nodes'])
+
+        entry_rows, node_rows = [], []
+        for provenance_id, merkle_root in entries:
+            entry_rows.append((frontier.tree_size, provenance_id, merkle_root))
+            node_rows.extend(frontier.append(merkle_root))
+
         if self.mode == "POSTGRES":
-            cursor.execute("SELECT * FROM provenance_log WHERE merkle_root = %s", (root_hash,))
+            execute_values(cursor, "INSERT INTO log_entries (idx, provenance_id, merkle_root) VALUES %s", entry_rows)
+            execute_values(cursor, "INSERT INTO log_nodes (level, idx, hash) VALUES %s", node_rows)
+            cursor.execute("UPDATE log_frontier SET tree_size = %s, nodes = %s WHERE id = 1",
+                           (frontier.tree_size, frontier.to_bytes()))
         else:
-            cursor.execute("SELECT * FROM provenance_log WHERE merkle_root = ?", (root_hash,))
-            
-        result = cursor.fetchone()
+            cursor.executemany("INSERT INTO log_entries (idx, provenance_id, merkle_root) VALUES (?, ?, ?)", entry_rows)
+            cursor.executemany("INSERT INTO log_nodes (level, idx, hash) VALUES (?, ?, ?)", node_rows)
+            cursor.execute("UPDATE log_frontier SET tree_size = ?, nodes = ? WHERE id = 1",
+                           (frontier.tree_size, frontier.to_bytes()))
+
+    def _backfill_transparency_log(self, cursor):
+        """Migration step: logs every seal already in the ledger, in id order. Resumable."""
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        cursor.execute("SELECT COALESCE(MAX(provenance_id), 0) AS last FROM log_entries")
+        last = cursor.fetchone()['last']
+        while True:
+            cursor.execute(
+                f"SELECT id, merkle_root FROM provenance_log WHERE id > {marker} AND merkle_root IS NOT NULL "
+                f"ORDER BY id LIMIT {LOG_BACKFILL_CHUNK}",
+                (last,)
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return
+            with self._atomic(cursor):
+                self._append_log(cursor, [(row['id'], row['merkle_root']) for row in rows])
+            cursor.connection.commit()
+            last = rows[-1]['id']
+            print(f"AXON ARCH | TRANSPARENCY LOG: backfilled through seal #{last}")
+
+    # --- ROOT FILTER ---
+
+    def _load_root_filter(self):
+        """Boot: the snapshot if it still matches this ledger's log and sizing, else a full build; then catch up."""
+        head = self.log_head()
+        bloom = BloomFilter.load(self.root_filter_path)
+        source = "SNAPSHOT"
+        if bloom is None or not self._root_snapshot_usable(bloom, head):
+            bloom, source = self._build_root_filter(head), "LEDGER SCAN"
+        self.root_filter = bloom
+        self.sync_root_filter()
+        self.save_root_filter()
+        if BLOOM_SYNC_SECONDS > 0:
+            self._root_filter_stop.clear()
+            threading.Thread(target=self._sync_root_filter_loop, name="axon-root-filter", daemon=True).start()
+        print(f"AXON ARCH | ROOT FILTER: {bloom.count} roots from {source} "
+              f"({len(bloom.bits) / 2**20:.1f} MiB, ~{bloom.expected_error_rate():.2%} false positives)")
+
+    def _sync_root_filter_loop(self):
+        """Background catch-up: keeps other workers' seals flowing in off the request path."""
+        while not self._root_filter_stop.wait(BLOOM_SYNC_SECONDS):
+            try:
+                self.sync_root_filter()
+            except Exception as e:
+                print(f"AXON ARCH | ROOT FILTER SYNC FAILED: {e}")
+
+    def _root_snapshot_usable(self, bloom: BloomFilter, head: Frontier) -> bool:
+        if bloom.error_rate != BLOOM_ERROR_RATE or bloom.capacity < max(BLOOM_CAPACITY, head.tree_size):
+            return False
+        if BLOOM_MAX_BYTES and len(bloom.bits) > BLOOM_MAX_BYTES:
+            return False
+        # The tag is the log root at the watermark: a snapshot of another (or a rewound) ledger never matches
+        return bloom.watermark <= head.tree_size and bloom.tag == self.log_root(bloom.watermark).hex()
+
+    def _build_root_filter(self, head: Frontier) -> BloomFilter:
+        bloom = BloomFilter(max(BLOOM_CAPACITY, 2 * head.tree_size), BLOOM_ERROR_RATE, BLOOM_MAX_BYTES)
+        # The log position is taken before the scan: a root sealed meanwhile is in the scan, the catch-up, or both
+        bloom.watermark = head.tree_size
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        last = 0
+        with self.get_cursor() as cursor:
+            while True:
+                cursor.execute(
+                    f"SELECT id, merkle_root FROM provenance_log WHERE id > {marker} AND merkle_root IS NOT NULL "
+                    f"ORDER BY id LIMIT {BLOOM_SCAN_CHUNK}",
+                    (last,)
+                )
+                rows = cursor.fetchall()
+                for row in rows:
+                    bloom.add(row['merkle_root'])
+                if len(rows) < BLOOM_SCAN_CHUNK:
+                    return bloom
+                last = rows[-1]['id']
+
+    def sync_root_filter(self):
+        """Feeds the filter every root logged since its watermark, i.e. seals made by other workers."""
+        bloom = self.root_filter
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self._root_filter_lock:
+            # Log indices are assigned under the frontier lock, in commit order: no gaps to miss
+            with self.get_cursor() as cursor:
+                while True:
+                    cursor.execute(
+                        f"SELECT idx, merkle_root FROM log_entries WHERE idx >= {marker} "
+                        f"ORDER BY idx LIMIT {BLOOM_SCAN_CHUNK}",
+                        (bloom.watermark,)
+                    )
+                    rows = cursor.fetchall()
+                    for row in rows:
+                        bloom.add(row['merkle_root'])
+                    if rows:
+                        bloom.watermark = rows[-1]['idx'] + 1
+                    if len(rows) < BLOOM_SCAN_CHUNK:
+                        break
+            self._root_filter_syncs += 1
+
+    def save_root_filter(self):
+        """Snapshots the filter (tagged with the log root at its watermark) for a fast next boot."""
+        if self.root_filter is None:
+            return
+        try:
+            with self._root_filter_lock:
+                self.root_filter.tag = self.log_root(self.root_filter.watermark).hex()
+                self.root_filter.save(self.root_filter_path)
+        except Exception as e:
+            print(f"AXON ARCH | ROOT FILTER SNAPSHOT FAILED: {e}")
+
+    def _remember_root(self, root_hash: str) -> bool:
+        """Adds a root being sealed to the filter; True when no earlier seal of it can exist (False: unknown)."""
+        return self.root_filter is not None and self.root_filter.add(root_hash)
+
+    def _root_filter_due(self, roots) -> bool:
+        """True when a root reads as absent and, with no background catch-up, the log must be read first."""
+        return BLOOM_SYNC_SECONDS <= 0 and any(root not in self.root_filter for root in roots)
+
+    def _root_filter_verdicts(self, roots, synced: bool = False) -> list:
+        """The roots that may be sealed, recording one verdict each; the others are definitely not."""
+        bloom = self.root_filter
+        candidates = []
+        for root in roots:
+            found = root in bloom
+            bloom.record(found, queried=synced)
+            if found:
+                candidates.append(root)
+        return candidates
+
+    def roots_may_exist(self, roots) -> list:
+        """Filters out roots that were never sealed, normally without touching the ledger (see ROOT FILTER)."""
+        if self.root_filter is None:
+            return list(roots)
+        synced = self._root_filter_due(roots)
+        if synced:
+            self.sync_root_filter()
+        return self._root_filter_verdicts(roots, synced)
+
+    # --- HOT ROOTS ---
+
+    def _hot_root(self, root_hash: str):
+        cached = self.hot_roots.get(root_hash) if self.hot_roots is not None else None
+        return dict(cached) if cached else None
+
+    def _cache_root(self, root_hash: str, seal):
+        if self.hot_roots is not None:
+            self.hot_roots.put(root_hash, {"id": seal["id"], "timestamp": seal["timestamp"], "scheme": seal["scheme"]})
+
+    def verify_integrity(self, root_hash: str):
+        """First seal {id, timestamp, scheme} of a root: hot-root cache, then root filter, then the ledger."""
+        cached = self._hot_root(root_hash)
+        if cached:
+            return cached
+        if not self.roots_may_exist([root_hash]):
+            return None
+
+        with self.get_cursor() as cursor:
+            # Narrow, index-backed lookup: the audit needs provenance metadata, never the sealed items
+            if self.mode == "POSTGRES":
+                cursor.execute("SELECT id, timestamp, scheme FROM provenance_log WHERE merkle_root = %s ORDER BY id LIMIT 1", (root_hash,))
+            else:
+                cursor.execute("SELECT id, timestamp, scheme FROM provenance_log WHERE merkle_root = ? ORDER BY id LIMIT 1", (root_hash,))
+            result = cursor.fetchone()
+
         if result:
-            print("DEBUG: Hash FOUND in Ledger.")
-        else:
-            print("DEBUG: Hash NOT FOUND.")
+            self._cache_root(root_hash, result)
+        elif self.root_filter is not None:
+            self.root_filter.record_false_positives()
         return result
 
+    def verify_integrity_many(self, roots) -> dict:
+        """
+        Provenance for many roots in one round-trip ({root: row with id, timestamp, scheme};
+        absent roots are simply missing). Repeat seals resolve to their first row.
+        """
+        found, misses = {}, []
+        for root in set(roots):
+            cached = self._hot_root(root)
+            if cached:
+                found[root] = cached
+            else:
+                misses.append(root)
+        roots = self.roots_may_exist(misses)
+        if not roots:
+            return found
+        with self.get_cursor() as cursor:
+            if self.mode == "POSTGRES":
+                cursor.execute(
+                    "SELECT DISTINCT ON (merkle_root) merkle_root, id, timestamp, scheme FROM provenance_log "
+                    "WHERE merkle_root = ANY(%s) ORDER BY merkle_root, id",
+                    (roots,)
+                )
+                found.update((row['merkle_root'], row) for row in cursor.fetchall())
+            else:
+                for start in range(0, len(roots), SQLITE_IN_CHUNK):
+                    chunk = roots[start:start + SQLITE_IN_CHUNK]
+                    # Bare columns next to MIN(id) come from the row holding that minimum
+                    cursor.execute(
+                        "SELECT merkle_root, MIN(id) AS id, timestamp, scheme FROM provenance_log "
+                        f"WHERE merkle_root IN ({', '.join('?' * len(chunk))}) GROUP BY merkle_root",
+                        chunk
+                    )
+                    found.update((row['merkle_root'], row) for row in cursor.fetchall())
+        fetched = [root for root in roots if root in found]
+        for root in fetched:
+            self._cache_root(root, found[root])
+        if self.root_filter is not None and len(fetched) < len(roots):
+            self.root_filter.record_false_positives(len(roots) - len(fetched))
+        return found
+
+    def store_tree(self, root_hash: str, scheme: int, levels: list, page_nodes: int = MERKLE_PAGE_NODES) -> bool:
+        """
+        Persists a built tree (MerkleEngine.levels) for proof issuance, atomically.
+        Roots are stored once: returns False when this root is already on file.
+        """
+        leaves = levels[0]
+        leaf_count = len(leaves) // DIGEST_SIZE
+        leaf_rows = lambda tree_id: (
+            (tree_id, i, bytes(leaves[i * DIGEST_SIZE:(i + 1) * DIGEST_SIZE])) for i in range(leaf_count)
+        )
+        node_rows = lambda tree_id: ((tree_id, page, nodes) for page, nodes in enumerate(iter_node_pages(levels, page_nodes)))
+
+        with self.transaction() as cursor:
+            if self.mode == "POSTGRES":
+                cursor.execute(
+                    "INSERT INTO merkle_trees (merkle_root, leaf_count, scheme, page_nodes) VALUES (%s, %s, %s, %s) "
+                    "ON CONFLICT (merkle_root) DO NOTHING RETURNING id",
+                    (root_hash, leaf_count, scheme, page_nodes)
+                )
+                tree = cursor.fetchone()
+                if not tree:
+                    return False
+                execute_values(cursor, "INSERT INTO merkle_nodes (tree_id, page, nodes) VALUES %s",
+                               node_rows(tree['id']), page_size=LEAF_INSERT_BATCH // page_nodes or 1)
+                execute_values(cursor, "INSERT INTO merkle_leaves (tree_id, leaf_index, leaf_hash) VALUES %s",
+                               leaf_rows(tree['id']), page_size=LEAF_INSERT_BATCH)
+            else:
+                cursor.execute(
+                    "INSERT OR IGNORE INTO merkle_trees (merkle_root, leaf_count, scheme, page_nodes) VALUES (?, ?, ?, ?)",
+                    (root_hash, leaf_count, scheme, page_nodes)
+                )
+                if cursor.rowcount == 0:
+                    return False
+                tree_id = cursor.lastrowid
+                cursor.executemany("INSERT INTO merkle_nodes (tree_id, page, nodes) VALUES (?, ?, ?)", node_rows(tree_id))
+                cursor.executemany("INSERT INTO merkle_leaves (tree_id, leaf_index, leaf_hash) VALUES (?, ?, ?)", leaf_rows(tree_id))
+        return True
+
+    def fetch_tree(self, root_hash: str = None, leaf_hash: bytes = None):
+        """
+        Stored tree row by root, or by leaf hash (optionally pinned to a root; otherwise
+        the newest tree holding that leaf, whose position comes back as leaf_index).
+        """
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self.get_cursor() as cursor:
+            if leaf_hash is not None:
+                query = (
+                    "SELECT t.id, t.merkle_root, t.leaf_count, t.scheme, t.page_nodes, l.leaf_index "
+                    f"FROM merkle_leaves l JOIN merkle_trees t ON t.id = l.tree_id WHERE l.leaf_hash = {marker}"
+                )
+                args = [leaf_hash]
+                if root_hash:
+                    query += f" AND t.merkle_root = {marker}"
+                    args.append(root_hash)
+                cursor.execute(query + " ORDER BY t.id DESC LIMIT 1", args)
+            else:
+                cursor.execute(
+                    f"SELECT id, merkle_root, leaf_count, scheme, page_nodes FROM merkle_trees WHERE merkle_root = {marker}",
+                    (root_hash,)
+                )
+            return cursor.fetchone()
+
+    def fetch_pages(self, tree_id: int, pages: list) -> list:
+        if not pages:
+            return []
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self.get_cursor() as cursor:
+            cursor.execute(
+                f"SELECT page, nodes FROM merkle_nodes WHERE tree_id = {marker} "
+                f"AND page IN ({', '.join([marker] * len(pages))})",
+                [tree_id, *pages]
+            )
+            return cursor.fetchall()
+
+    def fetch_proof(self, root_hash: str = None, leaf_index: int = None, leaf_hash: bytes = None):
+        """
+        O(log N) proof lookup against a stored tree, by (root, index) or by leaf hash.
+        Reads one tree row (one leaf-index probe) and only the pages on the proof path.
+        """
+        tree = self.fetch_tree(root_hash, leaf_hash)
+        if tree is not None and leaf_hash is not None:
+            leaf_index = tree['leaf_index']
+        if tree is None or leaf_index is None or not 0 <= leaf_index < tree['leaf_count']:
+            return None
+        return assemble_proof(tree, leaf_index, self.fetch_pages(tree['id'], proof_pages(tree, leaf_index)))
+
+    def fetch_multiproof(self, root_hash: str, indices: list):
+        """One multiproof for many leaves of a stored tree; reads each page on the combined paths once."""
+        tree = self.fetch_tree(root_hash)
+        if tree is None or not indices or min(indices) < 0 or max(indices) >= tree['leaf_count']:
+            return None
+        pages = multiproof_pages(tree['leaf_count'], indices, tree['page_nodes'])
+        return assemble_multiproof(tree, indices, self.fetch_pages(tree['id'], pages))
+
+    def log_head(self) -> Frontier:
+        with self.get_cursor() as cursor:
+            cursor.execute("SELECT tree_size, nodes FROM log_frontier WHERE id = 1")
+            state = cursor.fetchone()
+        return Frontier.from_bytes(state['tree_size'], state['nodes'])
+
+    def log_root(self, tree_size: int = None) -> bytes:
+        """Transparency-log root hash at tree_size (default: the current head)."""
+        head = self.log_head()
+        if tree_size is None or tree_size == head.tree_size:
+            return head.root()
+        return root_at(tree_size, accessor(self.log_nodes(nodes_needed(root_at, tree_size))))
+
+    def log_nodes(self, keys: list) -> dict:
+        """Stored transparency-log nodes {(level, idx): hash} for a planned proof, in one query."""
+        if not keys:
+            return {}
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        pairs = ", ".join([f"({marker}, {marker})"] * len(keys))
+        with self.get_cursor() as cursor:
+            cursor.execute(
+                f"SELECT level, idx, hash FROM log_nodes WHERE (level, idx) IN (VALUES {pairs})",
+                [value for key in keys for value in key]
+            )
+            return {(row['level'], row['idx']): bytes(row['hash']) for row in cursor.fetchall()}
+
+    def log_entry_index(self, merkle_root: str):
+        """Log position of a root's first seal, or None."""
+        marker = "%s" if self.mode == "POSTGRES" else "?"
+        with self.get_cursor() as cursor:
+            cursor.execute(f"SELECT MIN(idx) AS idx FROM log_entries WHERE merkle_root = {marker}", (merkle_root,))
+            row = cursor.fetchone()
+        return row['idx'] if row else None
+
+    def log_inclusion(self, merkle_root: str, tree_size: int = None):
+        """Inclusion proof for a seal root against the current (or an earlier) log size."""
+        head = self.log_head()
+        tree_size = head.tree_size if tree_size is None else tree_size
+        index = self.log_entry_index(merkle_root)
+        if index is None or not index < tree_size <= head.tree_size:
+            return None
+        nodes = self.log_nodes(inclusion_keys(index, tree_size, head))
+        return inclusion_proof(merkle_root, index, tree_size, head, nodes)
+
+    def log_consistency(self, first: int, second: int = None):
+        """Consistency proof that the log at size `first` is a prefix of the log at `second` (default: now)."""
+        head = self.log_head()
+        second = head.tree_size if second is None else second
+        if not 0 <= first <= second <= head.tree_size:
+            return None
+        nodes = self.log_nodes(consistency_keys(first, second, head))
+        return consistency_proof(first, second, head, nodes)
+
+    def stats(self) -> dict:
+        """Operational counters for the ledger layer (pool wait times, group-commit batch sizes)."""
+        stats = {"mode": self.mode, "pool": self.pool.stats()}
+        if self.batcher:
+            stats["group_commit"] = self.batcher.stats()
+        if self.sealed is not None:
+            stats["sealed_cache"] = self.sealed.stats()
+        if self.hot_roots is not None:
+            stats["hot_roots"] = self.hot_roots.stats()
+        if self.root_filter is not None:
+            stats["root_filter"] = dict(self.root_filter.stats(), syncs=self._root_filter_syncs)
+        return stats
+
     def close(self):
-        if self.conn:
-            self.conn.close()
+        if self.batcher:
+            self.batcher.close()
+        self._root_filter_stop.set()
+        self.save_root_filter()
+        self.pool.close()
+
+def proof_pages(tree, leaf_index: int) -> list:
+    """Page numbers a proof for leaf_index reads (one per level at most, usually far fewer)."""
+    page_nodes = tree['page_nodes']
+    return sorted({position // page_nodes for position in page_positions(tree['leaf_count'], leaf_index)})
+
+def assemble_proof(tree, leaf_index: int, page_rows) -> dict:
+    """Shapes a stored tree row plus its fetched pages into the /v1/proof payload."""
+    pages = {row['page']: bytes(row['nodes']) for row in page_rows}
+    leaf, proof = proof_from_pages(tree['leaf_count'], leaf_index, pages, tree['page_nodes'])
+    return {
+        "merkle_root": tree['merkle_root'],
+        "leaf_index": leaf_index,
+        "leaf_hash": leaf.hex() if leaf else tree['merkle_root'],
+        "leaf_count": tree['leaf_count'],
+        "scheme": tree['scheme'],
+        "proof": proof,
+    }
+
+def assemble_multiproof(tree, indices: list, page_rows) -> dict:
+    pages = {row['page']: bytes(row['nodes']) for row in page_rows}
+    multiproof = multiproof_from_pages(tree['leaf_count'], indices, pages, tree['page_nodes'])
+    return {"merkle_root": tree['merkle_root'], "scheme": tree['scheme'], "multiproof": multiproof}
 
 if __name__ == "__main__":
     print("AXON ARCH | PRE-FLIGHT CHECK: Bypassed. Handing execution to Uvicorn.")
@@ -0,0 +1,292 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+
+# AXON ARCH | BACKGROUND JOB QUEUE
+# Large seals are queued in a local SQLite file (no broker) and run by a bounded
+# pool of worker threads. Any engine process sharing the file may claim a job:
+# claims are atomic (BEGIN IMMEDIATE) and carry a lease, renewed while the
+# handler runs, so a job whose process died mid-run is picked up again once the
+# lease lapses. A worker only records the outcome of the attempt it claimed.
+# Re-running a seal is safe: sealing is idempotent per (client_key, merkle_root).
+JOB_WORKERS = int(os.getenv("AXON_JOB_WORKERS", "2"))
+# Queued (not yet running) jobs accepted before new ones are refused
+JOB_QUEUE_MAX = int(os.getenv("AXON_JOB_QUEUE_MAX", "1000"))
+JOB_LEASE_SECONDS = float(os.getenv("AXON_JOB_LEASE_SECONDS", "900"))
+JOB_MAX_ATTEMPTS = int(os.getenv("AXON_JOB_MAX_ATTEMPTS", "3"))
+# Finished jobs (and their results) are kept this long for polling clients
+JOB_RETENTION_SECONDS = float(os.getenv("AXON_JOB_RETENTION_SECONDS", "86400"))
+# Idle workers re-check the file this often for jobs queued by other processes
+JOB_POLL_SECONDS = 1.0
+
+QUEUED, RUNNING, DONE, FAILED = "QUEUED", "RUNNING", "DONE", "FAILED"
+TERMINAL = (DONE, FAILED)
+
+def default_path() -> str:
+    if os.getenv("AXON_JOB_DB"):
+        return os.environ["AXON_JOB_DB"]
+    if os.path.exists("/var/lib/axon_data"):
+        return "/var/lib/axon_data/axon_jobs.db"
+    return "axon_jobs.db"
+
+class QueueFull(Exception):
+    pass
+
+class JobQueue:
+    """
+    SQLite-backed queue of seal jobs. handler(client_key, items) -> dict runs on a
+    worker thread; its return value is the job result, and an exception fails the
+    job with the exception's `detail` (HTTPException) or message.
+    """
+    def __init__(self, handler, path: str = None, workers: int = JOB_WORKERS,
+                 max_queued: int = JOB_QUEUE_MAX, lease: float = JOB_LEASE_SECONDS):
+        self.handler = handler
+        self.path = path or default_path()
+        self.workers = workers
+        self.max_queued = max_queued
+        self.lease = lease
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        self._busy = 0
+        self._busy_lock = threading.Lock()
+        self._last_purge = 0.0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def start(self):
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS seal_jobs (
+                    id TEXT PRIMARY KEY,
+                    client_key TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    items INTEGER NOT NULL,
+                    payload BLOB,
+                    result TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL,
+                    lease_until REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_seal_jobs_status ON seal_jobs (status, created_at)")
+        finally:
+            conn.close()
+        self._stop.clear()
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"axon-job-{n}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"AXON ARCH | JOB QUEUE: {self.workers} workers on {self.path}")
+
+    def shutdown(self, timeout: float = 30.0):
+        """Stops claiming new jobs and waits for running ones; unfinished jobs stay queued for the next start."""
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    # --- PRODUCER / POLLING SIDE ---
+
+    def submit(self, client_key: str, items: list) -> dict:
+        """Queues a seal of items; returns the job record. Raises QueueFull past max_queued."""
+        payload = zlib.compress(json.dumps(items).encode("utf-8"), 1)
+        job_id = uuid.uuid4().hex
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            depth = conn.execute("SELECT COUNT(*) FROM seal_jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+            if depth >= self.max_queued:
+                conn.execute("ROLLBACK")
+                raise QueueFull("QUEUE_FULL")
+            conn.execute(
+                "INSERT INTO seal_jobs (id, client_key, status, items, payload, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, client_key, QUEUED, len(items), payload, time.time())
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        with self._wake:
+            self._wake.notify()
+        return self.get(job_id, client_key)
+
+    def get(self, job_id: str, client_key: str):
+        """The client's job as a status dict, or None when it does not exist (or is not theirs)."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, status, items, result, error, attempts, created_at, started_at, finished_at "
+                "FROM seal_jobs WHERE id = ? AND client_key = ?",
+                (job_id, client_key)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = {
+            "job_id": row['id'],
+            "status": row['status'],
+            "items": row['items'],
+            "attempts": row['attempts'],
+            "created_at": _iso(row['created_at']),
+            "started_at": _iso(row['started_at']),
+            "finished_at": _iso(row['finished_at']),
+        }
+        if row['result'] is not None:
+            job["result"] = json.loads(row['result'])
+        if row['error'] is not None:
+            job["error"] = row['error']
+        return job
+
+    def stats(self) -> dict:
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM seal_jobs GROUP BY status").fetchall())
+            oldest = conn.execute("SELECT MIN(created_at) FROM seal_jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            "queued": counts.get(QUEUED, 0),
+            "running": counts.get(RUNNING, 0),
+            "done": counts.get(DONE, 0),
+            "failed": counts.get(FAILED, 0),
+            "oldest_queued_seconds": time.time() - oldest if oldest else 0.0,
+            "workers": self.workers,
+            "busy_workers": self._busy,
+            "max_queued": self.max_queued,
+        }
+
+    # --- WORKER SIDE ---
+
+    def _claim(self):
+        """Atomically takes the oldest queued job (or one whose lease lapsed): (id, client_key, items, attempt) or None."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # Lapsed jobs out of attempts are failed together, so the pick below is always runnable
+            conn.execute(
+                "UPDATE seal_jobs SET status = ?, error = ?, payload = NULL, finished_at = ?, lease_until = NULL "
+                "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                (FAILED, "JOB_ABANDONED", now, RUNNING, now, JOB_MAX_ATTEMPTS)
+            )
+            row = conn.execute(
+                "SELECT id, client_key, payload, attempts FROM seal_jobs "
+                "WHERE status = ? OR (status = ? AND lease_until < ?) ORDER BY created_at LIMIT 1",
+                (QUEUED, RUNNING, now)
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE seal_jobs SET status = ?, attempts = attempts + 1, started_at = ?, lease_until = ? WHERE id = ?",
+                (RUNNING, now, now + self.lease, row['id'])
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return row['id'], row['client_key'], json.loads(zlib.decompress(row['payload'])), row['attempts'] + 1
+
+    def _renew(self, job_id: str, attempt: int) -> bool:
+        """Extends the lease of our attempt; False once another worker has taken the job over."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE seal_jobs SET lease_until = ? WHERE id = ? AND attempts = ? AND status = ?",
+                (time.time() + self.lease, job_id, attempt, RUNNING)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def _heartbeat(self, job_id: str, attempt: int, done: threading.Event):
+        while not done.wait(self.lease / 3):
+            try:
+                if not self._renew(job_id, attempt):
+                    print(f"AXON ARCH | JOB {job_id}: lease lost (attempt {attempt})")
+                    return
+            except Exception as e:
+                print(f"AXON ARCH | JOB QUEUE ERROR: {e}")
+
+    def _finish(self, job_id: str, attempt: int, status: str, result: dict = None, error: str = None) -> bool:
+        """Records the outcome of our attempt; False (nothing written) when the job was re-claimed meanwhile."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE seal_jobs SET status = ?, result = ?, error = ?, payload = NULL, "
+                "finished_at = ?, lease_until = NULL WHERE id = ? AND attempts = ? AND status = ?",
+                (status, json.dumps(result, default=str) if result is not None else None, error, time.time(),
+                 job_id, attempt, RUNNING)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def _purge(self):
+        if time.monotonic() - self._last_purge < 60:
+            return
+        self._last_purge = time.monotonic()
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM seal_jobs WHERE status IN (?, ?) AND finished_at < ?",
+                         (DONE, FAILED, time.time() - JOB_RETENTION_SECONDS))
+        finally:
+            conn.close()
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self._claim()
+                self._purge()
+            except Exception as e:
+                # A worker never exits on a queue error: it backs off one poll and tries again
+                print(f"AXON ARCH | JOB QUEUE ERROR: {e}")
+                claimed = None
+            if claimed is None:
+                with self._wake:
+                    self._wake.wait(JOB_POLL_SECONDS)
+                continue
+
+            job_id, client_key, items, attempt = claimed
+            with self._busy_lock:
+                self._busy += 1
+            done = threading.Event()
+            threading.Thread(target=self._heartbeat, args=(job_id, attempt, done),
+                             name=f"axon-job-lease-{job_id[:8]}", daemon=True).start()
+            started = time.perf_counter()
+            try:
+                result = self.handler(client_key, items)
+            except Exception as e:
+                error = str(getattr(e, "detail", None) or e)
+                print(f"AXON ARCH | JOB {job_id} FAILED: {error}")
+                outcome = (FAILED, None, error)
+            else:
+                print(f"AXON ARCH | JOB {job_id}: {len(items)} items sealed in {time.perf_counter() - started:.2f}s")
+                outcome = (DONE, result, None)
+            finally:
+                done.set()
+                with self._busy_lock:
+                    self._busy -= 1
+            try:
+                if not self._finish(job_id, attempt, *outcome):
+                    print(f"AXON ARCH | JOB {job_id}: attempt {attempt} superseded, outcome discarded")
+            except Exception as e:
+                print(f"AXON ARCH | JOB QUEUE ERROR: {e}")
+
+def _iso(ts):
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(ts)) if ts else None
@@ -0,0 +1,61 @@
+import hashlib
+import os
+import zlib
+
+# zstd is optional: without the zstandard package the ledger writes zlib and can
+# still read every zlib/raw leaf; only existing zstd leaves become unreadable.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# AXON ARCH | CONTENT-ADDRESSED LEAF STORAGE
+# Sealed items are stored once per distinct content, keyed by SHA-256 of their
+# UTF-8 bytes (independent of the Merkle scheme and key, so the same item sealed
+# by different clients or schemes is still one row). Each blob records the codec
+# it was written with, so AXON_LEAF_CODEC can change without rewriting the table.
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {"none": CODEC_RAW, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+LEAF_CODEC = os.getenv("AXON_LEAF_CODEC", "zlib").lower()
+# Items shorter than this are stored raw: the codec framing would outweigh any gain
+LEAF_COMPRESS_MIN = int(os.getenv("AXON_LEAF_COMPRESS_MIN", "64"))
+
+def _default_codec() -> int:
+    codec = CODEC_NAMES.get(LEAF_CODEC)
+    if codec is None:
+        raise ValueError(f"UNKNOWN_LEAF_CODEC: {LEAF_CODEC}")
+    if codec == CODEC_ZSTD and zstandard is None:
+        print("AXON ARCH | LEAF CODEC: zstandard not installed, falling back to zlib")
+        return CODEC_ZLIB
+    return codec
+
+DEFAULT_CODEC = _default_codec()
+
+def leaf_key(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+def encode_leaf(data: bytes, codec: int = None):
+    """Returns (codec, stored bytes); falls back to raw when compression does not pay."""
+    codec = DEFAULT_CODEC if codec is None else codec
+    if codec == CODEC_RAW or len(data) < LEAF_COMPRESS_MIN:
+        return CODEC_RAW, data
+    if codec == CODEC_ZSTD:
+        packed = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        packed = zlib.compress(data, 6)
+    return (codec, packed) if len(packed) < len(data) else (CODEC_RAW, data)
+
+def decode_leaf(codec: int, stored: bytes) -> bytes:
+    stored = bytes(stored)
+    if codec == CODEC_RAW:
+        return stored
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(stored)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise Exception("LEAF_CODEC_UNAVAILABLE: zstd")
+        return zstandard.ZstdDecompressor().decompress(stored)
+    raise Exception(f"UNKNOWN_LEAF_CODEC: {codec}")
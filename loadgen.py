@@ -0,0 +1,364 @@
+"""
+AXON ARCH | LOAD GENERATOR: end-to-end seal/validate traffic against a local engine.
+
+Starts the engine itself against a throwaway SQLite ledger (or targets one that
+is already running), checks the seal -> proof -> validate -> tamper round trip,
+then drives a weighted mix of traffic from an async HTTP client:
+
+    seal      POST /v1/seal with --items fresh items
+    validate  POST /v1/validate of a pre-sealed leaf and its issued proof
+    missing   POST /v1/validate of a root that was never sealed
+
+Open loop by default: requests are scheduled at --rate per second across
+--concurrency connections, and each latency is measured from the moment the
+request was *due*, not when a free connection finally sent it. A stalled server
+therefore shows up in the percentiles instead of silently slowing the client
+down (coordinated omission). The raw send-to-response service time is reported
+next to it; --rate 0 runs closed loop at maximum throughput, where only service
+time is meaningful.
+
+    python loadgen.py --workers 2 --rate 300 --duration 30 --mix seal=1,validate=8,missing=1
+    python loadgen.py --inprocess --rate 0 --concurrency 16
+    python loadgen.py --url http://127.0.0.1:10000 --key "$AXON_SOVEREIGN_KEY"
+
+Requires httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import secrets
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+PERCENTILES = (50, 95, 99, 99.9)
+OPERATIONS = ("seal", "validate", "missing")
+# With several engine workers, a root sealed on one reaches the others' root filters
+# within a background catch-up (AXON_BLOOM_SYNC_SECONDS): validate traffic waits that
+# out after seeding, so it measures latency rather than the staleness window
+ROOT_FILTER_SETTLE = 2 * float(os.getenv("AXON_BLOOM_SYNC_SECONDS", "1"))
+
+# --- TARGETS ---
+# Each is an async context manager yielding (httpx.AsyncClient kwargs, api key).
+
+class SpawnedEngine:
+    """uvicorn main:app on a free localhost port, cwd (and so the SQLite ledger) in a temp dir."""
+    def __init__(self, workers: int, boot_timeout: float = 30.0):
+        self.workers = workers
+        self.boot_timeout = boot_timeout
+
+    async def __aenter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.key = secrets.token_hex(16)
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        env = dict(os.environ, AXON_SOVEREIGN_KEY=self.key)
+        env.pop("DATABASE_URL", None)
+        self.log = open(os.path.join(self.tmp.name, "engine.log"), "w")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--app-dir", REPO_DIR,
+             "--host", "127.0.0.1", "--port", str(port), "--workers", str(self.workers),
+             "--log-level", "warning", "--no-access-log"],
+            cwd=self.tmp.name, env=env, stdout=self.log, stderr=subprocess.STDOUT
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + self.boot_timeout
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            while True:
+                if self.proc.poll() is not None:
+                    raise RuntimeError(f"ENGINE_EXITED ({self.proc.returncode}); see {self.log.name}")
+                try:
+                    if (await client.get("/")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if time.monotonic() > deadline:
+                    raise RuntimeError("ENGINE_BOOT_TIMEOUT")
+                await asyncio.sleep(0.1)
+        print(f"AXON ARCH | LOADGEN: engine up at {base_url} ({self.workers} worker(s), ledger in {self.tmp.name})")
+        return {"base_url": base_url}, self.key
+
+    async def __aexit__(self, *exc):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+        self.log.close()
+        self.tmp.cleanup()
+
+class InProcessEngine:
+    """main.app behind httpx's ASGI transport: no sockets, client and engine share one event loop."""
+    async def __aenter__(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        self.key = secrets.token_hex(16)
+        os.environ["AXON_SOVEREIGN_KEY"] = self.key
+        os.environ.pop("DATABASE_URL", None)
+        # main builds its AxonDB at import time: the ledger lands in the cwd
+        os.chdir(self.tmp.name)
+        sys.path.insert(0, REPO_DIR)
+        import main
+        self.lifespan = main.app.router.lifespan_context(main.app)
+        await self.lifespan.__aenter__()
+        print(f"AXON ARCH | LOADGEN: engine in-process (ledger in {self.tmp.name})")
+        return {"base_url": "http://axon.local", "transport": httpx.ASGITransport(app=main.app)}, self.key
+
+    async def __aexit__(self, *exc):
+        await self.lifespan.__aexit__(None, None, None)
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+class RemoteEngine:
+    def __init__(self, url: str, key: str):
+        self.url, self.key = url, key
+
+    async def __aenter__(self):
+        return {"base_url": self.url}, self.key
+
+    async def __aexit__(self, *exc):
+        pass
+
+# --- TRAFFIC ---
+
+def random_items(rng: random.Random, count: int, size: int):
+    return [f"ctx {rng.getrandbits(64):016x} " + "v" * max(0, size - 21) for _ in range(count)]
+
+async def seed_pool(client, headers, rng, pool_size: int, items: int, item_size: int):
+    """(root, leaf data, proof) triples for validate traffic: one seal plus one issued proof each."""
+    pool = []
+    for _ in range(pool_size):
+        batch = random_items(rng, items, item_size)
+        res = await client.post("/v1/seal", json={"data_items": batch}, headers=headers)
+        res.raise_for_status()
+        root = res.json()["seal_id"]
+        index = rng.randrange(len(batch))
+        res = await client.post("/v1/proof", json={"merkle_root": root, "leaf_index": index}, headers=headers)
+        proof = res.json().get("proof", []) if res.status_code == 200 else []
+        pool.append((root, batch[index], proof))
+    return pool
+
+async def preflight(client, headers, rng, items: int, item_size: int):
+    """The old simulation.py walk-through, asserted: seal, prove, validate, tamper, miss."""
+    batch = random_items(rng, max(2, items), item_size)
+    checks = []
+    res = await client.post("/v1/seal", json={"data_items": batch}, headers=headers)
+    checks.append(("seal", res.status_code == 200 and res.json().get("status") == "SEALED", res.status_code))
+    if res.status_code != 200:
+        return checks
+    root = res.json()["seal_id"]
+    res = await client.post("/v1/proof", json={"merkle_root": root, "data": batch[1]}, headers=headers)
+    proof = res.json().get("proof") if res.status_code == 200 else None
+    checks.append(("proof", proof is not None, res.status_code))
+    for name, fragment, target, expected in (
+        ("validate", batch[1], root, "VERIFIED_SECURE"),
+        ("tampered", batch[1] + " (edited)", root, "INTEGRITY_FAILURE"),
+        ("missing", batch[1], "00" * 32, "PROVENANCE_MISSING"),
+    ):
+        res = await client.post("/v1/validate", json={"merkle_root": target, "data_fragment": fragment,
+                                                       "proof": proof or []}, headers=headers)
+        checks.append((name, res.status_code == 200 and res.json().get("status") == expected, res.status_code))
+    return checks
+
+def request_for(op: str, rng: random.Random, pool, items: int, item_size: int):
+    if op == "seal":
+        return "/v1/seal", {"data_items": random_items(rng, items, item_size)}, "SEALED"
+    if op == "validate":
+        root, data, proof = rng.choice(pool)
+        return "/v1/validate", {"merkle_root": root, "data_fragment": data, "proof": proof}, "VERIFIED_SECURE"
+    return "/v1/validate", {"merkle_root": f"{rng.getrandbits(256):064x}", "data_fragment": "x"}, "PROVENANCE_MISSING"
+
+async def drive(client, headers, pool, args, mix):
+    """
+    Runs the mix for args.duration seconds; returns [(op, outcome, service_s, response_s)].
+    Open loop: worker w owns send slots t0 + (w + k * concurrency) / rate and never skips
+    one, so a late slot is charged from its due time.
+    """
+    ops, weights = zip(*mix.items())
+    samples = []
+    t0 = time.perf_counter() + 0.05
+    end = t0 + args.duration
+
+    async def worker(w: int):
+        rng = random.Random(args.seed * 1000 + w)
+        k = 0
+        while True:
+            if args.rate > 0:
+                due = t0 + (w + k * args.concurrency) / args.rate
+                k += 1
+                if due >= end:
+                    return
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                due = time.perf_counter()
+                if due >= end:
+                    return
+            op = rng.choices(ops, weights)[0]
+            path, body, expected = request_for(op, rng, pool, args.items, args.item_size)
+            sent = time.perf_counter()
+            try:
+                res = await client.post(path, json=body, headers=headers)
+                if res.status_code != 200:
+                    outcome = f"http_{res.status_code}"
+                elif res.json().get("status") != expected:
+                    outcome = "wrong_verdict"
+                else:
+                    outcome = "ok"
+            except httpx.HTTPError as e:
+                outcome = type(e).__name__
+            done = time.perf_counter()
+            samples.append((op, outcome, done - sent, done - due))
+
+    await asyncio.gather(*(worker(w) for w in range(args.concurrency)))
+    return samples, time.perf_counter() - t0
+
+# --- REPORT ---
+
+def percentile(sorted_values, p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(min(rank, len(sorted_values))) - 1]
+
+def summarize(samples, elapsed: float, corrected: bool) -> dict:
+    report = {"elapsed_s": elapsed, "operations": {}}
+    for op in OPERATIONS + ("all",):
+        chosen = [s for s in samples if op == "all" or s[0] == op]
+        if not chosen:
+            continue
+        errors = {}
+        for _, outcome, _, _ in chosen:
+            if outcome != "ok":
+                errors[outcome] = errors.get(outcome, 0) + 1
+        entry = {
+            "requests": len(chosen),
+            "throughput_rps": len(chosen) / elapsed,
+            "error_rate": sum(errors.values()) / len(chosen),
+            "errors": errors,
+            "service_ms": {},
+        }
+        service = sorted(s[2] * 1000 for s in chosen)
+        entry["service_ms"] = {f"p{p:g}": percentile(service, p) for p in PERCENTILES}
+        entry["service_ms"]["max"] = service[-1]
+        if corrected:
+            response = sorted(s[3] * 1000 for s in chosen)
+            entry["corrected_ms"] = {f"p{p:g}": percentile(response, p) for p in PERCENTILES}
+            entry["corrected_ms"]["max"] = response[-1]
+        report["operations"][op] = entry
+    return report
+
+def print_report(report: dict, corrected: bool):
+    cols = [f"p{p:g}" for p in PERCENTILES] + ["max"]
+    print()
+    print(f"{'op':<9} {'reqs':>7} {'rps':>8} {'errors':>7} | {'latency (ms)':<10} " + " ".join(f"{c:>8}" for c in cols))
+    print("-" * (48 + 9 * len(cols)))
+    for op, entry in report["operations"].items():
+        head = f"{op:<9} {entry['requests']:>7} {entry['throughput_rps']:>8.1f} {entry['error_rate']:>7.2%}"
+        rows = [("service", entry["service_ms"])]
+        if corrected:
+            rows.append(("corrected", entry["corrected_ms"]))
+        for i, (label, values) in enumerate(rows):
+            prefix = head if i == 0 else " " * len(head)
+            print(f"{prefix} | {label:<12} " + " ".join(f"{values[c]:>8.2f}" for c in cols))
+    errors = report["operations"].get("all", {}).get("errors")
+    if errors:
+        print("\nerrors: " + ", ".join(f"{k} x{v}" for k, v in sorted(errors.items())))
+
+# --- CLI ---
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r} (expected {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError("mix needs at least one positive weight")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+async def run(args) -> int:
+    if args.url:
+        target = RemoteEngine(args.url, args.key or os.environ.get("AXON_SOVEREIGN_KEY", ""))
+    elif args.inprocess:
+        target = InProcessEngine()
+    else:
+        target = SpawnedEngine(args.workers)
+
+    async with target as (client_kwargs, key):
+        headers = {"x-api-key": key}
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout, **client_kwargs) as client:
+            rng = random.Random(args.seed)
+            checks = await preflight(client, headers, rng, args.items, args.item_size)
+            for name, ok, status in checks:
+                print(f"AXON ARCH | PREFLIGHT {name:<9} {'PASS' if ok else 'FAIL'} (HTTP {status})")
+            if not all(ok for _, ok, _ in checks) or len(checks) < 5:
+                print("AXON ARCH | LOADGEN: preflight failed, not generating load")
+                return 2
+
+            pool = await seed_pool(client, headers, rng, args.pool, args.items, args.item_size) if "validate" in args.mix else []
+            if pool:
+                await asyncio.sleep(ROOT_FILTER_SETTLE)
+            mode = f"open loop @ {args.rate:g} req/s" if args.rate > 0 else "closed loop (max throughput)"
+            print(f"AXON ARCH | LOADGEN: {args.duration:g}s, {mode}, {args.concurrency} connections, "
+                  f"mix {', '.join(f'{k}={v:g}' for k, v in args.mix.items())}")
+            samples, elapsed = await drive(client, headers, pool, args, args.mix)
+
+    corrected = args.rate > 0
+    report = summarize(samples, elapsed, corrected)
+    report["config"] = {k: v for k, v in vars(args).items() if k != "key"}
+    print_report(report, corrected)
+    if corrected:
+        achieved = report["operations"]["all"]["throughput_rps"]
+        if achieved < args.rate * 0.95:
+            print(f"\nAXON ARCH | LOADGEN: target {args.rate:g} req/s not sustained ({achieved:.1f} req/s); "
+                  "corrected latencies include the backlog")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["operations"]["all"]["error_rate"] > args.max_error_rate else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="target a running engine instead of starting one")
+    target.add_argument("--inprocess", action="store_true", help="run main.app in this process via ASGI (no sockets)")
+    parser.add_argument("--key", help="x-api-key for --url (default: $AXON_SOVEREIGN_KEY)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for the spawned engine")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("seal=1,validate=8,missing=1"),
+                        help="weighted traffic mix, e.g. seal=1,validate=8,missing=1")
+    parser.add_argument("--rate", type=float, default=200, help="target requests/s; 0 = closed loop")
+    parser.add_argument("--concurrency", type=int, default=32, help="connections (and in-flight requests)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds of measured load")
+    parser.add_argument("--items", type=int, default=8, help="items per seal")
+    parser.add_argument("--item-size", type=int, default=256, help="chars per item")
+    parser.add_argument("--pool", type=int, default=100, help="pre-sealed roots validate traffic draws from")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--max-error-rate", type=float, default=0.0, help="exit 1 above this error rate")
+    parser.add_argument("--json", help="write the full report here")
+    args = parser.parse_args()
+    if httpx is None:
+        parser.error("httpx is required: pip install httpx")
+    if args.concurrency < 1 or args.duration <= 0:
+        parser.error("--concurrency must be >= 1 and --duration > 0")
+    sys.exit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
@@ -1,128 +1,629 @@
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Header
+from contextlib import asynccontextmanager, nullcontext
+from fastapi import FastAPI, HTTPException, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
-from typing import List, Optional, Annotated
+from typing import List, Optional, Annotated, Literal
+import asyncio
+import time
 import os
+import json
+import codecs
 import uvicorn
 
 # IMPORT YOUR MODULES
 from database import AxonDB
-from merkle_engine import MerkleEngine
+from async_database import AsyncAxonDB
+from merkle_engine import MerkleEngine, MerkleFrontier, MERKLE_SCHEME, HASH_SCHEMES, shutdown_pools as shutdown_merkle_pools
 from siem_engine import SovereignSentinel
+from transparency_log import TreeHeadSigner
+from metrics import Metrics, MetricsMiddleware
+from job_queue import JobQueue, QueueFull, TERMINAL
+
+# Batches at or above this size are scanned on the Sentinel's worker pool
+SCAN_BATCH_THRESHOLD = int(os.environ.get("AXON_SCAN_BATCH_THRESHOLD", "1000"))
+# Persist every sealed tree so /v1/proof can serve O(log N) proofs without rehashing
+STORE_PROOFS = os.environ.get("AXON_STORE_PROOFS", "1") == "1"
+# /v1/validate/batch: max items per request, and items verified per threadpool hop
+VALIDATE_BATCH_MAX = int(os.environ.get("AXON_VALIDATE_BATCH_MAX", "10000"))
+VALIDATE_BATCH_CHUNK = int(os.environ.get("AXON_VALIDATE_BATCH_CHUNK", "500"))
+# /v1/seal/stream: items scanned, hashed and written per step, and the longest NDJSON line accepted
+SEAL_STREAM_CHUNK = int(os.environ.get("AXON_SEAL_STREAM_CHUNK", "1000"))
+SEAL_STREAM_MAX_ITEM = int(os.environ.get("AXON_SEAL_STREAM_MAX_ITEM", str(1 << 20)))
+# /v1/roots: seals returned per page (clients page through with since_id)
+ROOTS_PAGE_MAX = int(os.environ.get("AXON_ROOTS_PAGE_MAX", "10000"))
+# Per-stage latency histograms served at /metrics (Prometheus text format)
+METRICS_ENABLED = os.environ.get("AXON_METRICS", "1") == "1"
+# /v1/seal batches this large are queued as background jobs (202 + job id) instead
+# of holding the request open; 0 leaves them inline unless the client asks (?job=true)
+SEAL_JOB_THRESHOLD = int(os.environ.get("AXON_SEAL_JOB_THRESHOLD", "100000"))
+# /v1/jobs/{id}?wait=: longest long-poll, and how often it re-reads the job
+JOB_WAIT_MAX = float(os.environ.get("AXON_JOB_WAIT_MAX", "30"))
+JOB_POLL_INTERVAL = float(os.environ.get("AXON_JOB_POLL_INTERVAL", "0.25"))
 
 # --- INIT ---
 db = AxonDB()
+ledger = AsyncAxonDB(db)
 sentinel = SovereignSentinel()
+log_signer = TreeHeadSigner()
+telemetry = Metrics()
+telemetry.register_collector("ledger", lambda: ledger.stats())
+telemetry.register_collector("sentinel", lambda: sentinel.cache_stats())
 
 # --- ENTERPRISE LIFESPAN ---
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("AXON ARCH | SYSTEM BOOT: Initializing Ledger...")
     db.init_db()
+    await ledger.connect()
+    print(f"AXON ARCH | LOG SIGNING KEY: {log_signer.public_key()['key_id']}")
+    jobs.start()
     yield
     print("AXON ARCH | SYSTEM HALT: Closing Ledger Connections...")
+    # Running seals finish before the ledger closes; queued ones wait for the next boot
+    await run_in_threadpool(jobs.shutdown)
+    await ledger.close()
     db.close()
+    sentinel.shutdown()
+    shutdown_merkle_pools()
 
 app = FastAPI(title="AXON ARCH ENGINE", version="2.1.0", lifespan=lifespan)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, metrics=telemetry)
+
+def stage(name: str):
+    """Times one pipeline stage of the current request (a no-op with AXON_METRICS=0)."""
+    return telemetry.stage(name) if METRICS_ENABLED else nullcontext()
 
 # --- MODELS ---
 class SealRequest(BaseModel):
     data_items: List[str]
 
+class ProofStep(BaseModel):
+    position: Literal["left", "right"]
+    hash: str
+
 class ValidateRequest(BaseModel):
     merkle_root: str
     data_fragment: str
-    proof: List[str] = []  # Added to allow O(log N) verification for batched payloads
+    proof: List[ProofStep] = []  # as issued by /v1/proof
+
+    def proof_steps(self) -> List[dict]:
+        return [step.model_dump() for step in self.proof]
+
+class BatchValidateRequest(BaseModel):
+    items: List[ValidateRequest]
+
+class MultiProof(BaseModel):
+    leaf_count: int
+    indices: List[int]
+    hashes: List[str]
+
+class MultiValidateRequest(BaseModel):
+    merkle_root: str
+    data_fragments: List[str]  # data_fragments[k] is the leaf at multiproof.indices[k]
+    multiproof: MultiProof
+
+class ProofRequest(BaseModel):
+    # Target a leaf by (merkle_root, leaf_index), by leaf_hash or by its raw data;
+    # merkle_root optionally pins a leaf_hash/data lookup to one seal.
+    # (merkle_root, leaf_indices) asks for one multiproof covering all of them.
+    merkle_root: Optional[str] = None
+    leaf_index: Optional[int] = None
+    leaf_indices: Optional[List[int]] = None
+    leaf_hash: Optional[str] = None
+    data: Optional[str] = None
+
+# --- ZERO-TRUST GATE ---
+def authorize(x_api_key: Optional[str]):
+    with stage("auth"):
+        expected_key = os.environ.get("AXON_SOVEREIGN_KEY")
+        if not expected_key or x_api_key != expected_key: 
+            print("AXON ARCH | INTENT INVALIDATED: Cryptographic Key Mismatch")
+            raise HTTPException(status_code=401, detail="UNAUTHORIZED_ACCESS")
 
 # --- ENDPOINTS ---
 @app.get("/")
 def health_check():
     return {"status": "AXON_ARCH_ONLINE", "security": "HMAC_SHA256"}
 
-@app.post("/v1/seal")
-def seal_data(payload: SealRequest, x_api_key: Annotated[Optional[str], Header()] = None):
+def _scan_items(items: List[str]):
+    with stage("scan"):
+        if len(items) >= SCAN_BATCH_THRESHOLD:
+            verdicts = sentinel.scan_batch(items)
+        else:
+            verdicts = (sentinel.scan_payload(item, fail_fast=True) for item in items)
+
+        for scan in verdicts:
+            if scan and scan["status"] == "DETECTED":
+                print(f"AXON ARCH | INTENT INVALIDATED: {scan['type']}")
+                raise HTTPException(status_code=403, detail=f"THREAT_DETECTED: {scan['type']}")
+
+def _build_tree(items: List[str]) -> MerkleEngine:
+    try:
+        with stage("merkle_build"):
+            return MerkleEngine(data_blocks=items)
+    except Exception as e:
+        print(f"MERKLE ERROR: {e}")
+        raise HTTPException(status_code=500, detail="HASH_CALCULATION_FAILED")
+
+def _seal_items(api_key: str, items: List[str]) -> dict:
     """
     1. Scan (SIEM)
     2. Hash (HMAC Merkle)
     3. Save (DB)
+    Blocking; runs on the request threadpool inline, or on a job worker.
     """
-    # 1. Zero-Trust Security Check
-    expected_key = os.environ.get("AXON_SOVEREIGN_KEY")
-    if not expected_key or x_api_key != expected_key: 
-        print("AXON ARCH | INTENT INVALIDATED: Cryptographic Key Mismatch")
-        raise HTTPException(status_code=401, detail="UNAUTHORIZED_ACCESS")
-
-    # 2. Sentinel Scan (< 5ms Inline Path)
-    for item in payload.data_items:
-        scan = sentinel.scan_payload(item)
-        if scan["status"] == "DETECTED":
-            print(f"AXON ARCH | INTENT INVALIDATED: {scan['type']}")
-            raise HTTPException(status_code=403, detail=f"THREAT_DETECTED: {scan['type']}")
-
-    # 3. Merkle Hashing (O(1) Leaf Generation)
+    # 1. Sentinel Scan (< 5ms Inline Path)
+    _scan_items(items)
+
+    # 2. Merkle Hashing (O(1) Leaf Generation)
+    engine = _build_tree(items)
+    root_hash = engine.root
+
+    # 3. Ledger Persistence (idempotent: a repeat of this client's batch returns the original seal)
     try:
-        engine = MerkleEngine(data_blocks=payload.data_items)
-        root_hash = engine.root
+        with stage("db_write"):
+            seal = db.log_seal(api_key, root_hash, items, engine.scheme)
     except Exception as e:
-        print(f"MERKLE ERROR: {e}")
-        raise HTTPException(status_code=500, detail="HASH_CALCULATION_FAILED")
+        print(f"DB ERROR: {e}")
+        raise HTTPException(status_code=500, detail="LEDGER_WRITE_FAILED")
+
+    # 4. Proof Index (best effort: the seal is already durable, only /v1/proof depends on it)
+    proofs = "DISABLED"
+    if seal["duplicate"]:
+        # Indexed, or not, when the original was sealed; a retry writes nothing
+        proofs = "UNCHANGED"
+    elif STORE_PROOFS:
+        try:
+            with stage("db_write_proofs"):
+                db.store_tree(root_hash, engine.scheme, engine.levels)
+            proofs = "STORED"
+        except Exception as e:
+            print(f"AXON ARCH | PROOF INDEX FAILED: {e}")
+            proofs = "UNAVAILABLE"
+
+    return {
+        "status": "SEALED",
+        "seal_id": root_hash,
+        "integrity": "HMAC-SHA256",
+        "proofs": proofs,
+        "duplicate": seal["duplicate"],
+        "sealed_at": seal["timestamp"]
+    }
+
+def _run_seal_job(api_key: str, items: List[str]) -> dict:
+    with telemetry.route("job:/v1/seal"):
+        return _seal_items(api_key, items)
+
+# Bounded pool (AXON_JOB_WORKERS threads) draining a local SQLite queue; see job_queue.py
+jobs = JobQueue(_run_seal_job)
+telemetry.register_collector("jobs", jobs.stats)
+
+@app.post("/v1/seal")
+async def seal_data(payload: SealRequest, job: Optional[bool] = None,
+                    x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Seals inline and returns the seal. Batches of SEAL_JOB_THRESHOLD items or more
+    (or any batch with ?job=true) are queued instead: 202 with a job id to poll at
+    /v1/jobs/{job_id}. ?job=false forces the inline path.
+    """
+    # Zero-Trust Security Check
+    authorize(x_api_key)
+
+    items = payload.data_items
+    if job is None:
+        job = SEAL_JOB_THRESHOLD > 0 and len(items) >= SEAL_JOB_THRESHOLD
+    if not job:
+        # Scan, hash and write are CPU-bound or blocking, so the pipeline stays off the event loop
+        return await run_in_threadpool(_seal_items, x_api_key, items)
+
+    try:
+        queued = await run_in_threadpool(jobs.submit, x_api_key, items)
+    except QueueFull:
+        print("AXON ARCH | SEAL JOB REFUSED: Queue Full")
+        raise HTTPException(status_code=503, detail="QUEUE_FULL", headers={"Retry-After": "5"})
+    status_url = f"/v1/jobs/{queued['job_id']}"
+    return JSONResponse(
+        status_code=202,
+        headers={"Location": status_url},
+        content={"status": queued["status"], "job_id": queued["job_id"], "items": queued["items"], "status_url": status_url}
+    )
+
+@app.get("/v1/jobs/{job_id}")
+async def seal_job_status(job_id: str, wait: float = 0,
+                          x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    A queued seal's status (QUEUED, RUNNING, DONE or FAILED). DONE carries the seal
+    /v1/seal would have returned, root included, as `result`; FAILED carries `error`.
+    With ?wait=N (capped at JOB_WAIT_MAX seconds) this long-polls until the job
+    finishes or the wait runs out, whichever comes first.
+    """
+    authorize(x_api_key)
+    deadline = time.monotonic() + max(0.0, min(wait, JOB_WAIT_MAX))
+    while True:
+        with stage("db_read"):
+            record = await run_in_threadpool(jobs.get, job_id, x_api_key)
+        if record is None:
+            raise HTTPException(status_code=404, detail="JOB_NOT_FOUND")
+        remaining = deadline - time.monotonic()
+        if record["status"] in TERMINAL or remaining <= 0:
+            return record
+        await asyncio.sleep(min(JOB_POLL_INTERVAL, remaining))
+
+def _parse_stream_item(line: str) -> str:
+    try:
+        item = json.loads(line)
+    except ValueError:
+        item = None
+    if not isinstance(item, str):
+        raise HTTPException(status_code=400, detail="INVALID_NDJSON_ITEM")
+    return item
+
+@app.post("/v1/seal/stream")
+async def seal_stream(request: Request, x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Constant-memory seal: the body is NDJSON, one JSON string per line. Items are
+    scanned, hashed into a MerkleFrontier and written to the ledger SEAL_STREAM_CHUNK
+    at a time as they upload, so only one chunk and O(log N) digests are ever held.
+    The root is published (and logged) after the last item; any failure discards
+    the partial seal. No proof index is stored: that would need every level in memory.
+    """
+    authorize(x_api_key)
+
+    frontier = MerkleFrontier()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    seal_id, buffer, pending = None, "", []
+
+    async def flush():
+        nonlocal seal_id, pending
+        items, pending = pending, []
+        if not items:
+            return
+        await run_in_threadpool(_scan_items, items)
+        start = frontier.leaf_count
+        with stage("merkle_build"):
+            await run_in_threadpool(frontier.update, items)
+        try:
+            with stage("db_write"):
+                if seal_id is None:
+                    seal_id = await ledger.begin_seal(x_api_key)
+                await ledger.store_seal_items(seal_id, start, items)
+        except Exception as e:
+            print(f"DB ERROR: {e}")
+            raise HTTPException(status_code=500, detail="LEDGER_WRITE_FAILED")
 
-    # 4. Ledger Persistence
     try:
-        db.log_seal(x_api_key, root_hash, payload.data_items)
+        try:
+            async for chunk in request.stream():
+                buffer += decoder.decode(chunk)
+                *lines, buffer = buffer.split("\n")
+                if len(buffer) > SEAL_STREAM_MAX_ITEM:
+                    raise HTTPException(status_code=413, detail="ITEM_TOO_LARGE")
+                for line in lines:
+                    if line.strip():
+                        pending.append(_parse_stream_item(line))
+                if len(pending) >= SEAL_STREAM_CHUNK:
+                    await flush()
+            buffer += decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise HTTPException(status_code=400, detail="INVALID_UTF8_STREAM")
+        if buffer.strip():
+            pending.append(_parse_stream_item(buffer))
+        await flush()
+
+        if seal_id is None:
+            raise HTTPException(status_code=400, detail="EMPTY_SEAL")
+        root_hash = frontier.root()
+        try:
+            with stage("db_write"):
+                seal = await ledger.finish_seal(seal_id, root_hash, frontier.scheme)
+        except Exception as e:
+            print(f"DB ERROR: {e}")
+            raise HTTPException(status_code=500, detail="LEDGER_WRITE_FAILED")
+    except BaseException:
+        if seal_id is not None:
+            try:
+                await ledger.abort_seal(seal_id)
+            except Exception as e:
+                print(f"AXON ARCH | PARTIAL SEAL #{seal_id} NOT DISCARDED: {e}")
+        raise
+
+    return {
+        "status": "SEALED",
+        "seal_id": root_hash,
+        "integrity": "HMAC-SHA256",
+        "items": frontier.leaf_count,
+        "proofs": "UNAVAILABLE",
+        "duplicate": seal["duplicate"],
+        "sealed_at": seal["timestamp"]
+    }
+
+def _audit_verdict(record, is_valid_math: bool) -> dict:
+    """Verdict for one audited fragment (or multiproof) given its provenance row and proof check."""
+    if not record:
         return {
-            "status": "SEALED",
-            "seal_id": root_hash,
-            "integrity": "HMAC-SHA256"
+            "verified": False,
+            "status": "PROVENANCE_MISSING",
+            "detail": "Root Hash not found in Immutable Ledger."
         }
-    except Exception as e:
-        print(f"DB ERROR: {e}")
-        raise HTTPException(status_code=500, detail="LEDGER_WRITE_FAILED")
+    if is_valid_math:
+        return {
+            "verified": True,
+            "status": "VERIFIED_SECURE",
+            "timestamp": str(record['timestamp'])
+        }
+    return {
+        "verified": False,
+        "status": "INTEGRITY_FAILURE",
+        "detail": "Math does not match. Data may be altered or Key Mismatch."
+    }
 
 @app.post("/v1/validate")
-def validate_integrity(payload: ValidateRequest, x_api_key: Annotated[Optional[str], Header()] = None):
+async def validate_integrity(payload: ValidateRequest, x_api_key: Annotated[Optional[str], Header()] = None):
     """
     THE AUDIT LOGIC:
     1. Check DB for Provenance
     2. Check HMAC for Integrity
     """
     # 1. Zero-Trust Security Check
-    expected_key = os.environ.get("AXON_SOVEREIGN_KEY")
-    if not expected_key or x_api_key != expected_key: 
-        raise HTTPException(status_code=401, detail="UNAUTHORIZED_ACCESS")
+    authorize(x_api_key)
 
     print(f"AUDIT REQUEST: Checking Root {payload.merkle_root}")
 
     # STEP 1: PROVENANCE CHECK
-    record = db.verify_integrity(payload.merkle_root)
+    with stage("db_read"):
+        record = await ledger.verify_integrity(payload.merkle_root)
     
     if not record:
-        return {
-            "verified": False,
-            "status": "PROVENANCE_MISSING",
-            "detail": "Root Hash not found in Immutable Ledger."
-        }
+        return _audit_verdict(None, False)
 
-    # STEP 2: MATHEMATICAL CHECK
-    is_valid_math = MerkleEngine.verify_proof(
-        data=payload.data_fragment,
-        proof=payload.proof, 
-        target_root=payload.merkle_root
-    )
+    # STEP 2: MATHEMATICAL CHECK (O(log N) hashes, cheap enough to stay on the event loop)
+    with stage("merkle_verify"):
+        is_valid_math = MerkleEngine.verify_proof(
+            data=payload.data_fragment,
+            proof=payload.proof_steps(),
+            target_root=payload.merkle_root,
+            scheme=record['scheme']
+        )
+
+    if not is_valid_math:
+        print("AXON ARCH | INTENT INVALIDATED: Merkle Proof Failed")
+    return _audit_verdict(record, is_valid_math)
+
+@app.post("/v1/validate/batch")
+async def validate_batch(payload: BatchValidateRequest, request: Request,
+                         x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Bulk audit: every distinct root is resolved in one ledger round-trip, proofs are
+    verified in chunks off the event loop, and one verdict comes back per item.
+    With "Accept: application/x-ndjson" verdicts stream out chunk by chunk.
+    """
+    authorize(x_api_key)
+
+    items = payload.items
+    if len(items) > VALIDATE_BATCH_MAX:
+        raise HTTPException(status_code=413, detail="BATCH_TOO_LARGE")
+    print(f"AUDIT REQUEST: Batch of {len(items)} fragments")
+
+    with stage("db_read"):
+        records = await ledger.verify_integrity_many(item.merkle_root for item in items)
+
+    async def verdicts():
+        for start in range(0, len(items), VALIDATE_BATCH_CHUNK):
+            chunk = items[start:start + VALIDATE_BATCH_CHUNK]
+            # Fragments without provenance are never hashed
+            checks = [(item.data_fragment, item.proof_steps(), item.merkle_root, records[item.merkle_root]['scheme'])
+                      for item in chunk if item.merkle_root in records]
+            with stage("merkle_verify"):
+                outcomes = iter(await run_in_threadpool(MerkleEngine.verify_proofs, checks))
+            for index, item in enumerate(chunk, start):
+                record = records.get(item.merkle_root)
+                verdict = _audit_verdict(record, record is not None and next(outcomes))
+                verdict["index"] = index
+                yield verdict
+
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        async def ndjson():
+            async for verdict in verdicts():
+                yield json.dumps(verdict) + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
 
+    results = [verdict async for verdict in verdicts()]
+    verified = sum(1 for verdict in results if verdict["verified"])
+    if verified < len(results):
+        print(f"AXON ARCH | INTENT INVALIDATED: {len(results) - verified} of {len(results)} fragments failed audit")
+    return {"verified": verified, "failed": len(results) - verified, "results": results}
+
+@app.post("/v1/validate/multi")
+async def validate_multi(payload: MultiValidateRequest, x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Audit many leaves of one seal in a single pass: one provenance lookup and one
+    multiproof walk that hashes each shared upper node once.
+    """
+    authorize(x_api_key)
+
+    print(f"AUDIT REQUEST: Checking {len(payload.data_fragments)} leaves of Root {payload.merkle_root}")
+
+    with stage("db_read"):
+        record = await ledger.verify_integrity(payload.merkle_root)
+    if not record:
+        return _audit_verdict(None, False)
+
+    # Hundreds of leaves is thousands of hashes: keep it off the event loop
+    with stage("merkle_verify"):
+        is_valid_math = await run_in_threadpool(
+            MerkleEngine.verify_multiproof,
+            payload.data_fragments, payload.multiproof.model_dump(), payload.merkle_root,
+            scheme=record['scheme']
+        )
+
+    verdict = _audit_verdict(record, is_valid_math)
     if is_valid_math:
-        return {
-            "verified": True,
-            "status": "VERIFIED_SECURE",
-            "timestamp": str(record['timestamp'])
-        }
+        verdict["leaves"] = len(payload.data_fragments)
     else:
-        print("AXON ARCH | INTENT INVALIDATED: Merkle Proof Failed")
-        return {
-            "verified": False,
-            "status": "INTEGRITY_FAILURE",
-            "detail": "Math does not match. Data may be altered or Key Mismatch."
-        }
+        print("AXON ARCH | INTENT INVALIDATED: Merkle Multiproof Failed")
+    return verdict
+
+@app.post("/v1/proof")
+async def issue_proof(payload: ProofRequest, x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Server-side proof issuance from the persisted tree: a leaf-hash index probe
+    plus the O(log N) pages on the proof path. The batch is never rehashed.
+    """
+    authorize(x_api_key)
+
+    if payload.leaf_indices is not None:
+        if payload.merkle_root is None:
+            raise HTTPException(status_code=400, detail="PROOF_TARGET_REQUIRED")
+        with stage("db_read"):
+            record = await ledger.fetch_multiproof(payload.merkle_root, payload.leaf_indices)
+        if not record:
+            raise HTTPException(status_code=404, detail="PROOF_NOT_FOUND")
+        return record
+
+    if payload.data is not None and payload.leaf_hash is None:
+        # A leaf's hash depends on the scheme its seal was built under: try the current
+        # one first, and only accept a tree that was actually hashed that way
+        for scheme in sorted(HASH_SCHEMES, key=lambda s: s != MERKLE_SCHEME):
+            leaf_hash = bytes.fromhex(MerkleEngine(scheme=scheme).hash_data(payload.data))
+            with stage("db_read"):
+                record = await ledger.fetch_proof(payload.merkle_root, payload.leaf_index, leaf_hash)
+            if record and record["scheme"] == scheme:
+                return record
+        raise HTTPException(status_code=404, detail="PROOF_NOT_FOUND")
+
+    leaf_hash = None
+    if payload.leaf_hash is not None:
+        try:
+            leaf_hash = bytes.fromhex(payload.leaf_hash)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="INVALID_LEAF_HASH")
+    elif payload.merkle_root is None or payload.leaf_index is None:
+        raise HTTPException(status_code=400, detail="PROOF_TARGET_REQUIRED")
+
+    with stage("db_read"):
+        record = await ledger.fetch_proof(payload.merkle_root, payload.leaf_index, leaf_hash)
+    if not record:
+        raise HTTPException(status_code=404, detail="PROOF_NOT_FOUND")
+    return record
+
+# --- TRANSPARENCY LOG ---
+# Every seal root is appended to one global RFC 6962 log inside the seal's own
+# transaction. Auditors keep the last signed tree head they checked and ask for
+# consistency from that size onwards instead of rescanning the ledger.
+@app.get("/v1/log/key")
+def log_public_key():
+    """The log's Ed25519 public key. Public on purpose: auditors need no client key to check tree heads."""
+    return log_signer.public_key()
+
+@app.get("/v1/log/sth")
+async def log_tree_head(x_api_key: Annotated[Optional[str], Header()] = None):
+    """Signed tree head: current log size and root, Ed25519-signed under the log key (see /v1/log/key)."""
+    authorize(x_api_key)
+    head = await ledger.log_head()
+    return log_signer.sign_tree_head(head.tree_size, head.root())
+
+@app.get("/v1/log/inclusion")
+async def log_inclusion(merkle_root: str, tree_size: Optional[int] = None,
+                        x_api_key: Annotated[Optional[str], Header()] = None):
+    """Inclusion proof for a seal root in the log at tree_size (default: the current head)."""
+    authorize(x_api_key)
+    record = await ledger.log_inclusion(merkle_root, tree_size)
+    if not record:
+        raise HTTPException(status_code=404, detail="LOG_ENTRY_NOT_FOUND")
+    return record
+
+@app.get("/v1/log/consistency")
+async def log_consistency(first: int, second: Optional[int] = None,
+                          x_api_key: Annotated[Optional[str], Header()] = None):
+    """Consistency proof that the log at size `first` is a prefix of the log at `second` (default: now)."""
+    authorize(x_api_key)
+    record = await ledger.log_consistency(first, second)
+    if not record:
+        raise HTTPException(status_code=400, detail="INVALID_LOG_RANGE")
+    return record
+
+@app.get("/v1/roots")
+async def list_roots(since_id: int = 0, limit: int = 1000, newest: bool = False, before_id: Optional[int] = None,
+                     x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Published seal roots after since_id, oldest first, for clients that keep a local
+    root set and verify proofs in-process. Page on with next_since_id while `more`.
+    With newest=true the latest roots come first instead, paging back with
+    next_before_id, so a client can seed from the tail of the log. Each root names
+    the hashing scheme its proofs walk under; `scheme` is the one new seals use.
+    """
+    authorize(x_api_key)
+    limit = max(1, min(limit, ROOTS_PAGE_MAX))
+    with stage("db_read"):
+        rows = await ledger.list_roots(since_id, limit, newest, before_id)
+    page = {
+        "roots": [
+            {"id": row['id'], "merkle_root": row['merkle_root'], "timestamp": str(row['timestamp']), "scheme": row['scheme']}
+            for row in rows
+        ],
+        "more": len(rows) == limit,
+        "scheme": MERKLE_SCHEME,
+    }
+    if newest:
+        page["next_since_id"] = rows[0]['id'] if rows else since_id
+        page["next_before_id"] = rows[-1]['id'] if rows else before_id
+    else:
+        page["next_since_id"] = rows[-1]['id'] if rows else since_id
+    return page
+
+@app.post("/v1/scan/stream")
+async def scan_stream(request: Request, x_api_key: Annotated[Optional[str], Header()] = None):
+    """
+    Streaming Sentinel scan for oversized items: the raw UTF-8 body is inspected
+    piece by piece as it uploads, and reading stops at the first blocking hit.
+    """
+    authorize(x_api_key)
+
+    scanner = sentinel.stream_scanner(fail_fast=True)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        async for chunk in request.stream():
+            await run_in_threadpool(scanner.feed, decoder.decode(chunk))
+            if scanner.blocked:
+                break
+        else:
+            scanner.feed(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="INVALID_UTF8_STREAM")
+
+    verdict = scanner.verdict()
+    if verdict["status"] == "DETECTED":
+        print(f"AXON ARCH | INTENT INVALIDATED: {verdict['type']}")
+    return verdict
+
+@app.get("/v1/ledger/stats")
+async def ledger_stats(x_api_key: Annotated[Optional[str], Header()] = None):
+    """Ledger telemetry: connection pool wait times and group-commit batch metrics."""
+    authorize(x_api_key)
+    return ledger.stats()
+
+@app.get("/v1/sentinel/stats")
+async def sentinel_stats(x_api_key: Annotated[Optional[str], Header()] = None):
+    """Sentinel telemetry: verdict-cache hits, misses and evictions."""
+    authorize(x_api_key)
+    return sentinel.cache_stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics(x_api_key: Annotated[Optional[str], Header()] = None,
+                  authorization: Annotated[Optional[str], Header()] = None):
+    """
+    Prometheus scrape target: request and per-stage latency histograms by endpoint
+    (and status), plus every numeric ledger and Sentinel stat as a gauge. Takes the
+    sovereign key as x-api-key or as a bearer token (Prometheus' native scrape auth).
+    """
+    if x_api_key is None and authorization and authorization.startswith("Bearer "):
+        x_api_key = authorization[len("Bearer "):]
+    authorize(x_api_key)
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="METRICS_DISABLED")
+    return PlainTextResponse(telemetry.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     # DYNAMIC PORT BINDING FOR CLOUD DEPLOYMENT
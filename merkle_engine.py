@@ -1,75 +1,450 @@
+import binascii
 import hmac
 import hashlib
+import multiprocessing
 import os
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+# HASHING SCHEMES (a root is only reproducible under the scheme that built it):
+#   v1 LEGACY  leaf = H(data)         node = H(hex(left) + hex(right))   -- 64 hex chars per child
+#   v2 BINARY  leaf = H(0x00 || data) node = H(0x01 || left || right)    -- 32 raw bytes per child
+# H is HMAC-SHA256 under the sovereign key, or plain SHA-256 without one (Dashboard Mode).
+# Both duplicate the last node of an odd level. v1 stays the default so every root
+# already in the ledger keeps validating; v2 halves the bytes hashed per node and the
+# 0x00/0x01 prefixes keep a leaf from ever being replayed as an interior node.
+HASH_SCHEME_LEGACY = 1
+HASH_SCHEME_BINARY = 2
+HASH_SCHEMES = (HASH_SCHEME_LEGACY, HASH_SCHEME_BINARY)
+MERKLE_SCHEME = int(os.getenv("AXON_MERKLE_SCHEME", str(HASH_SCHEME_LEGACY)))
+
+DIGEST_SIZE = 32
+# Digests are joined into the level buffer this many at a time, so the transient
+# per-node bytes objects never outnumber one block.
+_BLOCK = 4096
+
+# PARALLEL BUILD
+# Batches of at least MERKLE_PARALLEL_THRESHOLD leaves are split into power-of-two
+# chunks whose subtrees are built on a worker pool, then merged. 0 disables it.
+# hashlib only drops the GIL for buffers over 2 KiB and tree nodes are 32-64 bytes,
+# so "process" is the default; "thread" only pays off for very large leaves. With a
+# single worker the serial path is always taken. Worker processes start from a
+# forkserver rather than forking the threaded engine.
+MERKLE_PARALLEL_THRESHOLD = int(os.getenv("AXON_MERKLE_PARALLEL_THRESHOLD", "131072"))
+MERKLE_EXECUTOR = os.getenv("AXON_MERKLE_EXECUTOR", "process")
+MERKLE_WORKERS = int(os.getenv("AXON_MERKLE_WORKERS", str(os.cpu_count() or 2)))
+MERKLE_MIN_CHUNK = 4096
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def _resolve_key(secret_key):
+    # UNIVERSAL KEY LOGIC:
+    # 1. Use provided key OR 2. Look for Environment Variable OR 3. Fallback to None
+    env_key = os.getenv("AXON_SOVEREIGN_KEY")
+    key = secret_key or (env_key.encode() if env_key else None)
+    return key.encode() if isinstance(key, str) else key
+
+def _hasher(key, prefix: bytes = b""):
+    """
+    Returns digest(data) -> 32 raw bytes. The HMAC (or SHA-256) state is keyed and
+    primed with the domain prefix once; every call only .copy()s it.
+    """
+    base = hmac.new(key, prefix, hashlib.sha256) if key else hashlib.sha256(prefix)
+    copy = base.copy
+
+    def digest(data) -> bytes:
+        h = copy()
+        h.update(data)
+        return h.digest()
+    return digest
+
+def _scheme_hashers(key, scheme: int):
+    """(leaf, node) digest functions for a scheme; node() takes the 64-byte left||right pair."""
+    if scheme == HASH_SCHEME_LEGACY:
+        plain = _hasher(key)
+        hexlify = binascii.hexlify
+        return plain, lambda pair: plain(hexlify(pair))
+    if scheme == HASH_SCHEME_BINARY:
+        return _hasher(key, b"\x00"), _hasher(key, b"\x01")
+    raise ValueError(f"UNKNOWN_HASH_SCHEME: {scheme}")
 
 class MerkleEngine:
-    def __init__(self, data_blocks: List[str] = None, secret_key: str = None):
-        # UNIVERSAL KEY LOGIC: 
-        # 1. Use provided key OR 2. Look for Environment Variable OR 3. Fallback to None
-        env_key = os.getenv("AXON_SOVEREIGN_KEY")
-        self.secret_key = secret_key or (env_key.encode() if env_key else None)
-        
-        self.leaves = [self.hash_data(data) for data in (data_blocks or [])]
-        self.tree = []
+    """
+    AXON ARCH | COMPACT MERKLE TREE
+    Every level is one contiguous bytearray of 32-byte digests (self.levels[0]
+    are the leaves, self.levels[-1] the root). Hex only appears at the API
+    boundary: root, hash_data(), get_proof() and verify_proof().
+    """
+    def __init__(self, data_blocks: List[str] = None, secret_key: str = None, scheme: int = None,
+                 parallel_threshold: int = MERKLE_PARALLEL_THRESHOLD, executor: str = MERKLE_EXECUTOR):
+        self.secret_key = _resolve_key(secret_key)
+        self.scheme = scheme or MERKLE_SCHEME
+        self._leaf_digest, self._node_digest = _scheme_hashers(self.secret_key, self.scheme)
+
+        self.levels = []
         self.root = None
-        if self.leaves: self.build_tree()
+        if not data_blocks:
+            return
+        parallel = MERKLE_WORKERS > 1 and 0 < parallel_threshold <= len(data_blocks)
+        depth = _chunk_depth(len(data_blocks)) if parallel else 0
+        if depth:
+            self.levels = self._build_subtrees(data_blocks, depth, executor)
+        else:
+            self.levels.append(self.hash_leaves(data_blocks))
+        self.build_tree()
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self.levels[0]) // DIGEST_SIZE if self.levels else 0
+
+    @property
+    def root_digest(self) -> bytes:
+        return bytes(self.levels[-1]) if self.levels else None
+
+    def hash_leaves(self, data_blocks: List[str]) -> bytearray:
+        leaf = self._leaf_digest
+        level = bytearray()
+        for start in range(0, len(data_blocks), _BLOCK):
+            level += b"".join([
+                leaf(d.encode('utf-8') if isinstance(d, str) else d) for d in data_blocks[start:start + _BLOCK]
+            ])
+        return level
 
     def hash_data(self, data: str) -> str:
         if isinstance(data, str): data = data.encode('utf-8')
-        
-        # If we have a key, we use High-Security HMAC
-        if self.secret_key:
-            return hmac.new(self.secret_key, data, hashlib.sha256).hexdigest()
-        
-        # If no key (Dashboard Mode), we use Standard SHA-256
-        return hashlib.sha256(data).hexdigest()
+        return self._leaf_digest(data).hex()
+
+    def node(self, level: int, index: int) -> bytes:
+        offset = index * DIGEST_SIZE
+        return bytes(self.levels[level][offset:offset + DIGEST_SIZE])
 
     def build_tree(self):
-        if not self.leaves: return
-        current_layer = self.leaves
-        self.tree.append(current_layer)
-        while len(current_layer) > 1:
-            next_layer = []
-            for i in range(0, len(current_layer), 2):
-                left = current_layer[i]
-                right = current_layer[i + 1] if (i + 1) < len(current_layer) else left
-                next_layer.append(self.hash_data(left + right))
-            self.tree.append(next_layer)
-            current_layer = next_layer
-        self.root = current_layer[0]
+        """Reduces from the highest level already present (only the leaves after a serial hash)."""
+        if not self.levels: return
+        current = self.levels[-1]
+        while len(current) > DIGEST_SIZE:
+            current = self._parent_level(current)
+            self.levels.append(current)
+        self.root = current.hex()
+
+    def _parent_level(self, level: bytearray) -> bytearray:
+        node = self._node_digest
+        view = memoryview(level)
+        pair = 2 * DIGEST_SIZE
+        paired = len(level) - len(level) % pair
+        parents = bytearray()
+        for start in range(0, paired, pair * _BLOCK):
+            stop = min(start + pair * _BLOCK, paired)
+            parents += b"".join([node(view[i:i + pair]) for i in range(start, stop, pair)])
+        if paired < len(level):
+            # Odd level: the last node is paired with itself
+            parents += node(bytes(view[paired:]) * 2)
+        view.release()
+        return parents
+
+    def _build_subtrees(self, data_blocks: List[str], depth: int, executor: str) -> List[bytearray]:
+        """
+        Each worker builds the bottom `depth` levels over 2**depth leaves. Every chunk
+        but the last is full, so odd-level duplication only ever happens at the tail
+        of a level, inside the last chunk, exactly where the serial build does it;
+        concatenating the chunk levels therefore gives the serial levels byte for byte.
+        """
+        pool = _pool(executor)
+        width = 1 << depth
+        futures = [
+            pool.submit(_build_subtree, self.secret_key, self.scheme, data_blocks[start:start + width], depth)
+            for start in range(0, len(data_blocks), width)
+        ]
+        levels = [bytearray() for _ in range(depth + 1)]
+        for future in futures:
+            for merged, part in zip(levels, future.result()):
+                merged += part
+        return levels
 
     def get_proof(self, data_index: int) -> List[dict]:
         proof = []
-        layer_index = 0
-        while layer_index < len(self.tree) - 1:
-            layer = self.tree[layer_index]
+        for level in range(len(self.levels) - 1):
             is_right = data_index % 2 == 1
             sibling_idx = data_index - 1 if is_right else data_index + 1
-            if sibling_idx < len(layer):
-                proof.append({"position": "left" if is_right else "right", "hash": layer[sibling_idx]})
+            if sibling_idx * DIGEST_SIZE < len(self.levels[level]):
+                proof.append({"position": "left" if is_right else "right", "hash": self.node(level, sibling_idx).hex()})
             else:
-                proof.append({"position": "right", "hash": layer[data_index]})
+                proof.append({"position": "right", "hash": self.node(level, data_index).hex()})
             data_index //= 2
-            layer_index += 1
         return proof
 
+    def get_multiproof(self, indices: List[int]) -> Dict:
+        """
+        One proof for a set of leaves: only the sibling hashes that cannot be derived
+        from the leaves themselves or from each other (see multiproof_plan).
+        """
+        indices = sorted(set(indices))
+        if not indices or indices[0] < 0 or indices[-1] >= self.leaf_count:
+            raise ValueError("MULTIPROOF_INDEX_OUT_OF_RANGE")
+        return {
+            "leaf_count": self.leaf_count,
+            "indices": indices,
+            "hashes": [self.node(level, index).hex() for level, index in multiproof_plan(self.leaf_count, indices)],
+        }
+
+    @staticmethod
+    def verify_multiproof(data: List[str], multiproof: Dict, target_root: str, secret_key: str = None, scheme: int = None) -> bool:
+        """Checks every leaf of a multiproof in one pass; data[k] is the leaf at multiproof["indices"][k]."""
+        leaf, node = _scheme_hashers(_resolve_key(secret_key), scheme or MERKLE_SCHEME)
+        size, indices = multiproof["leaf_count"], multiproof["indices"]
+        if not indices or len(data) != len(indices) or indices != sorted(set(indices)) \
+                or indices[0] < 0 or indices[-1] >= size:
+            return False
+        try:
+            hashes = [bytes.fromhex(h) for h in multiproof["hashes"]]
+        except ValueError:
+            return False
+        if any(len(h) != DIGEST_SIZE for h in hashes):
+            return False
+
+        known = {i: leaf(d.encode() if isinstance(d, str) else d) for i, d in zip(indices, data)}
+        supplied = iter(hashes)
+        while size > 1:
+            parents = {}
+            for i in sorted(known):
+                if i >> 1 in parents:
+                    continue  # already hashed together with its left sibling
+                sibling = i ^ 1
+                if sibling in known:
+                    other = known[sibling]
+                elif sibling >= size:
+                    other = known[i]  # odd tail: paired with itself
+                else:
+                    other = next(supplied, None)
+                    if other is None:
+                        return False
+                parents[i >> 1] = node(other + known[i] if i & 1 else known[i] + other)
+            known = parents
+            size = (size + 1) // 2
+        # Every supplied hash must have been consumed, or the proof is not the one for these leaves
+        if next(supplied, None) is not None:
+            return False
+        return known[0].hex() == target_root
+
     @staticmethod
-    def verify_proof(data: str, proof: List[dict], target_root: str, secret_key: str = None) -> bool:
+    def verify_proof(data: str, proof: List[dict], target_root: str, secret_key: str = None, scheme: int = None) -> bool:
         # Re-check for environment key during static verification
-        env_key = os.getenv("AXON_SOVEREIGN_KEY")
-        key = secret_key or (env_key.encode() if env_key else None)
+        leaf, node = _scheme_hashers(_resolve_key(secret_key), scheme or MERKLE_SCHEME)
+        return _walk_proof(leaf, node, data, proof, target_root)
 
-        def hmac_helper(d):
-            if isinstance(d, str): d = d.encode()
-            if key: return hmac.new(key, d, hashlib.sha256).hexdigest()
-            return hashlib.sha256(d).hexdigest()
+    @staticmethod
+    def verify_proofs(checks: List[tuple], secret_key: str = None, scheme: int = None) -> List[bool]:
+        """
+        Bulk verify_proof over (data, proof, target_root[, scheme]) checks, keying the
+        hashers once per scheme; checks without their own scheme use `scheme`.
+        """
+        key, default = _resolve_key(secret_key), scheme or MERKLE_SCHEME
+        hashers, results = {}, []
+        for data, proof, target_root, *rest in checks:
+            check_scheme = rest[0] if rest else default
+            if check_scheme not in hashers:
+                hashers[check_scheme] = _scheme_hashers(key, check_scheme)
+            leaf, node = hashers[check_scheme]
+            results.append(_walk_proof(leaf, node, data, proof, target_root))
+        return results
+
+def _walk_proof(leaf, node, data, proof: List[dict], target_root: str) -> bool:
+    if isinstance(data, str): data = data.encode()
 
-        current_hash = hmac_helper(data)
+    current_hash = leaf(data)
+    try:
         for step in proof:
-            sibling = step['hash']
+            sibling = bytes.fromhex(step['hash'])
+            if len(sibling) != DIGEST_SIZE:
+                return False
             if step['position'] == "left":
-                current_hash = hmac_helper(sibling + current_hash)
+                current_hash = node(sibling + current_hash)
+            elif step['position'] == "right":
+                current_hash = node(current_hash + sibling)
+            else:
+                return False
+    except (KeyError, TypeError, ValueError):
+        # A malformed client-supplied step (bad hex, missing or mistyped field) can never reach the root
+        return False
+    return current_hash.hex() == target_root
+
+class MerkleFrontier:
+    """
+    AXON ARCH | STREAMING MERKLE ROOT
+    Same root as MerkleEngine (same scheme, same odd-node duplication) for leaves
+    that arrive one chunk at a time, holding only O(log N) digests: pending[l] is
+    the left child still waiting for its right sibling at level l.
+    """
+    def __init__(self, secret_key: str = None, scheme: int = None):
+        self.scheme = scheme or MERKLE_SCHEME
+        self._leaf_digest, self._node_digest = _scheme_hashers(_resolve_key(secret_key), self.scheme)
+        self.pending = []
+        self.leaf_count = 0
+
+    def update(self, data_blocks: List[str]):
+        leaf, node, pending = self._leaf_digest, self._node_digest, self.pending
+        for d in data_blocks:
+            current = leaf(d.encode('utf-8') if isinstance(d, str) else d)
+            level = 0
+            # Bit l of leaf_count says whether level l holds an unpaired left child
+            count = self.leaf_count
+            while count & 1:
+                current = node(pending[level] + current)
+                pending[level] = None
+                level += 1
+                count >>= 1
+            if level == len(pending):
+                pending.append(current)
             else:
-                current_hash = hmac_helper(current_hash + sibling)
-        return current_hash == target_root
\ No newline at end of file
+                pending[level] = current
+            self.leaf_count += 1
+
+    def root(self) -> str:
+        """Hex root of everything fed so far (None before the first leaf)."""
+        if not self.leaf_count:
+            return None
+        node = self._node_digest
+        carry = None
+        count = self.leaf_count  # nodes at this level, not counting the carry
+        for left in self.pending:
+            if count + (carry is not None) == 1:
+                return (left or carry).hex()
+            if left and carry:
+                carry = node(left + carry)
+            elif left or carry:
+                # Last node of an odd level: paired with itself, as in _parent_level
+                carry = node((left or carry) * 2)
+            count >>= 1
+        return carry.hex()
+
+# PAGED NODE STORAGE
+# A persisted tree is every level but the root laid end to end, each level padded
+# to an even length with its duplicated last node (exactly the pairing the build
+# does), then cut into pages of page_nodes digests. Pairs sit at even positions and
+# page_nodes is even, so a proof step is always one 64-byte slice of one page.
+
+def iter_node_pages(levels: List[bytearray], page_nodes: int):
+    """Yields the pages of a built tree's levels (see PAGED NODE STORAGE), never copying a whole level."""
+    if page_nodes % 2:
+        raise ValueError("page_nodes must be even")
+    page_bytes = page_nodes * DIGEST_SIZE
+    page = bytearray()
+    for level in levels[:-1]:
+        segments = [memoryview(level)]
+        if len(level) // DIGEST_SIZE % 2:
+            segments.append(memoryview(level)[-DIGEST_SIZE:])
+        for view in segments:
+            pos = 0
+            while pos < len(view):
+                take = min(page_bytes - len(page), len(view) - pos)
+                page += view[pos:pos + take]
+                pos += take
+                if len(page) == page_bytes:
+                    yield bytes(page)
+                    page = bytearray()
+    if page:
+        yield bytes(page)
+
+def level_offsets(leaf_count: int) -> List[int]:
+    """Flat position where each stored level (all but the root) starts."""
+    offsets, offset, size = [], 0, leaf_count
+    while size > 1:
+        offsets.append(offset)
+        size += size % 2
+        offset += size
+        size //= 2
+    return offsets
+
+def page_positions(leaf_count: int, index: int) -> List[int]:
+    """Flat position of the left node of the pair holding `index`'s path, one per level below the root."""
+    return [offset + ((index >> level) & ~1) for level, offset in enumerate(level_offsets(leaf_count))]
+
+def multiproof_plan(leaf_count: int, indices: List[int]) -> List[Tuple[int, int]]:
+    """
+    (level, index) of every sibling hash a multiproof carries, in the order the
+    verifier consumes them: level by level, ascending index. A sibling is omitted
+    when it is itself being proven (or derived from proven leaves) or when it is the
+    odd tail's own duplicate.
+    """
+    plan, known, size, level = [], sorted(set(indices)), leaf_count, 0
+    while size > 1:
+        present = set(known)
+        plan.extend((level, i ^ 1) for i in known if i ^ 1 not in present and i ^ 1 < size)
+        known = sorted({i >> 1 for i in known})
+        size = (size + 1) // 2
+        level += 1
+    return plan
+
+def multiproof_from_pages(leaf_count: int, indices: List[int], pages: dict, page_nodes: int) -> Dict:
+    """MerkleEngine.get_multiproof(indices) rebuilt from stored pages ({page number: bytes})."""
+    indices = sorted(set(indices))
+    offsets = level_offsets(leaf_count)
+    hashes = []
+    for level, index in multiproof_plan(leaf_count, indices):
+        position = offsets[level] + index
+        at = (position % page_nodes) * DIGEST_SIZE
+        hashes.append(pages[position // page_nodes][at:at + DIGEST_SIZE].hex())
+    return {"leaf_count": leaf_count, "indices": indices, "hashes": hashes}
+
+def multiproof_pages(leaf_count: int, indices: List[int], page_nodes: int) -> List[int]:
+    """Page numbers multiproof_from_pages reads."""
+    offsets = level_offsets(leaf_count)
+    return sorted({(offsets[level] + index) // page_nodes for level, index in multiproof_plan(leaf_count, indices)})
+
+def proof_from_pages(leaf_count: int, index: int, pages: dict, page_nodes: int):
+    """
+    Rebuilds get_proof(index) from stored pages ({page number: bytes}).
+    Returns (leaf digest, proof); the leaf digest is None for a one-leaf tree (it is the root).
+    """
+    leaf, proof = None, []
+    for level, position in enumerate(page_positions(leaf_count, index)):
+        page = pages[position // page_nodes]
+        at = (position % page_nodes) * DIGEST_SIZE
+        left, right = page[at:at + DIGEST_SIZE], page[at + DIGEST_SIZE:at + 2 * DIGEST_SIZE]
+        if (index >> level) & 1:
+            own, step = right, {"position": "left", "hash": left.hex()}
+        else:
+            own, step = left, {"position": "right", "hash": right.hex()}
+        if level == 0:
+            leaf = own
+        proof.append(step)
+    return leaf, proof
+
+def _chunk_depth(leaf_count: int) -> int:
+    """Subtree height for a parallel build: ~4 chunks per worker, never below MERKLE_MIN_CHUNK leaves."""
+    target = max(MERKLE_MIN_CHUNK, -(-leaf_count // (MERKLE_WORKERS * 4)))
+    depth = (target - 1).bit_length()
+    # A single chunk is just the serial build with extra pickling
+    return depth if leaf_count > (1 << depth) else 0
+
+def _build_subtree(secret_key, scheme: int, data_blocks: List[str], depth: int) -> List[bytes]:
+    """Worker: leaf level plus exactly `depth` parent levels (a lone node is still paired with itself)."""
+    engine = MerkleEngine(secret_key=secret_key, scheme=scheme)
+    levels = [engine.hash_leaves(data_blocks)]
+    for _ in range(depth):
+        levels.append(engine._parent_level(levels[-1]))
+    return [bytes(level) for level in levels]
+
+def _pool(executor: str):
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Unknown merkle executor: {executor}")
+    with _pools_lock:
+        pool = _pools.get(executor)
+        if pool is None:
+            if executor == "process":
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+                pool = ProcessPoolExecutor(max_workers=MERKLE_WORKERS, mp_context=context)
+            else:
+                pool = ThreadPoolExecutor(max_workers=MERKLE_WORKERS)
+            _pools[executor] = pool
+        return pool
+
+def shutdown_pools():
+    """Stops the parallel-build pools (queued chunks are dropped)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        _pools.clear()
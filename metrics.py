@@ -0,0 +1,235 @@
+import bisect
+import contextvars
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+# AXON ARCH | IN-PROCESS METRICS
+# Fixed-bucket latency histograms aggregated in memory (one bisect and a few
+# increments per observation) and rendered in the Prometheus text format on
+# demand. Stage timings are labelled with the route of the request they ran in,
+# carried by a context variable that run_in_threadpool / asyncio.to_thread copy
+# into worker threads.
+
+# Seconds; spans the sub-millisecond inline path up to multi-second bulk requests
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_endpoint = contextvars.ContextVar("axon_endpoint", default="")
+
+class Histogram:
+    """Cumulative-on-read bucket counts, sum and count for one label set."""
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[slot] += 1
+            self.sum += value
+            self.count += 1
+
+    def snapshot(self):
+        """(cumulative [(le, count)], sum, count), read under the lock so the three agree."""
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative, running = [], 0
+        for le, n in zip(self.buckets + (math.inf,), counts):
+            running += n
+            cumulative.append((le, running))
+        return cumulative, total, count
+
+class Metrics:
+    """
+    Registry of labelled histograms plus stats collectors (callables returning the
+    nested dicts the /stats endpoints already serve), flattened into gauges at scrape time.
+    """
+    def __init__(self, prefix: str = "axon", buckets=LATENCY_BUCKETS):
+        self.prefix = prefix
+        self.buckets = buckets
+        self._histograms = {}  # name -> (help, {labels tuple: Histogram})
+        self._collectors = []  # (subsystem, callable)
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str, labels: dict) -> Histogram:
+        key = tuple(sorted(labels.items()))
+        family = self._histograms.get(name)
+        series = family[1].get(key) if family else None
+        if series is None:
+            with self._lock:
+                family = self._histograms.setdefault(name, (help_text, {}))
+                series = family[1].setdefault(key, Histogram(self.buckets))
+        return series
+
+    def observe_stage(self, stage: str, seconds: float):
+        self.histogram(
+            "stage_seconds", "Time spent in one pipeline stage of a request.",
+            {"stage": stage, "endpoint": _endpoint.get() or "none"}
+        ).observe(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Times the enclosed block (including any await inside it) as one stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    @contextmanager
+    def route(self, endpoint: str):
+        """Labels stage timings in the enclosed block with endpoint (work running outside a request)."""
+        token = _endpoint.set(endpoint)
+        try:
+            yield
+        finally:
+            _endpoint.reset(token)
+
+    def observe_request(self, method: str, endpoint: str, status: int, seconds: float):
+        self.histogram(
+            "request_seconds", "End-to-end request latency, until the last body byte is sent.",
+            {"method": method, "endpoint": endpoint, "status": str(status)}
+        ).observe(seconds)
+
+    def register_collector(self, subsystem: str, collect):
+        self._collectors.append((subsystem, collect))
+
+    def render(self) -> str:
+        """Everything in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            families = [(name, help_text, list(series.items()))
+                        for name, (help_text, series) in self._histograms.items()]
+        for name, help_text, series in sorted(families):
+            full = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} histogram")
+            for key, hist in sorted(series):
+                cumulative, total, count = hist.snapshot()
+                for le, n in cumulative:
+                    lines.append(f"{full}_bucket{_labels(key + (('le', _le(le)),))} {n}")
+                lines.append(f"{full}_sum{_labels(key)} {total!r}")
+                lines.append(f"{full}_count{_labels(key)} {count}")
+        for subsystem, collect in self._collectors:
+            try:
+                stats = collect()
+            except Exception as e:
+                print(f"AXON ARCH | METRICS COLLECTOR {subsystem} FAILED: {e}")
+                continue
+            for name, value in _flatten(stats):
+                full = f"{self.prefix}_{subsystem}_{name}"
+                lines.append(f"# TYPE {full} gauge")
+                lines.append(f"{full} {value!r}")
+        return "\n".join(lines) + "\n"
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: resolves the route template up front (so stage timings
+    and the request histogram share a bounded label), then times the request until
+    its final body chunk, which covers streamed responses too.
+    """
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        endpoint = _route_template(scope)
+        token = _endpoint.set(endpoint)
+        start = time.perf_counter()
+        status, done = 500, False
+
+        async def send_timed(message):
+            nonlocal status, done
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                done = True
+                self.metrics.observe_request(scope["method"], endpoint, status, time.perf_counter() - start)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        except BaseException:
+            if not done:
+                self.metrics.observe_request(scope["method"], endpoint, 500, time.perf_counter() - start)
+            raise
+        finally:
+            _endpoint.reset(token)
+
+def _route_template(scope) -> str:
+    # Imported here so the text-format helpers load without starlette (the dashboard uses them)
+    from starlette.routing import Match
+
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return getattr(route, "path", "unmatched")
+    # Unknown paths share one label so scanners cannot blow up the series count
+    return "unmatched"
+
+def _le(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + body + "}"
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _flatten(stats: dict, path: str = ""):
+    """(metric_name, number) for every numeric leaf of a nested stats dict; strings are skipped."""
+    for key, value in stats.items():
+        name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{path}{key}")
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{name}_")
+        elif isinstance(value, bool):
+            yield name, int(value)
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+# --- READING IT BACK (dashboard) ---
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+def parse_text(text: str):
+    """[(name, {label: value}, float)] for every sample line of a text exposition."""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if match:
+            name, labels, value = match.groups()
+            samples.append((name, dict(_LABEL.findall(labels or "")), float(value)))
+    return samples
+
+def histogram_quantile(q: float, buckets) -> float:
+    """
+    Prometheus-style quantile estimate from cumulative [(le, count)] buckets:
+    linear interpolation inside the bucket holding the q-th observation.
+    """
+    buckets = sorted(buckets)
+    if not buckets or buckets[-1][1] == 0:
+        return math.nan
+    rank = q * buckets[-1][1]
+    lower, below = 0.0, 0
+    for le, count in buckets:
+        if count >= rank:
+            if le == math.inf:
+                return lower
+            return lower + (le - lower) * ((rank - below) / (count - below) if count > below else 0)
+        lower, below = le, count
+    return lower
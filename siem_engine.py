@@ -1,5 +1,90 @@
+import os
 import re
-from typing import Dict, Any
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+from ttl_cache import TTLCache
+
+# BATCH SCANNING POOL
+# re holds the GIL for most of a search, so "process" is the default for real
+# parallelism; "thread" avoids pickling and suits small or I/O-mixed batches.
+# Worker processes start from a forkserver, never by forking the engine itself:
+# by then it runs threads (request threadpool, group commit, job workers) whose
+# locks a forked child could inherit mid-acquire.
+SCAN_EXECUTOR = os.getenv("AXON_SCAN_EXECUTOR", "process")
+SCAN_WORKERS = int(os.getenv("AXON_SCAN_WORKERS", str(os.cpu_count() or 2)))
+SCAN_CHUNK = int(os.getenv("AXON_SCAN_CHUNK", "256"))
+
+# VERDICT CACHE
+# Repeat scans of identical payloads are answered from a bounded LRU keyed by a
+# content digest plus the rule-set version. Size 0 disables it.
+VERDICT_CACHE_SIZE = int(os.getenv("AXON_SENTINEL_CACHE_SIZE", "10000"))
+VERDICT_CACHE_TTL = float(os.getenv("AXON_SENTINEL_CACHE_TTL", "3600"))
+
+# STREAMING SCANS
+# Characters of each piece carried into the next search. Any signature match up
+# to STREAM_OVERLAP + 1 chars long is caught even when it straddles two pieces.
+STREAM_OVERLAP = int(os.getenv("AXON_STREAM_OVERLAP", "4096"))
+
+# Leading global inline flags such as "(?i)".
+_GLOBAL_FLAGS = re.compile(r"^\(\?[aiLmsux]+\)")
+
+# The only non-ASCII code points Python's re treats as case-equivalent to an ASCII
+# letter (U+0130 also lower()s to two chars, so it is mapped before lowering).
+_FOLD_EXTRAS = str.maketrans({"\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k"})
+
+def _fold(text: str) -> str:
+    """Case-folds text so lowered ASCII signatures match exactly what (?i) would."""
+    if text.isascii():
+        return text.lower()
+    return text.translate(_FOLD_EXTRAS).lower()
+
+def _folded_signature(pattern: "re.Pattern") -> Optional["re.Pattern"]:
+    """
+    Case-sensitive, lower-cased twin of an IGNORECASE ASCII signature, or None
+    when the source uses a construct whose meaning lowering could change.
+    IGNORECASE disables re's literal-prefix search; the twin keeps it.
+    """
+    if not pattern.flags & re.IGNORECASE:
+        return None
+    source = _GLOBAL_FLAGS.sub("", pattern.pattern, count=1)
+    if not source.isascii() or "[]" in source or "[^]" in source:
+        return None
+
+    out, i, in_class = [], 0, False
+    while i < len(source):
+        ch = source[i]
+        if ch == "\\":
+            escape = source[i + 1:i + 2]
+            if escape in ("x", "u", "U", "N") or escape.isdigit():
+                return None
+            out.append(source[i:i + 2])
+            i += 2
+            continue
+        if source.startswith("(?P", i):
+            out.append("(?P")
+            i += 3
+            continue
+        if source.startswith("(?", i) and source[i + 2:i + 3] in tuple("aiLmsux-"):
+            return None  # scoped flag groups
+        if ch == "[":
+            in_class = True
+        elif ch == "]":
+            in_class = False
+        elif ch == "-" and in_class and source[i - 2:i - 1] != "\\":
+            low, high = source[i - 1], source[i + 1:i + 2]
+            if low.isalpha() != high.isalpha() or low.isupper() != high.isupper():
+                return None  # e.g. [A-z] spans more than letters
+        out.append(ch.lower())
+        i += 1
+
+    try:
+        return re.compile("".join(out))
+    except re.error:
+        return None
 
 class SovereignSentinel:
     """
@@ -31,25 +116,186 @@ class SovereignSentinel:
             "SECRET_KEY_LEAK": re.compile(r"(?i)(BEGIN PRIVATE KEY|sk-[a-zA-Z0-9]{20,})")
         }
 
-    def scan_payload(self, text: str) -> Dict[str, Any]:
+        # FOLDED SIGNATURES (rebuilt whenever threat_patterns changes)
+        self._ruleset = None
+        self._signatures = []
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+        # VERDICT CACHE (flushed whenever the rule-set version moves)
+        self.ruleset_version = 0
+        self.verdict_cache = TTLCache(VERDICT_CACHE_SIZE, VERDICT_CACHE_TTL) if VERDICT_CACHE_SIZE > 0 else None
+
+    def _sync_ruleset(self):
+        """Recompiles the folded twins if threat_patterns was edited since they were built."""
+        ruleset = tuple((name, p.pattern, p.flags) for name, p in self.threat_patterns.items())
+        if ruleset != self._ruleset:
+            # Publish the new list before the fingerprint so concurrent scanners never pair them wrongly
+            self._signatures = [
+                (name, pattern, _folded_signature(pattern)) for name, pattern in self.threat_patterns.items()
+            ]
+            self._ruleset = ruleset
+            self.ruleset_version += 1
+            if self.verdict_cache is not None:
+                self.verdict_cache.clear()
+
+    def _cache_key(self, text: str):
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        return (self.ruleset_version, digest)
+
+    def _cached_verdict(self, text: str) -> Optional[Dict[str, Any]]:
+        if self.verdict_cache is None:
+            return None
+        verdict = self.verdict_cache.get(self._cache_key(text))
+        return _copy_verdict(verdict) if verdict else None
+
+    def _remember(self, text: str, verdict: Dict[str, Any], complete: bool):
+        # A fail-fast DETECTED verdict lists one category only, so it is never served to a full scan
+        if self.verdict_cache is not None and (complete or verdict["status"] == "CLEAN"):
+            self.verdict_cache.put(self._cache_key(text), _copy_verdict(verdict))
+
+    def cache_stats(self) -> Dict[str, Any]:
+        stats = self.verdict_cache.stats() if self.verdict_cache is not None else {"enabled": False}
+        stats["ruleset_version"] = self.ruleset_version
+        return stats
+
+    def _detect(self, text: str, fail_fast: bool = False, exclude=()) -> List[str]:
+        """
+        Categories present in text, in signature order. The text is case-folded
+        once and shared by every folded signature; fail_fast returns on the first hit.
+        Categories in `exclude` are skipped. Callers sync the rule set first.
+        """
+        folded = None
+        detected = []
+        for name, pattern, twin in self._signatures:
+            if name in exclude:
+                continue
+            if twin is not None:
+                if folded is None:
+                    folded = _fold(text)
+                hit = twin.search(folded)
+            else:
+                hit = pattern.search(text)
+            if hit:
+                detected.append(name)
+                if fail_fast:
+                    break
+        return detected
+
+    def scan_payload(self, text: str, fail_fast: bool = False) -> Dict[str, Any]:
         """
         Deep Packet Inspection of the Input Vector.
         Returns a Verdict: GRANTED or DENIED.
+        fail_fast stops at the first blocking signature (verdict lists only that one).
+        """
+        self._sync_ruleset()
+        cached = self._cached_verdict(text)
+        if cached:
+            return cached
+
+        # 1. STATIC ANALYSIS (Regex over the case-folded text)
+        detected_threats = self._detect(text, fail_fast=fail_fast)
+        verdict = self._verdict(detected_threats, len(text))
+        self._remember(text, verdict, complete=not fail_fast)
+        return verdict
+
+    def stream_scanner(self, fail_fast: bool = False, overlap: int = STREAM_OVERLAP) -> "StreamScanner":
+        """Incremental scanner for payloads too large to hold in memory at once."""
+        return StreamScanner(self, fail_fast=fail_fast, overlap=overlap)
+
+    def scan_stream(self, pieces, fail_fast: bool = False) -> Dict[str, Any]:
+        """Scans an iterable of text pieces; same verdict as scan_payload on their concatenation."""
+        scanner = self.stream_scanner(fail_fast=fail_fast)
+        for piece in pieces:
+            scanner.feed(piece)
+            if scanner.blocked:
+                break
+        return scanner.verdict()
+
+    def scan_batch(self, items: List[str], executor: str = SCAN_EXECUTOR,
+                   chunk_size: int = SCAN_CHUNK) -> List[Optional[Dict[str, Any]]]:
+        """
+        Fail-fast scan of a whole batch, fanned out in chunks over a worker pool.
+        Returns one verdict per item. As soon as any chunk reports DETECTED, every
+        chunk that has not started is cancelled and its items come back as None.
         """
-        risk_score = 0
-        detected_threats = []
+        self._sync_ruleset()
+        verdicts = [None] * len(items)
+        misses = []
+        for index, item in enumerate(items):
+            cached = self._cached_verdict(item)
+            if cached is None:
+                misses.append(index)
+                continue
+            verdicts[index] = cached
+            if cached["status"] == "DETECTED":
+                return verdicts
+
+        pool = self._pool(executor)
+        if executor == "process":
+            submit = lambda chunk: pool.submit(_scan_chunk_in_worker, self.threat_patterns, chunk)
+        else:
+            submit = lambda chunk: pool.submit(_scan_chunk, self, chunk)
+
+        futures = {}
+        for start in range(0, len(misses), chunk_size):
+            indices = misses[start:start + chunk_size]
+            futures[submit([items[i] for i in indices])] = indices
+
+        for future in as_completed(futures):
+            chunk_verdicts = future.result()
+            for index, verdict in zip(futures[future], chunk_verdicts):
+                verdicts[index] = verdict
+                if executor == "process":
+                    # Worker processes keep their own caches; remember the result here too
+                    self._remember(items[index], verdict, complete=False)
+            if chunk_verdicts and chunk_verdicts[-1]["status"] == "DETECTED":
+                for pending in futures:
+                    pending.cancel()
+                break
+        return verdicts
+
+    def _pool(self, executor: str):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown scan executor: {executor}")
+        with self._pools_lock:
+            pool = self._pools.get(executor)
+            if pool is None:
+                if executor == "process":
+                    pool = ProcessPoolExecutor(max_workers=SCAN_WORKERS, mp_context=_process_context())
+                else:
+                    pool = ThreadPoolExecutor(max_workers=SCAN_WORKERS)
+                self._pools[executor] = pool
+            return pool
+
+    def shutdown(self):
+        """Stops the batch-scanning pools (queued chunks are dropped)."""
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.shutdown(wait=False, cancel_futures=True)
+            self._pools = {}
+
+    def __getstate__(self):
+        # Pools, their lock and the verdict cache never travel to worker processes
+        state = self.__dict__.copy()
+        state["_pools"] = {}
+        del state["_pools_lock"]
+        state["verdict_cache"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._pools_lock = threading.Lock()
 
-        # 1. STATIC ANALYSIS (Regex)
-        for threat_type, pattern in self.threat_patterns.items():
-            if pattern.search(text):
-                risk_score += 100
-                detected_threats.append(threat_type)
+    @staticmethod
+    def _verdict(detected_threats: List[str], length: int) -> Dict[str, Any]:
+        risk_score = 100 * len(detected_threats)
 
         # 2. HEURISTIC: High Entropy / Obfuscation Check (Optional)
         # If text is too long or contains too many special chars, flag it.
-        if len(text) > 50000: 
+        if length > 50000: 
             risk_score += 50
-            detected_threats.append("BUFFER_OVERFLOW_ATTEMPT")
+            detected_threats = detected_threats + ["BUFFER_OVERFLOW_ATTEMPT"]
 
         # 3. VERDICT ENGINE
         if risk_score >= 100:
@@ -70,6 +316,69 @@ class SovereignSentinel:
             "response": None
         }
 
+class StreamScanner:
+    """
+    Chunked Deep Packet Inspection. Each piece is searched together with the
+    last `overlap` characters of the previous one, so memory stays at one piece
+    plus the overlap no matter how long the payload is. Categories already
+    found are not searched again.
+    """
+    def __init__(self, sentinel: SovereignSentinel, fail_fast: bool = False, overlap: int = STREAM_OVERLAP):
+        self.sentinel = sentinel
+        self.fail_fast = fail_fast
+        self.overlap = overlap
+        self.length = 0
+        self._tail = ""
+        self._found = set()
+
+    @property
+    def blocked(self) -> bool:
+        """True once a fail-fast scanner has a blocking hit and needs no more input."""
+        return self.fail_fast and bool(self._found)
+
+    def feed(self, text: str):
+        if self.blocked or not text:
+            return
+        self.sentinel._sync_ruleset()
+        window = self._tail + text
+        self._found.update(self.sentinel._detect(window, fail_fast=self.fail_fast, exclude=self._found))
+        self.length += len(text)
+        self._tail = window[-self.overlap:] if self.overlap else ""
+
+    def verdict(self) -> Dict[str, Any]:
+        detected = [name for name in self.sentinel.threat_patterns if name in self._found]
+        return SovereignSentinel._verdict(detected, self.length)
+
+def _copy_verdict(verdict: Dict[str, Any]) -> Dict[str, Any]:
+    copy = dict(verdict)
+    if "details" in copy:
+        copy["details"] = list(copy["details"])
+    return copy
+
+def _scan_chunk(sentinel: SovereignSentinel, items: List[str]) -> List[Dict[str, Any]]:
+    """Scans items in order and stops right after the first DETECTED verdict."""
+    verdicts = []
+    for item in items:
+        verdict = sentinel.scan_payload(item, fail_fast=True)
+        verdicts.append(verdict)
+        if verdict["status"] == "DETECTED":
+            break
+    return verdicts
+
+_WORKER_SENTINEL = None
+
+def _process_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+
+def _scan_chunk_in_worker(threat_patterns: dict, items: List[str]) -> List[Dict[str, Any]]:
+    """Process-pool entry point: one Sentinel per worker, recompiled only when the rule set changes."""
+    global _WORKER_SENTINEL
+    if _WORKER_SENTINEL is None:
+        _WORKER_SENTINEL = SovereignSentinel()
+    _WORKER_SENTINEL.threat_patterns = threat_patterns
+    return _scan_chunk(_WORKER_SENTINEL, items)
+
 # --- LOCAL TEST HARNESS ---
 if __name__ == "__main__":
     sentinel = SovereignSentinel()
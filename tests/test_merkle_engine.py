@@ -0,0 +1,110 @@
+"""
+Equivalence tests for the Merkle fast paths: each must agree with the serial
+MerkleEngine (levels, roots, proofs) across odd tree sizes and both hashing schemes.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import merkle_engine
+from merkle_engine import (
+    DIGEST_SIZE, HASH_SCHEMES, MerkleEngine, MerkleFrontier, iter_node_pages, multiproof_from_pages,
+    multiproof_pages, proof_from_pages,
+)
+
+KEY = "test-sovereign-key"
+SIZES = [1, 2, 3, 4, 5, 7, 8, 9, 13, 16, 31, 33, 100]
+PAGE_NODES = [2, 4, 16, 256]
+
+def items(n: int):
+    return [f"context chunk {i}" for i in range(n)]
+
+def serial(n: int, scheme: int) -> MerkleEngine:
+    return MerkleEngine(items(n), secret_key=KEY, scheme=scheme, parallel_threshold=0)
+
+def stored_pages(engine: MerkleEngine, page_nodes: int) -> dict:
+    return dict(enumerate(iter_node_pages(engine.levels, page_nodes)))
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    # Parallel builds only start past MERKLE_MIN_CHUNK leaves; shrink it so small trees split too
+    monkeypatch.setattr(merkle_engine, "MERKLE_MIN_CHUNK", 2)
+    monkeypatch.setattr(merkle_engine, "MERKLE_WORKERS", 4)
+
+@pytest.mark.parametrize("scheme", HASH_SCHEMES)
+@pytest.mark.parametrize("n", [3, 5, 9, 13, 31, 33, 100, 1025])
+def test_parallel_build_matches_serial(small_chunks, n, scheme):
+    assert merkle_engine._chunk_depth(n) > 0
+    parallel = MerkleEngine(items(n), secret_key=KEY, scheme=scheme, parallel_threshold=1, executor="thread")
+    reference = serial(n, scheme)
+    assert parallel.levels == reference.levels
+    assert parallel.root == reference.root
+
+def test_parallel_build_in_worker_processes(small_chunks):
+    parallel = MerkleEngine(items(257), secret_key=KEY, parallel_threshold=1, executor="process")
+    assert parallel.root == serial(257, merkle_engine.MERKLE_SCHEME).root
+
+@pytest.mark.parametrize("scheme", HASH_SCHEMES)
+@pytest.mark.parametrize("n", SIZES)
+@pytest.mark.parametrize("page_nodes", PAGE_NODES)
+def test_proof_from_pages_matches_get_proof(n, scheme, page_nodes):
+    engine = serial(n, scheme)
+    pages = stored_pages(engine, page_nodes)
+    for index in range(n):
+        leaf, proof = proof_from_pages(n, index, pages, page_nodes)
+        assert proof == engine.get_proof(index)
+        assert leaf == (engine.node(0, index) if n > 1 else None)
+        assert MerkleEngine.verify_proof(items(n)[index], proof, engine.root, secret_key=KEY, scheme=scheme)
+
+@pytest.mark.parametrize("scheme", HASH_SCHEMES)
+@pytest.mark.parametrize("n", SIZES)
+def test_multiproof_matches_engine_and_verifies(n, scheme):
+    engine = serial(n, scheme)
+    data = items(n)
+    selections = {(0,), (n - 1,), tuple(range(0, n, 2)), tuple(range(1, n, 3)) or (0,), tuple(range(n))}
+    for indices in map(list, selections):
+        multiproof = engine.get_multiproof(indices)
+        fragments = [data[i] for i in multiproof["indices"]]
+        assert MerkleEngine.verify_multiproof(fragments, multiproof, engine.root, secret_key=KEY, scheme=scheme)
+        assert not MerkleEngine.verify_multiproof(["altered"] + fragments[1:], multiproof, engine.root,
+                                                  secret_key=KEY, scheme=scheme)
+        for page_nodes in PAGE_NODES:
+            pages = stored_pages(engine, page_nodes)
+            assert set(multiproof_pages(n, indices, page_nodes)) <= set(pages)
+            assert multiproof_from_pages(n, indices, pages, page_nodes) == multiproof
+
+def test_multiproof_rejects_out_of_range():
+    with pytest.raises(ValueError):
+        serial(5, HASH_SCHEMES[0]).get_multiproof([5])
+
+@pytest.mark.parametrize("scheme", HASH_SCHEMES)
+@pytest.mark.parametrize("n", SIZES + [1025])
+def test_frontier_matches_engine(n, scheme):
+    reference = serial(n, scheme)
+    data = items(n)
+    for chunk in (1, 3, 64):
+        frontier = MerkleFrontier(secret_key=KEY, scheme=scheme)
+        for start in range(0, n, chunk):
+            frontier.update(data[start:start + chunk])
+        assert frontier.leaf_count == n
+        assert frontier.root() == reference.root
+
+@pytest.mark.parametrize("scheme", HASH_SCHEMES)
+def test_frontier_root_after_every_leaf(scheme):
+    frontier = MerkleFrontier(secret_key=KEY, scheme=scheme)
+    for n, item in enumerate(items(40), 1):
+        frontier.update([item])
+        assert frontier.root() == serial(n, scheme).root
+
+def test_frontier_empty():
+    assert MerkleFrontier(secret_key=KEY).root() is None
+
+def test_page_layout_holds_every_stored_node():
+    engine = serial(13, HASH_SCHEMES[1])
+    pages = stored_pages(engine, 4)
+    stored = sum(len(page) for page in pages.values()) // DIGEST_SIZE
+    # Every level but the root, each padded to an even length
+    assert stored == sum(n + n % 2 for n in (13, 7, 4, 2))
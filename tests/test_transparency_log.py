@@ -0,0 +1,121 @@
+"""
+RFC 6962 known-answer tests for the transparency log: tree heads, inclusion and
+consistency proofs over the 8-leaf reference vectors used by the Certificate
+Transparency implementations, plus Ed25519 tree-head signatures.
+"""
+import hashlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from transparency_log import (
+    EMPTY_ROOT, Frontier, TreeHeadSigner, accessor, consistency_path, inclusion_path, root_at,
+    verify_consistency, verify_inclusion, verify_tree_head,
+)
+
+LEAVES = [b"", b"\x00", b"\x10", b"\x20\x21", b"\x30\x31", b"\x40\x41\x42\x43",
+          b"\x50\x51\x52\x53\x54\x55\x56\x57", bytes(range(0x60, 0x70))]
+
+# MTH(D[0:n]) for n = 1..8
+ROOTS = [
+    "6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+    "fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125",
+    "aeb6bcfe274b70a14fb067a5e5578264db0fa9b51af5e0ba159158f329e06e77",
+    "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+    "4e3bbb1f7b478dcfe71fb631631519a3bca12c9aefca1612bfce4c13a86264d4",
+    "76e67dadbcdf1e10e1b74ddc608abd2f98dfb16fbce75277b5232a127f2087ef",
+    "ddb89be403809e325750d3d263cd78929c2942b7942a34b77e122c9594a74c8c",
+    "5dc9da79a70659a9ad559cb701ded9a2ab9d823aad2f4960cfe370eff4604328",
+]
+
+# (leaf index, tree size, audit path)
+INCLUSION = [
+    (0, 1, []),
+    (0, 8, ["96a296d224f285c67bee93c30f8a309157f0daa35dc5b87e410b78630a09cfc7",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "6b47aaf29ee3c2af9af889bc1fb9254dabd31177f16232dd6aab035ca39bf6e4"]),
+    (5, 8, ["bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b",
+            "ca854ea128ed050b41b35ffc1b87b8eb2bde461e9e3b5596ece6b9d5975a0ae0",
+            "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7"]),
+    (2, 3, ["fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125"]),
+    (1, 5, ["6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b"]),
+]
+
+# (first size, second size, consistency proof)
+CONSISTENCY = [
+    (1, 1, []),
+    (1, 8, ["96a296d224f285c67bee93c30f8a309157f0daa35dc5b87e410b78630a09cfc7",
+            "5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "6b47aaf29ee3c2af9af889bc1fb9254dabd31177f16232dd6aab035ca39bf6e4"]),
+    (6, 8, ["0ebc5d3437fbe2db158b9f126a1d118e308181031d0a949f8dededebc558ef6a",
+            "ca854ea128ed050b41b35ffc1b87b8eb2bde461e9e3b5596ece6b9d5975a0ae0",
+            "d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7"]),
+    (2, 5, ["5f083f0a1a33ca076a95279832580db3e0ef4584bdff1f54c8a360f50de3031e",
+            "bc1a0643b12e4d2d7c77918f44e0f4f79a838b6cf9ec5b5c283e1f4d88599e6b"]),
+]
+
+def leaf(index: int) -> bytes:
+    return hashlib.sha256(b"\x00" + LEAVES[index]).digest()
+
+@pytest.fixture(scope="module")
+def log():
+    """(frontier after each append, every stored node) for the reference leaves."""
+    frontier, nodes, heads = Frontier(), {}, []
+    for data in LEAVES:
+        for level, idx, digest in frontier.append(data.decode("ascii")):
+            nodes[(level, idx)] = digest
+        heads.append(frontier.root())
+    return heads, accessor(nodes)
+
+def test_empty_tree_root():
+    assert Frontier().root() == EMPTY_ROOT == bytes.fromhex(
+        "e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
+
+def test_tree_heads(log):
+    heads, node = log
+    assert [h.hex() for h in heads] == ROOTS
+    assert [root_at(n, node).hex() for n in range(1, 9)] == ROOTS
+
+@pytest.mark.parametrize("index, size, path", INCLUSION)
+def test_inclusion(log, index, size, path):
+    _, node = log
+    assert [h.hex() for h in inclusion_path(index, size, node)] == path
+    proof, root = [bytes.fromhex(h) for h in path], bytes.fromhex(ROOTS[size - 1])
+    assert verify_inclusion(leaf(index), index, size, proof, root)
+    assert not verify_inclusion(leaf((index + 1) % 8), index, size, proof, root)
+    assert not verify_inclusion(leaf(index), size, size, proof, root)
+    if proof:
+        assert not verify_inclusion(leaf(index), index, size, proof[:-1], root)
+        assert not verify_inclusion(leaf(index), index, size, proof + proof[-1:], root)
+
+@pytest.mark.parametrize("first, second, path", CONSISTENCY)
+def test_consistency(log, first, second, path):
+    _, node = log
+    assert [h.hex() for h in consistency_path(first, second, node)] == path
+    proof = [bytes.fromhex(h) for h in path]
+    first_root, second_root = bytes.fromhex(ROOTS[first - 1]), bytes.fromhex(ROOTS[second - 1])
+    assert verify_consistency(first, second, first_root, second_root, proof)
+    if first != second:
+        assert not verify_consistency(first, second, second_root, first_root, proof)
+        assert not verify_consistency(first, second, first_root, second_root, proof[:-1])
+
+def test_consistency_from_empty_tree():
+    assert verify_consistency(0, 8, EMPTY_ROOT, bytes.fromhex(ROOTS[7]), [])
+    assert not verify_consistency(0, 8, EMPTY_ROOT, bytes.fromhex(ROOTS[7]), [EMPTY_ROOT])
+
+def test_tree_head_signature(tmp_path):
+    signer = TreeHeadSigner(seed_hex="", path=str(tmp_path / "log.key"))
+    sth = signer.sign_tree_head(8, bytes.fromhex(ROOTS[7]), timestamp=1)
+    public_key = signer.public_key()["public_key"]
+    assert verify_tree_head(sth, public_key)
+    # The seed is persisted: a second worker on the same file signs with the same key
+    assert TreeHeadSigner(seed_hex="", path=str(tmp_path / "log.key")).public_key()["public_key"] == public_key
+    assert not verify_tree_head(dict(sth, tree_size=9), public_key)
+    assert not verify_tree_head(dict(sth, root_hash=ROOTS[6]), public_key)
+    other = TreeHeadSigner(seed_hex="11" * 32).public_key()["public_key"]
+    assert not verify_tree_head(sth, other)
@@ -0,0 +1,306 @@
+import hashlib
+import hmac
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey, Ed25519PublicKey
+
+# AXON ARCH | GLOBAL TRANSPARENCY LOG
+# Every sealed root is appended to one append-only Merkle tree built exactly as in
+# RFC 6962 / RFC 9162 (plain SHA-256, so anyone can check the math):
+#   leaf  = SHA-256(0x00 || merkle_root as ASCII hex)
+#   node  = SHA-256(0x01 || left || right)
+#   MTH(D[0:n]) splits at k, the largest power of two below n (no duplication).
+# Perfect subtrees are immutable once complete, so they are stored as (level, idx)
+# nodes: node (level, i) covers entries [i * 2**level, (i + 1) * 2**level). Any
+# historic tree head and any proof is a handful of those nodes.
+#
+# Tree heads are signed with Ed25519 over
+#   "AXON-STH-v2|<tree_size>|<timestamp_ms>|<root_hash hex>"
+# under a log key of its own, never the client-shared sovereign key: clients cannot
+# forge a head, and auditors check one with nothing but the published public key.
+# The key is AXON_LOG_SIGNING_KEY (hex 32-byte seed) or else the seed in
+# AXON_LOG_SIGNING_KEY_FILE, generated on first use so every worker sharing the
+# file signs with the same key.
+
+NodeKey = Tuple[int, int]
+EMPTY_ROOT = hashlib.sha256(b"").digest()
+
+def leaf_hash(entry: str) -> bytes:
+    return hashlib.sha256(b"\x00" + entry.encode()).digest()
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _split(n: int) -> int:
+    """Largest power of two strictly below n (n > 1)."""
+    return 1 << ((n - 1).bit_length() - 1)
+
+class Frontier:
+    """
+    The right edge of the log: roots of the perfect subtrees that make up its
+    current size, largest first (one per set bit of tree_size). Appending a leaf
+    merges equal-sized subtrees, O(log N), and yields every node it completes.
+    """
+    def __init__(self, tree_size: int = 0, nodes: List[bytes] = None):
+        self.tree_size = tree_size
+        self.nodes = list(nodes or [])
+
+    @classmethod
+    def from_bytes(cls, tree_size: int, blob: bytes) -> "Frontier":
+        blob = bytes(blob or b"")
+        return cls(tree_size, [blob[i:i + 32] for i in range(0, len(blob), 32)])
+
+    def to_bytes(self) -> bytes:
+        return b"".join(self.nodes)
+
+    def append(self, entry: str) -> List[Tuple[int, int, bytes]]:
+        """Adds one entry; returns the (level, idx, hash) nodes completed by it, leaf first."""
+        current, level, index = leaf_hash(entry), 0, self.tree_size
+        completed = [(0, index, current)]
+        while index & 1:
+            current = node_hash(self.nodes.pop(), current)
+            level += 1
+            index >>= 1
+            completed.append((level, index, current))
+        self.nodes.append(current)
+        self.tree_size += 1
+        return completed
+
+    def root(self) -> bytes:
+        if not self.nodes:
+            return EMPTY_ROOT
+        root = self.nodes[-1]
+        for left in reversed(self.nodes[:-1]):
+            root = node_hash(left, root)
+        return root
+
+# --- PROOF CONSTRUCTION (over a node(level, idx) accessor) ---
+
+def subtree_hash(start: int, end: int, node: Callable[[int, int], bytes]) -> bytes:
+    """MTH(D[start:end]) for the aligned ranges RFC 6962 recursion produces."""
+    size = end - start
+    if size & (size - 1) == 0:
+        level = size.bit_length() - 1
+        return node(level, start >> level)
+    k = _split(size)
+    return node_hash(subtree_hash(start, start + k, node), subtree_hash(start + k, end, node))
+
+def root_at(tree_size: int, node: Callable[[int, int], bytes]) -> bytes:
+    return subtree_hash(0, tree_size, node) if tree_size else EMPTY_ROOT
+
+def inclusion_path(index: int, tree_size: int, node: Callable[[int, int], bytes]) -> List[bytes]:
+    """PATH(index, D[0:tree_size]) from RFC 9162 section 2.1.3.1."""
+    def path(m, start, end):
+        n = end - start
+        if n == 1:
+            return []
+        k = _split(n)
+        if m < k:
+            return path(m, start, start + k) + [subtree_hash(start + k, end, node)]
+        return path(m - k, start + k, end) + [subtree_hash(start, start + k, node)]
+    return path(index, 0, tree_size)
+
+def consistency_path(first: int, second: int, node: Callable[[int, int], bytes]) -> List[bytes]:
+    """PROOF(first, D[0:second]) from RFC 9162 section 2.1.4.1 (empty when first is 0 or equal)."""
+    def subproof(m, start, end, complete):
+        n = end - start
+        if m == n:
+            return [] if complete else [subtree_hash(start, end, node)]
+        k = _split(n)
+        if m <= k:
+            return subproof(m, start, start + k, complete) + [subtree_hash(start + k, end, node)]
+        return subproof(m - k, start + k, end, False) + [subtree_hash(start, start + k, node)]
+    if not 0 < first < second:
+        return []
+    return subproof(first, 0, second, True)
+
+def nodes_needed(build, *args) -> List[NodeKey]:
+    """Dry-runs a proof builder to learn which stored nodes it reads, so they can be fetched in one query."""
+    keys = []
+
+    def record(level, idx):
+        keys.append((level, idx))
+        return EMPTY_ROOT
+    build(*args, record)
+    return sorted(set(keys))
+
+def accessor(nodes: Dict[NodeKey, bytes]) -> Callable[[int, int], bytes]:
+    def node(level, idx):
+        try:
+            return nodes[(level, idx)]
+        except KeyError:
+            raise Exception("LOG_NODE_MISSING")
+    return node
+
+# --- VERIFICATION (RFC 9162 sections 2.1.3.2 and 2.1.4.2) ---
+
+def verify_inclusion(entry_hash: bytes, index: int, tree_size: int, path: List[bytes], root: bytes) -> bool:
+    if index >= tree_size:
+        return False
+    fn, sn, r = index, tree_size - 1, entry_hash
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            if not fn & 1:
+                while not fn & 1 and fn != 0:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(r, root)
+
+def verify_consistency(first: int, second: int, first_root: bytes, second_root: bytes, path: List[bytes]) -> bool:
+    if first == second:
+        return not path and hmac.compare_digest(first_root, second_root)
+    if first == 0:
+        return not path  # the empty tree is a prefix of every tree
+    if first > second or not path:
+        return False
+    if first & (first - 1) == 0:
+        path = [first_root] + list(path)
+    fn, sn = first - 1, second - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+    fr = sr = path[0]
+    for c in path[1:]:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            fr = node_hash(c, fr)
+            sr = node_hash(c, sr)
+            if not fn & 1:
+                while not fn & 1 and fn != 0:
+                    fn >>= 1
+                    sn >>= 1
+        else:
+            sr = node_hash(sr, c)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and hmac.compare_digest(fr, first_root) and hmac.compare_digest(sr, second_root)
+
+# --- SIGNED TREE HEADS ---
+
+def default_signing_key_path() -> str:
+    if os.getenv("AXON_LOG_SIGNING_KEY_FILE"):
+        return os.environ["AXON_LOG_SIGNING_KEY_FILE"]
+    if os.path.exists("/var/lib/axon_data"):
+        return "/var/lib/axon_data/axon_log_signing.key"
+    return "axon_log_signing.key"
+
+def _tree_head_message(tree_size: int, timestamp: int, root_hash: str) -> bytes:
+    return f"AXON-STH-v2|{tree_size}|{timestamp}|{root_hash}".encode()
+
+def _raw_public_key(key: Ed25519PublicKey) -> bytes:
+    return key.public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+
+def key_id(public_key: bytes) -> str:
+    return hashlib.sha256(public_key).hexdigest()[:16]
+
+class TreeHeadSigner:
+    """The log's Ed25519 key, loaded (or created) on first use."""
+    def __init__(self, seed_hex: str = None, path: str = None):
+        self.seed_hex = seed_hex if seed_hex is not None else os.getenv("AXON_LOG_SIGNING_KEY")
+        self.path = path or default_signing_key_path()
+        self._key = None
+        self._lock = threading.Lock()
+
+    def _private_key(self) -> Ed25519PrivateKey:
+        if self._key is None:
+            with self._lock:
+                if self._key is None:
+                    seed = bytes.fromhex(self.seed_hex) if self.seed_hex else self._seed_from_file()
+                    self._key = Ed25519PrivateKey.from_private_bytes(seed)
+        return self._key
+
+    def _seed_from_file(self) -> bytes:
+        try:
+            # O_EXCL: of several workers booting at once, exactly one writes the seed
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            with open(self.path) as f:
+                return bytes.fromhex(f.read().strip())
+        seed = os.urandom(32)
+        with os.fdopen(fd, "w") as f:
+            f.write(seed.hex())
+        print(f"AXON ARCH | LOG SIGNING KEY CREATED: {self.path}")
+        return seed
+
+    def public_key(self) -> dict:
+        raw = _raw_public_key(self._private_key().public_key())
+        return {"algorithm": "Ed25519", "key_id": key_id(raw), "public_key": raw.hex()}
+
+    def sign_tree_head(self, tree_size: int, root: bytes, timestamp: int = None) -> dict:
+        timestamp = timestamp if timestamp is not None else int(time.time() * 1000)
+        root_hash = root.hex()
+        key = self._private_key()
+        return {
+            "tree_size": tree_size,
+            "timestamp": timestamp,
+            "root_hash": root_hash,
+            "algorithm": "Ed25519",
+            "key_id": key_id(_raw_public_key(key.public_key())),
+            "signature": key.sign(_tree_head_message(tree_size, timestamp, root_hash)).hex(),
+        }
+
+def verify_tree_head(sth: dict, public_key) -> bool:
+    """Auditor-side check of a signed tree head against the log's public key (raw bytes or hex)."""
+    if isinstance(public_key, str):
+        public_key = bytes.fromhex(public_key)
+    try:
+        Ed25519PublicKey.from_public_bytes(public_key).verify(
+            bytes.fromhex(sth["signature"]),
+            _tree_head_message(sth["tree_size"], sth["timestamp"], sth["root_hash"])
+        )
+    except (InvalidSignature, KeyError, TypeError, ValueError):
+        return False
+    return True
+
+# --- PROOF PAYLOADS (shared by the sync and async ledgers) ---
+# Each proof is planned first (which stored nodes it reads, so the ledger fetches
+# them in one query), then assembled. The head's own root comes from the frontier.
+
+def _with_root_keys(keys: List[NodeKey], sizes, head: Frontier) -> List[NodeKey]:
+    wanted = set(keys)
+    for size in sizes:
+        if 0 < size < head.tree_size:
+            wanted.update(nodes_needed(root_at, size))
+    return sorted(wanted)
+
+def _root(tree_size: int, head: Frontier, node) -> bytes:
+    return head.root() if tree_size == head.tree_size else root_at(tree_size, node)
+
+def inclusion_keys(index: int, tree_size: int, head: Frontier) -> List[NodeKey]:
+    return _with_root_keys(nodes_needed(inclusion_path, index, tree_size), [tree_size], head)
+
+def inclusion_proof(merkle_root: str, index: int, tree_size: int, head: Frontier, nodes: Dict[NodeKey, bytes]) -> dict:
+    node = accessor(nodes)
+    return {
+        "merkle_root": merkle_root,
+        "leaf_index": index,
+        "tree_size": tree_size,
+        "root_hash": _root(tree_size, head, node).hex(),
+        "inclusion_path": [h.hex() for h in inclusion_path(index, tree_size, node)],
+    }
+
+def consistency_keys(first: int, second: int, head: Frontier) -> List[NodeKey]:
+    return _with_root_keys(nodes_needed(consistency_path, first, second), [first, second], head)
+
+def consistency_proof(first: int, second: int, head: Frontier, nodes: Dict[NodeKey, bytes]) -> dict:
+    node = accessor(nodes)
+    return {
+        "first": first,
+        "second": second,
+        "first_root": _root(first, head, node).hex(),
+        "second_root": _root(second, head, node).hex(),
+        "consistency_path": [h.hex() for h in consistency_path(first, second, node)],
+    }